@@ -34,4 +34,29 @@ def create_app(config_class=Config):
     app.register_blueprint(admin_bp, url_prefix='/admin')
     app.register_blueprint(volunteer_bp, url_prefix='/volunteer')
     
+    # Per-request query counts, DB time and N+1 warnings
+    from app.instrumentation import init_query_instrumentation
+    init_query_instrumentation(app)
+    
+    # Committed volunteer/user changes keep the in-memory matching snapshot fresh
+    from app.services.change_feed import register_change_feed
+    register_change_feed(db.session)
+    
+    # Materialized admin counters are updated in the same transaction as each write
+    from app.services.stats import register_stats_hooks
+    register_stats_hooks(db.session)
+    
+    # Late changes to older tasks/users mark their rollup months for re-aggregation
+    from app.services.rollups import register_rollup_hooks
+    register_rollup_hooks(db.session)
+    
+    # Register CLI commands
+    from app.commands import register_commands
+    register_commands(app)
+    
+    # ML/OCR services load lazily unless a warm start is requested
+    if app.config.get('PRELOAD_ML_SERVICES'):
+        from app.services.registry import warm_up
+        warm_up()
+    
     return app
\ No newline at end of file
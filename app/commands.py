@@ -0,0 +1,260 @@
+import json
+import time
+from collections import Counter
+
+import click
+from sqlalchemy.orm import joinedload
+
+from app import db
+from app.models import Volunteer, Task, Feedback, volunteers_with_users
+from app.services.registry import dependency_report, get_ai_service, warm_up
+from app.services.ocr_queue import (
+    backfill_ocr_jobs, claim_next_job, default_worker_id, document_absolute_path, ocr_queue_counts,
+    process_job, store_verification_result
+)
+from app.services.rollups import refresh_rollups
+from app.services.stats import (
+    compute_platform_stats, load_platform_stats, platform_stats_built, rebuild_platform_stats
+)
+
+
+def register_commands(app):
+    """Register the project's Flask CLI commands"""
+
+    @app.cli.command('warm-up')
+    def warm_up_services():
+        """Load the ML and OCR services now and report per-dependency import time"""
+        start = time.perf_counter()
+        warm_up()
+        click.echo(f'Services ready in {time.perf_counter() - start:.2f}s')
+        for name, info in dependency_report().items():
+            status = 'ok' if info['available'] else f"missing ({info['error']})"
+            click.echo(f"  {name:<12} {info['seconds'] * 1000:8.1f} ms  {status}")
+
+    @app.cli.command('rank-pending')
+    @click.option('--top-k', default=5, show_default=True, help='Volunteers to keep per task')
+    @click.option('--chunk-mb', default=64, show_default=True,
+                  help='Memory budget for one block of the task x volunteer score matrix')
+    @click.option('--output', type=click.Path(dir_okay=False), default=None,
+                  help='Write the rankings to this JSON file')
+    def rank_pending(top_k, chunk_mb, output):
+        """Re-match every pending task against all approved volunteers in one batch"""
+        ai_service = get_ai_service()
+        if not ai_service or not hasattr(ai_service, 'rank_pending_tasks'):
+            click.echo('Batch ranking needs the TF-IDF matching service (scikit-learn).')
+            return
+
+        start = time.perf_counter()
+        tasks = Task.query.filter_by(status='pending').order_by(Task.id).all()
+        volunteers = Volunteer.query.options(joinedload(Volunteer.user_profile))\
+            .filter_by(verification_status='approved').all()
+        loaded = time.perf_counter()
+
+        rankings = ai_service.rank_pending_tasks(
+            tasks, volunteers, top_k=top_k,
+            max_radius_km=app.config.get('FALLBACK_RADIUS_KM', 50),
+            chunk_bytes=chunk_mb * 1024 * 1024
+        )
+        ranked = time.perf_counter()
+
+        click.echo(f'Ranked {len(tasks)} pending tasks against {len(volunteers)} volunteers')
+        click.echo(f'  load: {loaded - start:.2f}s  rank: {ranked - loaded:.2f}s')
+
+        if output:
+            with open(output, 'w') as f:
+                json.dump({str(task_id): matches for task_id, matches in rankings.items()}, f, indent=2)
+            click.echo(f'Wrote rankings to {output}')
+        else:
+            for task in tasks[:10]:
+                top = ', '.join(f"#{m['volunteer_id']} ({m['match_score']:.2f})" for m in rankings[task.id])
+                click.echo(f'  Task {task.id}: {top or "no candidates"}')
+
+    @app.cli.command('rescore-feedback')
+    @click.option('--processes', default=1, show_default=True,
+                  help='Worker processes for sentiment scoring (1 = in-process)')
+    @click.option('--batch-size', default=2000, show_default=True,
+                  help='Feedback rows loaded and committed per batch')
+    def rescore_feedback(processes, batch_size):
+        """Recompute sentiment for all stored feedback with the batch sentiment API"""
+        ai_service = get_ai_service()
+        if not ai_service or not hasattr(ai_service, 'analyze_sentiment_batch'):
+            click.echo('Batch sentiment needs the NLTK/TextBlob matching service.')
+            return
+
+        start = time.perf_counter()
+        total = 0
+        last_id = 0
+        while True:
+            batch = Feedback.query.filter(Feedback.id > last_id)\
+                .order_by(Feedback.id).limit(batch_size).all()
+            if not batch:
+                break
+
+            results = ai_service.analyze_sentiment_batch(
+                [feedback.text for feedback in batch], processes=processes
+            )
+            for feedback, result in zip(batch, results):
+                feedback.sentiment_score = result['compound']
+                feedback.sentiment_label = result['label']
+            db.session.commit()
+
+            total += len(batch)
+            last_id = batch[-1].id
+
+        elapsed = time.perf_counter() - start
+        click.echo(f'Rescored {total} feedback entries in {elapsed:.2f}s')
+
+    @app.cli.command('rebuild-stats')
+    @click.option('--check', is_flag=True, help='Only compare the stored counters with the source tables')
+    def rebuild_stats(check):
+        """Recompute the materialized platform_stats counters from scratch"""
+        if check:
+            if not platform_stats_built():
+                click.echo('platform_stats has not been built yet: run without --check')
+                return
+            stored, actual = vars(load_platform_stats()), vars(compute_platform_stats())
+            drift = {
+                name: (stored[name], value) for name, value in actual.items()
+                if (abs(stored[name] - value) > 1e-6 if isinstance(value, float) else stored[name] != value)
+            }
+            if not drift:
+                click.echo('platform_stats matches the source tables')
+            for name, (stored_value, actual_value) in drift.items():
+                click.echo(f'  {name}: stored {stored_value} != actual {actual_value}')
+            return
+
+        start = time.perf_counter()
+        rows = rebuild_platform_stats()
+        click.echo(f'Rebuilt platform_stats ({rows} counters) in {time.perf_counter() - start:.2f}s')
+
+    @app.cli.command('refresh-rollups')
+    @click.option('--full', is_flag=True, help='Rebuild all history instead of the lookback window')
+    @click.option('--lookback-days', type=int, default=None,
+                  help='Days before the watermark to re-aggregate (default: ROLLUP_LOOKBACK_DAYS)')
+    @click.option('--every', type=int, default=0,
+                  help='Keep running, refreshing every N seconds (for a background worker)')
+    def refresh_rollups_command(full, lookback_days, every):
+        """Refresh the daily/monthly report rollup tables"""
+        if lookback_days is None:
+            lookback_days = app.config.get('ROLLUP_LOOKBACK_DAYS', 7)
+        while True:
+            start = time.perf_counter()
+            summary = refresh_rollups(lookback_days=lookback_days, full=full)
+            window = f"from {summary['from']}" if summary['from'] else 'all history'
+            if summary['dirty_months']:
+                window += f" + {summary['dirty_months']} older months with late changes"
+            click.echo(
+                f"Refreshed rollups ({window}): {summary['task_rows']} task, "
+                f"{summary['user_task_rows']} user-task, {summary['signup_rows']} signup rows "
+                f"in {time.perf_counter() - start:.2f}s"
+            )
+            if not every:
+                return
+            full = False
+            db.session.remove()
+            time.sleep(every)
+
+    @app.cli.command('ocr-worker')
+    @click.option('--once', is_flag=True, help='Exit when the queue is empty instead of polling')
+    @click.option('--backfill', is_flag=True,
+                  help='First queue jobs for pending volunteers whose documents were never processed')
+    @click.option('--poll-interval', type=float, default=None,
+                  help='Seconds to wait when the queue is empty (default: OCR_WORKER_POLL_SECONDS)')
+    @click.option('--max-jobs', type=int, default=0, help='Stop after this many jobs (0 = no limit)')
+    def ocr_worker(once, backfill, poll_interval, max_jobs):
+        """Process queued OCR jobs for volunteer documents"""
+        if poll_interval is None:
+            poll_interval = app.config.get('OCR_WORKER_POLL_SECONDS', 5)
+        max_attempts = app.config.get('OCR_JOB_MAX_ATTEMPTS', 3)
+        timeout = app.config.get('OCR_DOCUMENT_TIMEOUT', 60)
+        stale_seconds = app.config.get('OCR_JOB_STALE_SECONDS', 600)
+        worker_id = default_worker_id()
+
+        if backfill:
+            click.echo(f'Queued {backfill_ocr_jobs()} unprocessed documents')
+        counts = ocr_queue_counts()
+        click.echo(f"OCR worker {worker_id}: {counts.get('queued', 0)} queued, "
+                   f"{counts.get('running', 0)} running, {counts.get('failed', 0)} failed")
+
+        processed = 0
+        while not max_jobs or processed < max_jobs:
+            job = claim_next_job(worker_id, stale_seconds=stale_seconds)
+            if job is None:
+                if once:
+                    break
+                db.session.remove()
+                time.sleep(poll_interval)
+                continue
+
+            start = time.perf_counter()
+            process_job(job, max_attempts=max_attempts, timeout=timeout)
+            processed += 1
+            click.echo(f'  job {job.id} (volunteer {job.volunteer_id}): {job.status} '
+                       f'in {time.perf_counter() - start:.2f}s'
+                       + (f' - {job.error}' if job.error else ''))
+        click.echo(f'Processed {processed} jobs')
+
+    @app.cli.command('ocr-backlog')
+    @click.option('--workers', type=int, default=None,
+                  help='OCR processes (default: OCR_POOL_WORKERS, or one per core)')
+    @click.option('--timeout', type=float, default=None,
+                  help='Seconds allowed per document (default: OCR_DOCUMENT_TIMEOUT)')
+    @click.option('--batch-size', default=500, show_default=True,
+                  help='Documents loaded, processed and committed per batch')
+    @click.option('--all', 'reprocess_all', is_flag=True,
+                  help='Also redo pending documents that already have OCR results')
+    @click.option('--dry-run', is_flag=True, help='Measure throughput without storing results')
+    def ocr_backlog(workers, timeout, batch_size, reprocess_all, dry_run):
+        """OCR pending volunteers' documents across processes and store the results"""
+        from app.ocr_service import process_documents
+
+        workers = workers or app.config.get('OCR_POOL_WORKERS')
+        timeout = timeout or app.config.get('OCR_DOCUMENT_TIMEOUT', 60)
+        query = volunteers_with_users().filter(
+            Volunteer.verification_status == 'pending',
+            Volunteer.document_path.isnot(None)
+        )
+        if not reprocess_all:
+            query = query.filter(Volunteer.extracted_text.is_(None))
+
+        totals = {'documents': 0, 'ok': 0, 'error': 0, 'timeout': 0, 'tesseract_runs': 0, 'seconds': 0.0}
+        pipelines = Counter()
+        slowest = 0.0
+        last_id = 0
+        while True:
+            volunteers = query.filter(Volunteer.id > last_id).order_by(Volunteer.id).limit(batch_size).all()
+            if not volunteers:
+                break
+            last_id = volunteers[-1].id
+
+            results, summary = process_documents(
+                [document_absolute_path(v.document_path) for v in volunteers],
+                [v.user_profile.name for v in volunteers],
+                max_workers=workers, timeout=timeout
+            )
+            for volunteer, result in zip(volunteers, results):
+                if result['status'] == 'ok' and not dry_run:
+                    store_verification_result(volunteer, result['result'])
+                elif result['status'] != 'ok':
+                    click.echo(f"  volunteer {volunteer.id}: {result['status']} - {result['error']}")
+            db.session.commit()
+
+            for key in totals:
+                totals[key] += summary[key]
+            pipelines.update(summary['pipelines'])
+            slowest = max([slowest] + [r['seconds'] for r in results])
+            click.echo(f"  batch of {summary['documents']} on {summary['workers']} processes: "
+                       f"{summary['docs_per_second']:.2f} docs/s")
+
+        if not totals['documents']:
+            click.echo('No pending documents to process')
+            return
+        click.echo(
+            f"Processed {totals['documents']} documents in {totals['seconds']:.1f}s "
+            f"({totals['documents'] / totals['seconds']:.2f} docs/s): {totals['ok']} ok, "
+            f"{totals['error']} failed, {totals['timeout']} timed out; slowest {slowest:.1f}s; "
+            f"{totals['tesseract_runs'] / totals['documents']:.2f} Tesseract runs per document"
+            + (' (dry run, nothing stored)' if dry_run else '')
+        )
+        if pipelines:
+            click.echo('Preprocessing: ' + ', '.join(f'{name} {count}' for name, count in pipelines.most_common()))
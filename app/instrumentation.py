@@ -0,0 +1,117 @@
+"""
+Per-request SQL instrumentation.
+
+Counts the queries a request runs and the time spent in the database by
+hooking the engine's cursor events, flags statements repeated many times
+within one request (the N+1 signature), and reports the numbers in a
+Server-Timing header and a debug log line. A query budget can be set
+globally (SQL_QUERY_BUDGET) or per endpoint (SQL_QUERY_BUDGETS); going over
+it logs a warning, and raises QueryBudgetExceeded when the app is TESTING so
+regressions fail the test that caused them.
+"""
+import time
+from collections import Counter
+
+from flask import g, has_request_context, request
+from sqlalchemy import event
+
+from app import db
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more SQL statements than its configured budget"""
+
+
+class QueryStats:
+    """Queries run during one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold):
+        """(statement, times) for statements run at least threshold times, most repeated first"""
+        return [(statement, times) for statement, times in self.statements.most_common()
+                if times >= threshold]
+
+
+def current_query_stats():
+    """QueryStats of the request being handled, or None outside a request"""
+    if not has_request_context():
+        return None
+    return g.get('_query_stats')
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('_query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('_query_start')
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = current_query_stats()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _query_budget(app, endpoint):
+    budgets = app.config.get('SQL_QUERY_BUDGETS') or {}
+    if endpoint in budgets:
+        return budgets[endpoint]
+    return app.config.get('SQL_QUERY_BUDGET')
+
+
+def init_query_instrumentation(app):
+    """Hook the app's engine and request cycle; a no-op unless SQL_INSTRUMENTATION is on"""
+    if not app.config.get('SQL_INSTRUMENTATION', True):
+        return
+
+    with app.app_context():
+        engine = db.engine
+    if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    @app.before_request
+    def start_query_stats():
+        g._query_stats = QueryStats()
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = current_query_stats()
+        if stats is None or request.endpoint == 'static':
+            return response
+
+        duration_ms = stats.seconds * 1000
+        response.headers.add(
+            'Server-Timing', f'db;dur={duration_ms:.1f};desc="{stats.count} queries"'
+        )
+
+        threshold = app.config.get('SQL_REPEATED_STATEMENT_THRESHOLD', 5)
+        repeated = stats.repeated(threshold)
+        app.logger.debug(
+            '%s %s: %d queries in %.1f ms%s', request.method, request.path, stats.count, duration_ms,
+            f', {len(repeated)} repeated statement(s)' if repeated else ''
+        )
+        for statement, times in repeated:
+            app.logger.warning(
+                'Possible N+1 on %s %s: statement ran %d times: %s',
+                request.method, request.path, times, ' '.join(statement.split())[:200]
+            )
+
+        budget = _query_budget(app, request.endpoint)
+        if budget is not None and stats.count > budget:
+            message = (f'{request.method} {request.path} ({request.endpoint}) ran '
+                       f'{stats.count} queries, budget is {budget}')
+            if app.testing:
+                raise QueryBudgetExceeded(message)
+            app.logger.warning(message)
+        return response
@@ -1,5 +1,6 @@
 from app import db, login_manager
 from flask_login import UserMixin
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
 from datetime import datetime
 from werkzeug.security import generate_password_hash, check_password_hash
 
@@ -9,6 +10,10 @@ def load_user(user_id):
 
 class User(UserMixin, db.Model):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Supports the bounding-box prefilter for nearby volunteers
+        db.Index('ix_users_lat_lon', 'latitude', 'longitude'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
@@ -37,6 +42,12 @@ class User(UserMixin, db.Model):
 
 class Volunteer(db.Model):
     __tablename__ = 'volunteers'
+    __table_args__ = (
+        # Verification queue: status filter, premium first, then oldest (keyset order)
+        db.Index('ix_volunteers_status_premium_created', 'verification_status', 'premium_verified', 'created_at'),
+        # current_user.volunteer_profile and snapshot refreshes by user id
+        db.Index('ix_volunteers_user_id', 'user_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -48,8 +59,8 @@ class Volunteer(db.Model):
     completed_tasks = db.Column(db.Integer, default=0)
     subscription_type = db.Column(db.Enum('basic', 'pro', name='subscription_types'), default='basic')
     subscription_expires = db.Column(db.DateTime)
-    premium_verified = db.Column(db.Boolean, default=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    premium_verified = db.Column(db.Boolean, default=False, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
     assigned_tasks = db.relationship('Task', backref='assigned_volunteer', lazy=True)
@@ -60,6 +71,16 @@ class Volunteer(db.Model):
 
 class Task(db.Model):
     __tablename__ = 'tasks'
+    __table_args__ = (
+        # Pending-task feeds and rank-pending: status filter, newest first
+        db.Index('ix_tasks_status_created', 'status', 'created_at'),
+        # User dashboard and analytics: one user's tasks, newest first
+        db.Index('ix_tasks_user_created', 'user_id', 'created_at'),
+        # Volunteer's assigned tasks (keyset on created_at) and completed counts per volunteer
+        db.Index('ix_tasks_volunteer_status_created', 'assigned_volunteer_id', 'status', 'created_at'),
+        # Recent tasks on reports and rollup range scans
+        db.Index('ix_tasks_created_at', 'created_at'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -75,7 +96,7 @@ class Task(db.Model):
     payment_amount = db.Column(db.Float, default=0.0)
     platform_fee = db.Column(db.Float, default=0.0)
     urgency = db.Column(db.Enum('low', 'medium', 'high', name='urgency_levels'), default='medium')
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     completed_at = db.Column(db.DateTime)
     
     # Relationships
@@ -86,6 +107,10 @@ class Task(db.Model):
 
 class Feedback(db.Model):
     __tablename__ = 'feedback'
+    __table_args__ = (
+        db.Index('ix_feedback_task_id', 'task_id'),
+        db.Index('ix_feedback_volunteer_id', 'volunteer_id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     task_id = db.Column(db.Integer, db.ForeignKey('tasks.id'), nullable=False)
@@ -98,4 +123,211 @@ class Feedback(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     
     def __repr__(self):
-        return f'<Feedback for Task {self.task_id}>'
\ No newline at end of file
+        return f'<Feedback for Task {self.task_id}>'
+
+class PlatformStat(db.Model):
+    """
+    Materialized platform counter, kept current by session hooks in
+    app.services.stats. bucket is 'total' for all-time counters or a
+    YYYY-MM-DD day for per-day activity.
+    """
+    __tablename__ = 'platform_stats'
+    __table_args__ = (
+        db.UniqueConstraint('bucket', 'metric', name='uq_platform_stats_bucket_metric'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    bucket = db.Column(db.String(10), nullable=False)
+    metric = db.Column(db.String(80), nullable=False)  # 'tasks.category.' + a 50-char category
+    value = db.Column(db.Float, nullable=False, default=0.0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<PlatformStat {self.bucket} {self.metric}={self.value}>'
+
+class TaskRollup(db.Model):
+    """
+    Task counts per time bucket, filled by app.services.rollups.
+    granularity is 'day' or 'month'; bucket is the first day of the period.
+    category and pincode_prefix use '' for missing values.
+    """
+    __tablename__ = 'task_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('granularity', 'bucket', 'status', 'category', 'pincode_prefix',
+                            name='uq_task_rollups_key'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    granularity = db.Column(db.String(5), nullable=False)
+    bucket = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    category = db.Column(db.String(50), nullable=False, default='')
+    pincode_prefix = db.Column(db.String(10), nullable=False, default='')
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+    commercial_count = db.Column(db.Integer, nullable=False, default=0)
+    platform_fees = db.Column(db.Float, nullable=False, default=0.0)
+
+class UserTaskRollup(db.Model):
+    """Monthly task counts per posting user and status, for the user analytics page"""
+    __tablename__ = 'user_task_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'bucket', 'status', name='uq_user_task_rollups_key'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    bucket = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(20), nullable=False)
+    task_count = db.Column(db.Integer, nullable=False, default=0)
+
+class SignupRollup(db.Model):
+    """User registrations per time bucket and role (granularity/bucket as in TaskRollup)"""
+    __tablename__ = 'signup_rollups'
+    __table_args__ = (
+        db.UniqueConstraint('granularity', 'bucket', 'role', name='uq_signup_rollups_key'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    granularity = db.Column(db.String(5), nullable=False)
+    bucket = db.Column(db.Date, nullable=False)
+    role = db.Column(db.String(20), nullable=False)
+    user_count = db.Column(db.Integer, nullable=False, default=0)
+
+class RollupState(db.Model):
+    """Watermark of the last rollup refresh, one row per rollup job"""
+    __tablename__ = 'rollup_state'
+    
+    name = db.Column(db.String(50), primary_key=True)
+    watermark = db.Column(db.DateTime, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class RollupDirtyMonth(db.Model):
+    """
+    A month whose rollup buckets are stale because a task or user created in
+    it changed after the fact (e.g. a task completed weeks after posting).
+    Recorded by the flush hook in app.services.rollups and cleared by the
+    next refresh, which re-aggregates the month.
+    """
+    __tablename__ = 'rollup_dirty_months'
+    
+    month = db.Column(db.Date, primary_key=True)
+    marked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+class OcrJob(db.Model):
+    """
+    Queued OCR of a volunteer's verification document, drained by
+    `flask ocr-worker` (app.services.ocr_queue). status is queued, running,
+    done or failed; a worker claims a job by moving it from queued to running.
+    """
+    __tablename__ = 'ocr_jobs'
+    __table_args__ = (
+        # Claim order: next queued job, highest priority first
+        db.Index('ix_ocr_jobs_status_priority', 'status', 'priority', 'id'),
+        db.Index('ix_ocr_jobs_volunteer_id', 'volunteer_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    volunteer_id = db.Column(db.Integer, db.ForeignKey('volunteers.id'), nullable=False)
+    document_path = db.Column(db.String(255), nullable=False)
+    status = db.Column(db.String(10), nullable=False, default='queued')
+    priority = db.Column(db.Integer, nullable=False, default=0)  # Premium verifications go first
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    worker = db.Column(db.String(100))
+    error = db.Column(db.Text)
+    result = db.Column(db.Text)  # JSON of the verification result
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    claimed_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    
+    volunteer = db.relationship('Volunteer', backref=db.backref('ocr_jobs', lazy=True))
+    
+    def __repr__(self):
+        return f'<OcrJob {self.id} volunteer={self.volunteer_id} {self.status}>'
+
+# Eager-loading query helpers: pages that render per-row relationships
+# (volunteer.user_profile, task.task_creator, task.assigned_volunteer...)
+# load them with the rows instead of one lazy query per row.
+
+def volunteers_with_users(query=None):
+    """Volunteer query with each user_profile loaded in the same statement"""
+    query = query if query is not None else Volunteer.query
+    return query.options(joinedload(Volunteer.user_profile))
+
+def approved_volunteers_with_users():
+    """Approved volunteers with their user profiles"""
+    return volunteers_with_users().filter(Volunteer.verification_status == 'approved')
+
+# Keyset orders for paginated listings: (column, descending) pairs ending with the primary key
+NEWEST_TASKS_FIRST = [(Task.created_at, True), (Task.id, True)]
+PENDING_VOLUNTEERS_ORDER = [(Volunteer.premium_verified, True), (Volunteer.created_at, False), (Volunteer.id, False)]
+
+def pending_volunteers_with_users():
+    """Volunteers awaiting verification with their user profiles, premium first then oldest"""
+    return volunteers_with_users().filter(Volunteer.verification_status == 'pending')\
+        .order_by(Volunteer.premium_verified.desc(), Volunteer.created_at.asc(), Volunteer.id.asc())
+
+def tasks_with_people(query=None):
+    """Task query with the creator and the assigned volunteer (and their profile) loaded"""
+    query = query if query is not None else Task.query
+    return query.options(
+        joinedload(Task.task_creator),
+        joinedload(Task.assigned_volunteer).joinedload(Volunteer.user_profile)
+    )
+
+def top_volunteers_by_completed_tasks(limit=5):
+    """(Volunteer, completed_count) pairs; profiles come in one extra query, not one per row"""
+    return db.session.query(Volunteer, db.func.count(Task.id).label('completed_count'))\
+        .join(Task, Task.assigned_volunteer_id == Volunteer.id)\
+        .filter(Task.status == 'completed')\
+        .group_by(Volunteer.id)\
+        .order_by(db.func.count(Task.id).desc())\
+        .options(selectinload(Volunteer.user_profile))\
+        .limit(limit)\
+        .all()
+
+def approved_volunteers_within(lat, lon, radius_km):
+    """
+    Approved volunteers whose user location falls inside the bounding box of
+    radius_km around (lat, lon). The box is evaluated in SQL so only nearby
+    candidates are loaded; callers refine with an exact haversine check.
+    """
+    from app.services.geo import bounding_box  # NumPy stays out of app startup
+    
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    query = Volunteer.query.join(User, Volunteer.user_id == User.id)\
+        .options(contains_eager(Volunteer.user_profile))\
+        .filter(Volunteer.verification_status == 'approved')\
+        .filter(User.latitude.between(min_lat, max_lat))
+    
+    if min_lon >= -180 and max_lon <= 180:
+        query = query.filter(User.longitude.between(min_lon, max_lon))
+    elif max_lon - min_lon < 360:
+        # Box crosses the antimeridian: split the longitude range
+        if min_lon < -180:
+            query = query.filter(db.or_(User.longitude >= min_lon + 360, User.longitude <= max_lon))
+        else:
+            query = query.filter(db.or_(User.longitude >= min_lon, User.longitude <= max_lon - 360))
+    
+    return query.all()
+
+def volunteer_snapshot_rows(volunteer_ids=None, user_ids=None):
+    """
+    Matching fields for the in-memory volunteer snapshot, one row per volunteer:
+    (id, user_id, name, skills, latitude, longitude, rating, completed_tasks,
+    premium_verified, subscription_type, verification_status).
+    Without arguments every approved volunteer is returned; with ids, the
+    volunteers with those ids / user ids whatever their status.
+    """
+    query = db.session.query(
+        Volunteer.id, Volunteer.user_id, User.name, Volunteer.skills,
+        User.latitude, User.longitude, Volunteer.rating, Volunteer.completed_tasks,
+        Volunteer.premium_verified, Volunteer.subscription_type, Volunteer.verification_status
+    ).join(User, Volunteer.user_id == User.id)
+    
+    if volunteer_ids is None and user_ids is None:
+        return query.filter(Volunteer.verification_status == 'approved').all()
+    if volunteer_ids is not None:
+        query = query.filter(Volunteer.id.in_(list(volunteer_ids)))
+    if user_ids is not None:
+        query = query.filter(Volunteer.user_id.in_(list(user_ids)))
+    return query.all()
@@ -0,0 +1,104 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of OFFSET, each page continues strictly after the sort key of the
+last row of the previous page, so page N costs the same as page 1 (an index
+range scan on the sort columns) and rows inserted meanwhile do not shift
+pages. Cursors are opaque URL-safe strings encoding that sort key.
+"""
+import base64
+import json
+from datetime import datetime
+
+from sqlalchemy import DateTime, and_, literal, or_
+
+
+class InvalidCursor(ValueError):
+    """A cursor that was not produced for this listing or was tampered with"""
+
+
+class KeysetPage:
+    """One page of results plus the cursor for the page after it"""
+
+    def __init__(self, items, next_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+def _encode_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _decode_value(column, value):
+    if value is not None and isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def encode_cursor(values):
+    payload = json.dumps([_encode_value(value) for value in values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, order_by):
+    """Sort-key values from a cursor, converted to the order_by columns' types"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(values, list) or len(values) != len(order_by):
+            raise ValueError('cursor does not match the sort key')
+        return [_decode_value(column, value) for (column, _), value in zip(order_by, values)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(str(e))
+
+
+def _after(order_by, values):
+    """
+    Rows strictly after `values` in the given order:
+    (a > a0) OR (a = a0 AND b > b0) OR ... with > flipped for descending columns.
+    """
+    # Typed binds: SQLAlchemy refuses < and > against bare True/False
+    bounds = [literal(value, column.type) for (column, _), value in zip(order_by, values)]
+    clauses = []
+    for i, (column, descending) in enumerate(order_by):
+        beyond = column < bounds[i] if descending else column > bounds[i]
+        equal_prefix = [order_by[j][0] == bounds[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def keyset_paginate(query, order_by, cursor=None, per_page=20):
+    """
+    Page through a query ordered by order_by, a list of (column, descending)
+    pairs that must end with a unique column (the primary key) so the order
+    is total. The columns must be NOT NULL: NULL compares neither < nor >,
+    so rows holding one would silently drop out of every page after the
+    first. Returns a KeysetPage; raises InvalidCursor for a bad cursor.
+    """
+    nullable = [column.key for column, _ in order_by if getattr(column.expression, 'nullable', False)]
+    if nullable:
+        raise ValueError(f"keyset sort columns must be NOT NULL: {', '.join(nullable)}")
+    if cursor:
+        query = query.filter(_after(order_by, decode_cursor(cursor, order_by)))
+    # Replace any existing ordering: the cursor predicate only holds for this one
+    query = query.order_by(None).order_by(*[column.desc() if descending else column.asc()
+                                            for column, descending in order_by])
+
+    # One extra row tells whether there is a next page
+    rows = query.limit(per_page + 1).all()
+    items = rows[:per_page]
+    next_cursor = None
+    if len(rows) > per_page:
+        last = items[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column, _ in order_by])
+    return KeysetPage(items, next_cursor)
@@ -1,31 +1,70 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app
+from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify, current_app, abort
 from flask_login import login_user, logout_user, login_required, current_user
 from werkzeug.utils import secure_filename
 import os
 from datetime import datetime, timedelta
 from app import db
-from app.models import User, Volunteer, Task, Feedback
-from app.ocr_service import OCRService
+from app.models import (
+    User, Volunteer, Task, Feedback, NEWEST_TASKS_FIRST, PENDING_VOLUNTEERS_ORDER,
+    approved_volunteers_within, approved_volunteers_with_users, pending_volunteers_with_users,
+    tasks_with_people, top_volunteers_by_completed_tasks, volunteer_snapshot_rows
+)
+from app.pagination import InvalidCursor, keyset_paginate
+from app.services.rollups import (
+    monthly_signup_trend, monthly_task_trend, months_back, user_monthly_tasks
+)
+from app.services.stats import compute_user_task_stats, load_platform_stats
+from app.services.ocr_queue import (
+    document_absolute_path, enqueue_ocr_job, latest_ocr_jobs, ocr_queue_counts
+)
+# ML/OCR services are loaded lazily on first use
+from app.services.registry import (
+    get_ai_service, get_ocr_service, get_volunteer_snapshot, loaded_ai_service
+)
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in current_app.config.get('ALLOWED_EXTENSIONS', {'png', 'jpg', 'jpeg', 'gif'})
-# Import AI service with TF-IDF and ML capabilities
-ai_service = None
-try:
-    from app.services.ai_matching import AIMatchingService
-    ai_service = AIMatchingService()
-    print("✅ Using AI matching service with TF-IDF and Cosine Similarity")
-except ImportError as e:
-    print(f"⚠️  ML service unavailable, falling back to simple matching: {e}")
+
+def paginate(query, order_by):
+    """Keyset page of query for the request's ?cursor= and ?per_page=; a bad cursor is a 400"""
+    per_page = request.args.get('per_page', current_app.config.get('PAGE_SIZE', 20), type=int)
+    per_page = max(1, min(per_page, current_app.config.get('MAX_PAGE_SIZE', 100)))
     try:
-        from app.services.simple_ai import SimpleAIMatchingService
-        ai_service = SimpleAIMatchingService()
-        print("Using simple keyword-based matching service")
-    except ImportError:
-        print(f"Warning: No AI service available")
-        ai_service = None
+        return keyset_paginate(query, order_by, cursor=request.args.get('cursor'), per_page=per_page)
+    except InvalidCursor:
+        abort(400, description='Invalid pagination cursor')
+
+def task_summary(task):
+    """JSON representation of a task for the listing APIs"""
+    volunteer = task.assigned_volunteer
+    return {
+        'id': task.id,
+        'title': task.title,
+        'category': task.category,
+        'status': task.status,
+        'urgency': task.urgency,
+        'pincode': task.pincode,
+        'is_commercial': task.is_commercial,
+        'payment_amount': task.payment_amount,
+        'created_by': task.task_creator.name if task.task_creator else None,
+        'assigned_volunteer': volunteer.user_profile.name if volunteer and volunteer.user_profile else None,
+        'created_at': task.created_at.isoformat() if task.created_at else None,
+    }
+
+def volunteer_summary(volunteer):
+    """JSON representation of a volunteer for the listing APIs"""
+    return {
+        'id': volunteer.id,
+        'name': volunteer.user_profile.name,
+        'email': volunteer.user_profile.email,
+        'skills': volunteer.skills,
+        'premium_verified': bool(volunteer.premium_verified),
+        'has_document': bool(volunteer.document_path),
+        'ocr_processed': bool(volunteer.extracted_text),
+        'created_at': volunteer.created_at.isoformat() if volunteer.created_at else None,
+    }
 
 # Create blueprints
 auth_bp = Blueprint('auth', __name__)
@@ -33,9 +72,6 @@ main_bp = Blueprint('main', __name__)
 admin_bp = Blueprint('admin', __name__)
 volunteer_bp = Blueprint('volunteer', __name__)
 
-# Initialize OCR service
-ocr_service = OCRService()
-
 # Authentication routes
 @auth_bp.route('/register', methods=['GET', 'POST'])
 def register():
@@ -112,9 +148,21 @@ def dashboard():
     elif current_user.role == 'volunteer':
         return redirect(url_for('volunteer.dashboard'))
     
-    # User dashboard
-    user_tasks = Task.query.filter_by(user_id=current_user.id).order_by(Task.created_at.desc()).all()
-    return render_template('user_dashboard.html', tasks=user_tasks)
+    # User dashboard: one page of tasks, totals from aggregates
+    page = paginate(tasks_with_people(Task.query.filter_by(user_id=current_user.id)), NEWEST_TASKS_FIRST)
+    stats = compute_user_task_stats(current_user.id)
+    return render_template('user_dashboard.html', tasks=page.items, page=page, stats=stats)
+
+@main_bp.route('/api/tasks')
+@login_required
+def api_tasks():
+    """The current user's tasks, newest first, one keyset page at a time"""
+    page = paginate(tasks_with_people(Task.query.filter_by(user_id=current_user.id)), NEWEST_TASKS_FIRST)
+    return jsonify({
+        'success': True,
+        'items': [task_summary(task) for task in page.items],
+        'next_cursor': page.next_cursor
+    })
 
 @main_bp.route('/post_task', methods=['GET', 'POST'])
 @login_required
@@ -158,26 +206,62 @@ def post_task():
 @main_bp.route('/task/<int:task_id>')
 @login_required
 def view_task(task_id):
-    task = Task.query.get_or_404(task_id)
+    task = tasks_with_people().get_or_404(task_id)
     
     # Get matched volunteers if task is pending
     matched_volunteers = []
-    if task.status == 'pending' and ai_service:
-        # Get approved volunteers
-        volunteers = Volunteer.query.filter_by(verification_status='approved').all()
+    ai_service = get_ai_service() if task.status == 'pending' else None
+    if ai_service:
+        radius_km = current_app.config.get('DEFAULT_RADIUS_KM', 10)
+        fallback_radius_km = current_app.config.get('FALLBACK_RADIUS_KM', 50)
+        candidates_k = current_app.config.get('MATCH_CANDIDATES_K', 25)
         
-        # Filter by location first
-        if task.latitude and task.longitude:
-            volunteers = ai_service.filter_volunteers_by_location(
-                volunteers,
-                task.latitude,
-                task.longitude,
-                radius_km=current_app.config.get('DEFAULT_RADIUS_KM', 10),
-                fallback_radius_km=current_app.config.get('FALLBACK_RADIUS_KM', 50)
+        if hasattr(ai_service, 'rank_from_snapshot'):
+            # Score straight from the in-memory volunteer columns; no ORM
+            # volunteers are loaded, and only changed rows are re-read.
+            # The spatial index query below is this path's radius limit (it
+            # replaces the SQL bounding-box prefilter): everyone within a
+            # radius widened from radius_km to fallback_radius_km, or the
+            # nearest candidates_k if even that is too sparse
+            snapshot = get_volunteer_snapshot(current_app.config.get('VOLUNTEER_SNAPSHOT_MAX_AGE', 300))
+            ai_service.refresh_from_snapshot(snapshot, volunteer_snapshot_rows)
+            
+            nearest_ids = None
+            if task.latitude and task.longitude:
+                nearest_ids = ai_service.nearest_volunteer_ids(
+                    task.latitude, task.longitude, candidates_k,
+                    radius_km=radius_km, max_radius_km=fallback_radius_km
+                )
+                # The index only holds volunteers with a location: with fewer
+                # than candidates_k of them (or none), rank the whole snapshot
+                # so approved volunteers without one are still candidates
+                if nearest_ids is not None and len(nearest_ids) < candidates_k:
+                    nearest_ids = None
+            matched_volunteers = ai_service.rank_from_snapshot(
+                task, snapshot, volunteer_ids=nearest_ids, max_results=5
             )
-        
-        # Rank volunteers using AI matching
-        matched_volunteers = ai_service.rank_volunteers_for_task(task, volunteers, max_results=5)
+        else:
+            # Keyword fallback service: load ORM volunteers per request
+            if task.latitude and task.longitude:
+                # Prefilter by a bounding box in SQL, then refine with the
+                # exact radius check
+                volunteers = approved_volunteers_within(task.latitude, task.longitude, radius_km)
+                if not volunteers:
+                    volunteers = approved_volunteers_within(task.latitude, task.longitude, fallback_radius_km)
+                if not volunteers:
+                    volunteers = approved_volunteers_with_users().all()
+                volunteers = ai_service.filter_volunteers_by_location(
+                    volunteers,
+                    task.latitude,
+                    task.longitude,
+                    radius_km=radius_km,
+                    fallback_radius_km=fallback_radius_km
+                )
+            else:
+                volunteers = approved_volunteers_with_users().all()
+            
+            # Rank volunteers using AI matching
+            matched_volunteers = ai_service.rank_volunteers_for_task(task, volunteers, max_results=5)
     
     return render_template('view_task.html', task=task, matched_volunteers=matched_volunteers)
 
@@ -224,7 +308,7 @@ def complete_task(task_id):
 @main_bp.route('/feedback/<int:task_id>', methods=['GET', 'POST'])
 @login_required
 def submit_feedback(task_id):
-    task = Task.query.get_or_404(task_id)
+    task = tasks_with_people().get_or_404(task_id)
     
     if task.user_id != current_user.id or task.status != 'completed':
         flash('Unauthorized', 'error')
@@ -236,6 +320,7 @@ def submit_feedback(task_id):
         
         # Analyze sentiment using AI service
         sentiment_result = {'compound': 0.0, 'label': 'neutral', 'pos': 0.0, 'neg': 0.0, 'neu': 1.0}
+        ai_service = get_ai_service()
         if ai_service:
             sentiment_result = ai_service.analyze_sentiment(text)
         
@@ -285,18 +370,38 @@ def dashboard():
         return redirect(url_for('volunteer.setup_profile'))
     
     # Get available tasks
-    available_tasks = Task.query.filter_by(status='pending').order_by(Task.created_at.desc()).limit(10).all()
+    available_tasks = tasks_with_people(Task.query.filter_by(status='pending'))\
+        .order_by(Task.created_at.desc()).limit(10).all()
     
-    # Get assigned tasks
-    assigned_tasks = Task.query.filter_by(
-        assigned_volunteer_id=volunteer.id,
-        status='assigned'
-    ).order_by(Task.created_at.desc()).all()
+    # Get assigned tasks, one page at a time
+    assigned_query = Task.query.filter_by(assigned_volunteer_id=volunteer.id, status='assigned')
+    assigned_page = paginate(tasks_with_people(assigned_query), NEWEST_TASKS_FIRST)
+    assigned_count = assigned_query.count()
     
     return render_template('volunteer_dashboard.html', 
                          volunteer=volunteer, 
                          available_tasks=available_tasks,
-                         assigned_tasks=assigned_tasks)
+                         assigned_tasks=assigned_page.items,
+                         assigned_page=assigned_page,
+                         assigned_count=assigned_count)
+
+@volunteer_bp.route('/api/assigned_tasks')
+@login_required
+def api_assigned_tasks():
+    """The volunteer's assigned tasks, newest first, one keyset page at a time"""
+    volunteer = current_user.volunteer_profile if current_user.role == 'volunteer' else None
+    if not volunteer:
+        return jsonify({'success': False, 'message': 'Access denied'}), 403
+    
+    page = paginate(tasks_with_people(Task.query.filter_by(
+        assigned_volunteer_id=volunteer.id,
+        status='assigned'
+    )), NEWEST_TASKS_FIRST)
+    return jsonify({
+        'success': True,
+        'items': [task_summary(task) for task in page.items],
+        'next_cursor': page.next_cursor
+    })
 
 @volunteer_bp.route('/process_premium_payment', methods=['POST'])
 @login_required
@@ -418,6 +523,10 @@ def setup_profile():
         )
         
         db.session.add(volunteer)
+        db.session.flush()
+        
+        # OCR runs in the background worker (flask ocr-worker)
+        enqueue_ocr_job(volunteer)
         db.session.commit()
         
         flash(message, 'success')
@@ -432,7 +541,7 @@ def view_task_detail(task_id):
         flash('Access denied', 'error')
         return redirect(url_for('main.dashboard'))
     
-    task = Task.query.get_or_404(task_id)
+    task = tasks_with_people().get_or_404(task_id)
     volunteer = current_user.volunteer_profile
     
     if not volunteer or volunteer.verification_status != 'approved':
@@ -478,20 +587,8 @@ def dashboard():
         flash('Access denied', 'error')
         return redirect(url_for('main.dashboard'))
     
-    # Get statistics
-    total_users = User.query.count()
-    total_volunteers = Volunteer.query.count()
-    pending_verifications = Volunteer.query.filter_by(verification_status='pending').count()
-    total_tasks = Task.query.count()
-    completed_tasks = Task.query.filter_by(status='completed').count()
-    
-    stats = {
-        'total_users': total_users,
-        'total_volunteers': total_volunteers,
-        'pending_verifications': pending_verifications,
-        'total_tasks': total_tasks,
-        'completed_tasks': completed_tasks
-    }
+    # Materialized counters: one small read regardless of history size
+    stats = load_platform_stats()
     
     return render_template('admin_dashboard.html', stats=stats)
 
@@ -502,61 +599,45 @@ def verify_volunteers():
         flash('Access denied', 'error')
         return redirect(url_for('main.dashboard'))
     
-    # Get pending volunteers, sort premium first
-    pending_volunteers = Volunteer.query.filter_by(verification_status='pending')\
-        .order_by(Volunteer.premium_verified.desc(), Volunteer.created_at.asc()).all()
-    
-    # Process OCR for documents that haven't been processed yet
-    for volunteer in pending_volunteers:
-        if volunteer.document_path and not volunteer.extracted_text:
-            try:
-                # Convert relative path to absolute path for OCR
-                # Handle both old format (app/static/uploads/...) and new format (uploads/...)
-                doc_path = volunteer.document_path
-                if doc_path.startswith('app/static/'):
-                    # Old format - already has app/static prefix
-                    absolute_path = os.path.join(os.getcwd(), doc_path)
-                else:
-                    # New format - needs static folder prefix
-                    absolute_path = os.path.join(current_app.static_folder, doc_path)
-                
-                print(f"DEBUG: Processing volunteer {volunteer.id}")
-                print(f"DEBUG: Original path: {doc_path}")
-                print(f"DEBUG: Absolute path: {absolute_path}")
-                print(f"DEBUG: File exists: {os.path.exists(absolute_path)}")
-                
-                # Use comprehensive document verification
-                verification_result = ocr_service.verify_volunteer_document(
-                    absolute_path, 
-                    volunteer.user_profile.name
-                )
-                
-                # Build extracted text display with all info
-                extracted_info = verification_result.get('extracted_info', {})
-                extracted_display = f"📄 OCR Extraction Results:\n\n"
-                extracted_display += f"Registered Name: {volunteer.user_profile.name}\n"
-                extracted_display += f"Extracted Name: {extracted_info.get('name', '❌ Could not extract name')}\n"
-                if 'id_type' in extracted_info:
-                    extracted_display += f"Document Type: {extracted_info['id_type'].upper()}\n"
-                if 'id_number' in extracted_info:
-                    extracted_display += f"ID Number: {extracted_info['id_number']}\n"
-                extracted_display += f"\nMatch Score: {verification_result.get('match_score', 0):.0%}\n"
-                extracted_display += f"Status: {'✅ VERIFIED' if verification_result.get('verified') else '⚠️ NEEDS REVIEW'}\n"
-                extracted_display += f"Reason: {verification_result.get('reason', 'Unknown')}\n\n"
-                
-                # Add tip if name not found
-                if not extracted_info.get('name'):
-                    extracted_display += "\n💡 Tip: Upload a clearer, well-lit photo of the ID for better results."
-                
-                volunteer.extracted_text = extracted_display
-                
-                db.session.commit()
-            except Exception as e:
-                print(f"OCR Error for volunteer {volunteer.id}: {e}")
-                volunteer.verification_notes = f"OCR Error: {str(e)}"
-                db.session.commit()
-    
-    return render_template('verify_volunteers.html', volunteers=pending_volunteers)
+    # Get one page of pending volunteers, premium first
+    page = paginate(pending_volunteers_with_users(), PENDING_VOLUNTEERS_ORDER)
+    pending_volunteers = page.items
+    
+    # OCR runs in the background worker; show stored results and job status
+    ocr_jobs = latest_ocr_jobs([volunteer.id for volunteer in pending_volunteers])
+    queue_counts = ocr_queue_counts()
+    
+    return render_template('verify_volunteers.html', volunteers=pending_volunteers, page=page,
+                         ocr_jobs=ocr_jobs, queue_counts=queue_counts)
+
+@admin_bp.route('/retry_ocr/<int:volunteer_id>', methods=['POST'])
+@login_required
+def retry_ocr(volunteer_id):
+    if current_user.role != 'admin':
+        flash('Access denied', 'error')
+        return redirect(url_for('main.dashboard'))
+    
+    volunteer = Volunteer.query.get_or_404(volunteer_id)
+    if enqueue_ocr_job(volunteer) is None:
+        flash('This volunteer has no document to process', 'error')
+    else:
+        db.session.commit()
+        flash(f'OCR queued for {volunteer.user_profile.name}', 'success')
+    return redirect(url_for('admin.verify_volunteers'))
+
+@admin_bp.route('/api/pending_volunteers')
+@login_required
+def api_pending_volunteers():
+    """Volunteers awaiting verification, premium first then oldest, one keyset page at a time"""
+    if current_user.role != 'admin':
+        return jsonify({'success': False, 'message': 'Access denied'}), 403
+    
+    page = paginate(pending_volunteers_with_users(), PENDING_VOLUNTEERS_ORDER)
+    return jsonify({
+        'success': True,
+        'items': [volunteer_summary(volunteer) for volunteer in page.items],
+        'next_cursor': page.next_cursor
+    })
 
 @admin_bp.route('/approve_volunteer/<int:volunteer_id>')
 @login_required
@@ -571,6 +652,11 @@ def approve_volunteer(volunteer_id):
     
     db.session.commit()
     
+    ai_service = loaded_ai_service()
+    if hasattr(ai_service, 'index_volunteer'):
+        # Only the TF-IDF service keeps persistent indexes
+        ai_service.index_volunteer(volunteer)
+    
     flash(f'Volunteer {volunteer.user_profile.name} approved', 'success')
     return redirect(url_for('admin.verify_volunteers'))
 
@@ -586,6 +672,10 @@ def reject_volunteer(volunteer_id):
     
     db.session.commit()
     
+    ai_service = loaded_ai_service()
+    if hasattr(ai_service, 'remove_volunteer'):
+        ai_service.remove_volunteer(volunteer.id)
+    
     flash(f'Volunteer {volunteer.user_profile.name} rejected', 'success')
     return redirect(url_for('admin.verify_volunteers'))
 
@@ -602,20 +692,11 @@ def api_verify_document(volunteer_id):
         return jsonify({'error': 'No document uploaded'}), 400
     
     try:
-        # Convert relative path to absolute path for OCR
-        # Handle both old format (app/static/uploads/...) and new format (uploads/...)
-        doc_path = volunteer.document_path
-        if doc_path.startswith('app/static/'):
-            # Old format - already has app/static prefix
-            absolute_path = os.path.join(os.getcwd(), doc_path)
-        else:
-            # New format - needs static folder prefix
-            absolute_path = os.path.join(current_app.static_folder, doc_path)
-        
         # Perform OCR verification
-        verification_result = ocr_service.verify_volunteer_document(
-            absolute_path,
-            volunteer.user_profile.name
+        verification_result = get_ocr_service().verify_volunteer_document(
+            document_absolute_path(volunteer.document_path),
+            volunteer.user_profile.name,
+            timeout=current_app.config.get('OCR_DOCUMENT_TIMEOUT')
         )
         
         return jsonify({
@@ -641,107 +722,31 @@ def view_reports():
         flash('Access denied', 'error')
         return redirect(url_for('main.dashboard'))
     
-    from sqlalchemy import func, extract
-    from datetime import datetime, timedelta
-    
-    # Basic stats
-    total_users = User.query.count()
-    total_volunteers = Volunteer.query.count()
-    total_tasks = Task.query.count()
-    completed_tasks = Task.query.filter_by(status='completed').count()
-    pending_tasks = Task.query.filter_by(status='pending').count()
-    assigned_tasks = Task.query.filter_by(status='assigned').count()
-    
-    # Volunteer stats
-    verified_volunteers = Volunteer.query.filter_by(verification_status='verified').count()
-    pending_volunteers = Volunteer.query.filter_by(verification_status='pending').count()
-    
-    # Task completion rate
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    
-    # Average rating
-    avg_rating = db.session.query(func.avg(Volunteer.rating)).scalar() or 0.0
-    
-    # Feedback stats
-    total_feedback = Feedback.query.count()
-    avg_feedback_rating = db.session.query(func.avg(Feedback.rating)).scalar() or 0.0
+    # Task/volunteer/feedback/commercial counters from the materialized table
+    stats = load_platform_stats()
     
     # Top volunteers by completed tasks
-    top_volunteers = db.session.query(
-        Volunteer, 
-        func.count(Task.id).label('completed_count')
-    ).join(Task, Task.assigned_volunteer_id == Volunteer.id)\
-     .filter(Task.status == 'completed')\
-     .group_by(Volunteer.id)\
-     .order_by(func.count(Task.id).desc())\
-     .limit(5)\
-     .all()
+    top_volunteers = top_volunteers_by_completed_tasks(limit=5)
     
     # Recent tasks
-    recent_tasks = Task.query.order_by(Task.created_at.desc()).limit(10).all()
-    
-    # Tasks by category (if you have categories)
-    category_stats = db.session.query(
-        Task.title,
-        func.count(Task.id).label('count')
-    ).group_by(Task.title).all()
-    
-    # Monthly task trends (last 6 months)
-    six_months_ago = datetime.utcnow() - timedelta(days=180)
-    monthly_tasks = db.session.query(
-        extract('month', Task.created_at).label('month'),
-        func.count(Task.id).label('count')
-    ).filter(Task.created_at >= six_months_ago)\
-     .group_by(extract('month', Task.created_at))\
-     .all()
+    recent_tasks = tasks_with_people().order_by(Task.created_at.desc()).limit(10).all()
+    
+    # Monthly trends (last 6 months) from the rollup tables
+    six_months_ago = months_back(datetime.utcnow().date(), 5)
+    monthly_tasks = [(month.strftime('%Y-%m'), total) for month, total, _ in monthly_task_trend(six_months_ago)]
     
     # User registration trends
-    monthly_users = db.session.query(
-        extract('month', User.created_at).label('month'),
-        func.count(User.id).label('count')
-    ).filter(User.created_at >= six_months_ago)\
-     .group_by(extract('month', User.created_at))\
-     .all()
-    
-    # Commercial stats - Calculate from actual database
-    pro_subscriptions = Volunteer.query.filter_by(subscription_type='pro').count()
-    premium_verifications = Volunteer.query.filter_by(premium_verified=True).count()
-    paid_tasks = Task.query.filter_by(is_commercial=True).count()
-    completed_paid_tasks = Task.query.filter_by(is_commercial=True, status='completed').count()
-    
-    # Calculate revenue (simulated - in production, this would come from payment records)
-    pro_revenue = pro_subscriptions * current_app.config.get('PRO_SUBSCRIPTION_FEE', 199)
-    premium_revenue = premium_verifications * current_app.config.get('PREMIUM_VERIFICATION_FEE', 99)
-    platform_fees = db.session.query(func.sum(Task.platform_fee)).filter(
-        Task.status == 'completed', 
-        Task.is_commercial == True
-    ).scalar() or 0.0
-    
-    commercial_stats = {
-        'monthly_revenue': int(pro_revenue + premium_revenue + platform_fees),
-        'pro_subscriptions': pro_subscriptions,
-        'platform_fees': int(platform_fees),
-        'premium_verifications': premium_verifications,
-        'revenue_growth': 15,  # Mock data - would require historical data
-        'total_paid_tasks': paid_tasks
-    }
+    monthly_users = [(month.strftime('%Y-%m'), total) for month, total in monthly_signup_trend(six_months_ago)]
+    
+    commercial_stats = stats.commercial_stats(
+        current_app.config.get('PRO_SUBSCRIPTION_FEE', 199),
+        current_app.config.get('PREMIUM_VERIFICATION_FEE', 99)
+    )
     
     return render_template('admin_reports.html',
-                         total_users=total_users,
-                         total_volunteers=total_volunteers,
-                         total_tasks=total_tasks,
-                         completed_tasks=completed_tasks,
-                         pending_tasks=pending_tasks,
-                         assigned_tasks=assigned_tasks,
-                         verified_volunteers=verified_volunteers,
-                         pending_volunteers=pending_volunteers,
-                         completion_rate=completion_rate,
-                         avg_rating=avg_rating,
-                         total_feedback=total_feedback,
-                         avg_feedback_rating=avg_feedback_rating,
+                         stats=stats,
                          top_volunteers=top_volunteers,
                          recent_tasks=recent_tasks,
-                         category_stats=category_stats,
                          monthly_tasks=monthly_tasks,
                          monthly_users=monthly_users,
                          commercial_stats=commercial_stats)
@@ -757,6 +762,15 @@ def update_location():
         current_user.longitude = float(data['longitude'])
         db.session.commit()
         
+        # Keep the spatial index in step with approved volunteers' locations
+        volunteer = current_user.volunteer_profile
+        ai_service = loaded_ai_service()
+        if hasattr(ai_service, 'index_volunteer_location') and volunteer \
+                and volunteer.verification_status == 'approved':
+            ai_service.index_volunteer_location(
+                volunteer.id, current_user.latitude, current_user.longitude
+            )
+        
         return jsonify({'success': True})
     
     return jsonify({'success': False}), 400
@@ -769,51 +783,20 @@ def user_analytics():
         flash('Access denied', 'error')
         return redirect(url_for('main.dashboard'))
     
-    from sqlalchemy import func
-    from datetime import datetime, timedelta
-    
-    # Get user's tasks
-    user_tasks = Task.query.filter_by(user_id=current_user.id).all()
-    
-    # Calculate stats
-    total_tasks = len(user_tasks)
-    completed_tasks = len([t for t in user_tasks if t.status == 'completed'])
-    pending_tasks = len([t for t in user_tasks if t.status == 'pending'])
-    assigned_tasks = len([t for t in user_tasks if t.status == 'assigned'])
-    
-    # Calculate completion rate
-    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-    
-    # Get feedback stats
-    task_ids = [t.id for t in user_tasks]
-    feedback_count = Feedback.query.filter(Feedback.task_id.in_(task_ids)).count() if task_ids else 0
-    avg_feedback = db.session.query(func.avg(Feedback.rating))\
-        .filter(Feedback.task_id.in_(task_ids)).scalar() if task_ids else 0.0
-    
-    # Monthly trends (last 6 months)
-    six_months_ago = datetime.utcnow() - timedelta(days=180)
-    recent_tasks = [t for t in user_tasks if t.created_at >= six_months_ago]
-    
-    # Group by month
-    monthly_data = {}
-    for task in recent_tasks:
-        month_key = task.created_at.strftime('%Y-%m')
-        if month_key not in monthly_data:
-            monthly_data[month_key] = {'total': 0, 'completed': 0}
-        monthly_data[month_key]['total'] += 1
-        if task.status == 'completed':
-            monthly_data[month_key]['completed'] += 1
+    # Status counts and feedback stats as grouped SQL aggregates
+    stats = compute_user_task_stats(current_user.id)
+    
+    # Monthly trends (last 6 months) from the per-user rollup table
+    monthly_data = user_monthly_tasks(current_user.id, months_back(datetime.utcnow().date(), 5))
+    
+    # Ten most recent tasks, oldest first (the template lists them newest first)
+    recent_tasks = tasks_with_people(Task.query.filter_by(user_id=current_user.id))\
+        .order_by(Task.created_at.desc(), Task.id.desc()).limit(10).all()
     
     return render_template('user_analytics.html',
-                         total_tasks=total_tasks,
-                         completed_tasks=completed_tasks,
-                         pending_tasks=pending_tasks,
-                         assigned_tasks=assigned_tasks,
-                         completion_rate=completion_rate,
-                         feedback_count=feedback_count,
-                         avg_feedback=avg_feedback or 0.0,
                          monthly_data=monthly_data,
-                         recent_tasks=user_tasks[-10:])
+                         recent_tasks=recent_tasks[::-1],
+                         **stats)
 
 # Admin settings route
 @admin_bp.route('/settings', methods=['GET', 'POST'])
@@ -850,28 +833,29 @@ def export_csv():
         flash('Access denied', 'error')
         return redirect(url_for('main.dashboard'))
     
-    import csv
-    from io import StringIO
-    from flask import make_response
-    
-    # Create CSV data
-    si = StringIO()
-    writer = csv.writer(si)
-    
-    # Write headers
-    writer.writerow(['ID', 'Name', 'Email', 'Role', 'Created At'])
-    
-    # Write user data
-    users = User.query.all()
-    for user in users:
-        writer.writerow([user.id, user.name, user.email, user.role, user.created_at.strftime('%Y-%m-%d')])
-    
-    # Create response
-    output = make_response(si.getvalue())
-    output.headers["Content-Disposition"] = "attachment; filename=users_export.csv"
-    output.headers["Content-type"] = "text/csv"
-    
-    return output
+    from flask import Response, stream_with_context
+    from app.services.exports import EXPORTS, gzip_chunks, iter_csv
+    
+    # ?type=users|tasks|volunteers|feedback, ?gzip=1 for a compressed download
+    kind = request.args.get('type', 'users')
+    if kind not in EXPORTS:
+        flash(f'Unknown export type: {kind}', 'error')
+        return redirect(url_for('admin.view_reports'))
+    compress = request.args.get('gzip') == '1'
+    
+    # Rows are fetched in batches and written out as they arrive
+    batch_size = current_app.config.get('EXPORT_BATCH_SIZE', 1000)
+    chunks = iter_csv(kind, batch_size=batch_size)
+    filename = f'{kind}_export.csv'
+    if compress:
+        chunks = gzip_chunks(chunks)
+        filename += '.gz'
+    
+    response = Response(stream_with_context(chunks),
+                        mimetype='application/gzip' if compress else 'text/csv')
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    response.headers["X-Accel-Buffering"] = "no"  # Let proxies pass chunks through
+    return response
 
 @admin_bp.route('/export/pdf')
 @login_required
@@ -1,10 +1,20 @@
-import numpy as np
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Any
-import math
+
+import numpy as np
+
+from app.services.geo import (
+    AI_PROXIMITY_BUCKETS, distances_and_scores, haversine_km, nearby_mask,
+    proximity_scores, to_coordinate_array
+)
+from app.services.ranking import top_k_indices
+from app.services.spatial_index import VolunteerSpatialIndex
 
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
     from sklearn.metrics.pairwise import cosine_similarity
+    from app.services.skill_index import VolunteerSkillIndex
     SKLEARN_AVAILABLE = True
 except ImportError:
     SKLEARN_AVAILABLE = False
@@ -15,15 +25,21 @@ try:
     from nltk.stem import PorterStemmer
     import nltk
     import re
-    try:
-        nltk.data.find('sentiment/vader_lexicon.zip')
-    except LookupError:
-        nltk.download('vader_lexicon', quiet=True)
     NLTK_AVAILABLE = True
 except ImportError:
     NLTK_AVAILABLE = False
     print("Warning: NLTK not available. Trying TextBlob for sentiment analysis.")
 
+# Never download on import (it blocks without a network): VADER is used only
+# if the lexicon is already installed (python -m nltk.downloader vader_lexicon)
+VADER_AVAILABLE = False
+if NLTK_AVAILABLE:
+    try:
+        nltk.data.find('sentiment/vader_lexicon.zip')
+        VADER_AVAILABLE = True
+    except LookupError:
+        print("Warning: VADER lexicon not installed. Trying TextBlob for sentiment analysis.")
+
 try:
     from textblob import TextBlob
     TEXTBLOB_AVAILABLE = True
@@ -31,24 +47,216 @@ except ImportError:
     TEXTBLOB_AVAILABLE = False
     print("Warning: TextBlob not available.")
 
+NEUTRAL_SENTIMENT = {
+    'compound': 0.0,
+    'label': 'neutral',
+    'pos': 0.0,
+    'neg': 0.0,
+    'neu': 1.0
+}
+
+_sentiment_analyzer = None
+_sentiment_analyzer_lock = threading.Lock()
+
+
+def get_sentiment_analyzer():
+    """VADER analyzer shared by the whole process (the lexicon is loaded once)"""
+    global _sentiment_analyzer
+    if _sentiment_analyzer is None and VADER_AVAILABLE:
+        with _sentiment_analyzer_lock:
+            if _sentiment_analyzer is None:
+                _sentiment_analyzer = SentimentIntensityAnalyzer()
+    return _sentiment_analyzer
+
+
+def _analyze_sentiment(text):
+    """Sentiment of one text using the shared analyzer, TextBlob as fallback"""
+    if not text or len(text.strip()) == 0:
+        return dict(NEUTRAL_SENTIMENT)
+    
+    # Try VADER first (better for social media/informal text)
+    if VADER_AVAILABLE:
+        try:
+            scores = get_sentiment_analyzer().polarity_scores(text)
+            
+            # Determine label based on compound score
+            if scores['compound'] >= 0.05:
+                label = 'positive'
+            elif scores['compound'] <= -0.05:
+                label = 'negative'
+            else:
+                label = 'neutral'
+            
+            return {
+                'compound': scores['compound'],
+                'label': label,
+                'pos': scores['pos'],
+                'neg': scores['neg'],
+                'neu': scores['neu']
+            }
+        except Exception as e:
+            print(f"VADER error: {e}")
+    
+    # Fallback to TextBlob
+    if TEXTBLOB_AVAILABLE:
+        try:
+            blob = TextBlob(text)
+            polarity = blob.sentiment.polarity  # -1 to 1
+            
+            # Convert to VADER-like format
+            if polarity > 0.1:
+                label = 'positive'
+            elif polarity < -0.1:
+                label = 'negative'
+            else:
+                label = 'neutral'
+            
+            return {
+                'compound': polarity,
+                'label': label,
+                'pos': max(0, polarity),
+                'neg': max(0, -polarity),
+                'neu': 1 - abs(polarity)
+            }
+        except Exception as e:
+            print(f"TextBlob error: {e}")
+    
+    # Ultimate fallback - neutral sentiment
+    return dict(NEUTRAL_SENTIMENT)
+
+
+def _analyze_sentiment_chunk(texts):
+    """Process-pool worker: score a chunk of texts with the worker's shared analyzer"""
+    return [_analyze_sentiment(text) for text in texts]
+
+
 class AIMatchingService:
     def __init__(self):
         self.vectorizer = None
+        self.skill_index = None
+        # Persistent spatial index over approved volunteers' coordinates
+        self.spatial_index = VolunteerSpatialIndex()
         self.stemmer = PorterStemmer() if NLTK_AVAILABLE else None
         if SKLEARN_AVAILABLE:
-            # Use custom analyzer with stemming for better word matching
-            if self.stemmer:
-                def stemming_analyzer(text):
-                    # Remove punctuation first, then split and stem
-                    text = re.sub(r'[^\w\s]', ' ', text.lower())
-                    words = text.split()
-                    return [self.stemmer.stem(word) for word in words if len(word) > 2]
-                self.vectorizer = TfidfVectorizer(
-                    analyzer=stemming_analyzer,
-                    max_features=1000
+            self.vectorizer = self._make_vectorizer()
+            # Persistent volunteer skill index, reused across requests
+            self.skill_index = VolunteerSkillIndex(self._make_vectorizer)
+    
+    def _make_vectorizer(self):
+        """Build a fresh TF-IDF vectorizer with the service's analyzer settings"""
+        # Use custom analyzer with stemming for better word matching
+        if self.stemmer:
+            def stemming_analyzer(text):
+                # Remove punctuation first, then split and stem
+                text = re.sub(r'[^\w\s]', ' ', text.lower())
+                words = text.split()
+                return [self.stemmer.stem(word) for word in words if len(word) > 2]
+            return TfidfVectorizer(
+                analyzer=stemming_analyzer,
+                max_features=1000
+            )
+        return TfidfVectorizer(stop_words='english', max_features=1000)
+    
+    def ensure_skill_index(self, load_items):
+        """Fit the skill index on first use from (volunteer_id, skills) pairs"""
+        if self.skill_index is not None and not self.skill_index.is_fitted:
+            self.skill_index.fit(load_items())
+    
+    def ensure_spatial_index(self, load_items):
+        """Build the spatial index on first use from (volunteer_id, lat, lon) rows"""
+        if not self.spatial_index.is_built:
+            self.spatial_index.fit(load_items())
+    
+    def index_volunteer(self, volunteer):
+        """Add or refresh an approved volunteer in the skill and spatial indexes"""
+        if self.skill_index is not None:
+            self.skill_index.upsert(volunteer.id, volunteer.skills or '')
+        self.index_volunteer_location(
+            volunteer.id, volunteer.user_profile.latitude, volunteer.user_profile.longitude
+        )
+    
+    def index_volunteer_location(self, volunteer_id, latitude, longitude):
+        """Move a volunteer in the spatial index (e.g. after a location update)"""
+        if self.spatial_index.is_built:
+            self.spatial_index.upsert(volunteer_id, latitude, longitude)
+    
+    def remove_volunteer(self, volunteer_id):
+        """Drop a volunteer from the indexes (e.g. after rejection)"""
+        if self.skill_index is not None:
+            self.skill_index.remove(volunteer_id)
+        self.spatial_index.remove(volunteer_id)
+    
+    def nearest_volunteer_ids(self, task_lat, task_lon, k, radius_km=10, max_radius_km=50):
+        """
+        Ids of approved volunteers near a task: everyone inside a radius that
+        widens from radius_km until at least k are found, or the k nearest
+        if even max_radius_km is too sparse. Returns None if the spatial
+        index has not been built.
+        """
+        if not self.spatial_index.is_built:
+            return None
+        nearest = self.spatial_index.query(task_lat, task_lon, k, radius_km, max_radius_km)
+        return [vol_id for vol_id, _ in nearest]
+    
+    def refresh_from_snapshot(self, snapshot, load_rows):
+        """
+        Bring the volunteer snapshot up to date and apply the same changes to
+        the skill and spatial indexes, building them from the snapshot on
+        first use.
+        """
+        changed, removed = snapshot.refresh(load_rows)
+        self.ensure_skill_index(snapshot.skill_items)
+        self.ensure_spatial_index(snapshot.location_items)
+        
+        with snapshot.lock:
+            for slot, vol_id in zip(snapshot.slots_for(changed), changed):
+                record = snapshot.record(slot)
+                if self.skill_index is not None:
+                    self.skill_index.upsert(vol_id, record['skills'])
+                self.index_volunteer_location(vol_id, record['latitude'], record['longitude'])
+        for vol_id in removed:
+            self.remove_volunteer(vol_id)
+    
+    def rank_from_snapshot(self, task, snapshot, volunteer_ids=None, max_results=10):
+        """
+        rank_volunteers_for_task over snapshot columns instead of ORM objects.
+        Candidates are the given volunteer ids (e.g. from nearest_volunteer_ids)
+        or the whole snapshot; only the top max_results become dicts.
+        """
+        with snapshot.lock:
+            slots = snapshot.all_slots() if volunteer_ids is None else snapshot.slots_for(volunteer_ids)
+            if not len(slots):
+                return []
+            
+            task_text = self._task_text(task)
+            _, proximity = distances_and_scores(
+                snapshot.latitudes[slots], snapshot.longitudes[slots],
+                task.latitude, task.longitude, AI_PROXIMITY_BUCKETS
+            )
+            
+            # Same weighting rules as _score_pool
+            if self.skill_index is not None and self.skill_index.is_fitted and snapshot.has_skills[slots].any():
+                similarity = self.skill_index.score_rows(
+                    task_text, lambda index: snapshot.skill_rows(index)[slots]
                 )
+                match = (0.85 * similarity) + (0.15 * proximity)
             else:
-                self.vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+                similarity = self._keyword_similarities(task_text, [snapshot.skills(slot) for slot in slots])
+                match = (0.6 * similarity) + (0.4 * proximity)
+            
+            premium = np.where(snapshot.premium[slots], 1.1, 1.0)
+            boosted = match * premium + snapshot.ratings[slots] / 10
+            
+            ranked = []
+            for i in top_k_indices(boosted, max_results):
+                result = snapshot.record(slots[i])
+                result.update({
+                    'match_score': float(boosted[i]),
+                    'similarity_score': float(similarity[i]),
+                    'proximity_score': float(proximity[i])
+                })
+                ranked.append(result)
+            return ranked
     
     def match_volunteers_to_task(self, task_description: str, volunteers: List[Dict], 
                                task_lat: float = None, task_lon: float = None) -> List[Dict]:
@@ -58,119 +266,111 @@ class AIMatchingService:
         if not volunteers:
             return []
         
-        # Prepare volunteer data
-        volunteer_skills = [vol.get('skills', '') or '' for vol in volunteers]
+        similarity, proximity, match = self._score_pool(
+            task_description,
+            [vol.get('id') for vol in volunteers],
+            [vol.get('skills', '') or '' for vol in volunteers],
+            to_coordinate_array([vol.get('latitude') for vol in volunteers]),
+            to_coordinate_array([vol.get('longitude') for vol in volunteers]),
+            task_lat, task_lon
+        )
+        
+        for i, volunteer in enumerate(volunteers):
+            volunteer['match_score'] = match[i]
+            volunteer['similarity_score'] = similarity[i]
+            volunteer['proximity_score'] = proximity[i]
+        
+        # Sort by match score
+        return [volunteers[i] for i in top_k_indices(match, len(volunteers))]
+    
+    def _score_pool(self, task_description, volunteer_ids, volunteer_skills,
+                    lats, lons, task_lat, task_lon):
+        """
+        Score a whole candidate pool without sorting it.
+        Returns (similarity, proximity, match) arrays aligned with the inputs.
+        """
+        _, proximity = distances_and_scores(lats, lons, task_lat, task_lon, AI_PROXIMITY_BUCKETS)
         
         if SKLEARN_AVAILABLE and self.vectorizer and any(volunteer_skills):
-            return self._sklearn_matching(task_description, volunteers, volunteer_skills, task_lat, task_lon)
-        else:
-            return self._fallback_matching(task_description, volunteers, task_lat, task_lon)
+            similarity = self._sklearn_similarities(task_description, volunteer_ids, volunteer_skills)
+            if similarity is not None:
+                # Weighted final score: 85% similarity + 15% proximity (strongly prioritize skill match)
+                return similarity, proximity, (0.85 * similarity) + (0.15 * proximity)
+        
+        similarity = self._keyword_similarities(task_description, volunteer_skills)
+        return similarity, proximity, (0.6 * similarity) + (0.4 * proximity)
     
-    def _sklearn_matching(self, task_description: str, volunteers: List[Dict], 
-                         volunteer_skills: List[str], task_lat: float, task_lon: float) -> List[Dict]:
-        """AI-based matching using TF-IDF and cosine similarity"""
+    def _sklearn_similarities(self, task_description, volunteer_ids, volunteer_skills):
+        """AI-based similarity using TF-IDF and cosine similarity"""
         try:
-            # Create corpus
-            documents = [task_description] + volunteer_skills
+            if self.skill_index is not None and all(vol_id is not None for vol_id in volunteer_ids):
+                # Index only re-vectorizes volunteers that are new or whose skills changed
+                self.skill_index.sync(zip(volunteer_ids, volunteer_skills))
+                return self.skill_index.similarities(task_description, volunteer_ids)
             
-            # Vectorize
+            # Ad-hoc volunteer dicts without ids: fit on this corpus only
+            documents = [task_description] + list(volunteer_skills)
             tfidf_matrix = self.vectorizer.fit_transform(documents)
-            
-            # Calculate similarities
-            task_vector = tfidf_matrix[0]
-            volunteer_vectors = tfidf_matrix[1:]
-            
-            similarities = cosine_similarity(task_vector, volunteer_vectors)[0]
-            
-            # Calculate final scores
-            for i, volunteer in enumerate(volunteers):
-                similarity_score = similarities[i]
-                proximity_score = self._calculate_proximity_score(
-                    volunteer.get('latitude'), volunteer.get('longitude'),
-                    task_lat, task_lon
-                )
-                
-                # Weighted final score: 85% similarity + 15% proximity (strongly prioritize skill match)
-                final_score = (0.85 * similarity_score) + (0.15 * proximity_score)
-                volunteer['match_score'] = final_score
-                volunteer['similarity_score'] = similarity_score
-                volunteer['proximity_score'] = proximity_score
-            
-            # Sort by match score
-            return sorted(volunteers, key=lambda x: x.get('match_score', 0), reverse=True)
+            return cosine_similarity(tfidf_matrix[0], tfidf_matrix[1:])[0]
             
         except Exception as e:
             print(f"Error in sklearn matching: {e}")
-            return self._fallback_matching(task_description, volunteers, task_lat, task_lon)
+            return None
     
-    def _fallback_matching(self, task_description: str, volunteers: List[Dict], 
-                          task_lat: float, task_lon: float) -> List[Dict]:
-        """Simple keyword-based fallback matching"""
+    def _keyword_similarities(self, task_description, volunteer_skills):
+        """Simple keyword-based fallback similarity"""
         task_words = set(task_description.lower().split())
+        similarity = np.zeros(len(volunteer_skills))
         
-        for volunteer in volunteers:
-            skills = volunteer.get('skills', '') or ''
-            skill_words = set(skills.lower().split())
+        for i, skills in enumerate(volunteer_skills):
+            skill_words = set((skills or '').lower().split())
             
             # Simple keyword matching
             common_words = task_words.intersection(skill_words)
-            similarity_score = len(common_words) / max(len(task_words), 1)
-            
-            # Calculate proximity
-            proximity_score = self._calculate_proximity_score(
-                volunteer.get('latitude'), volunteer.get('longitude'),
-                task_lat, task_lon
-            )
-            
-            # Weighted score
-            final_score = (0.6 * similarity_score) + (0.4 * proximity_score)
-            volunteer['match_score'] = final_score
-            volunteer['similarity_score'] = similarity_score
-            volunteer['proximity_score'] = proximity_score
+            similarity[i] = len(common_words) / max(len(task_words), 1)
         
-        return sorted(volunteers, key=lambda x: x.get('match_score', 0), reverse=True)
+        return similarity
     
     def _calculate_proximity_score(self, vol_lat, vol_lon, task_lat, task_lon):
         """Calculate proximity score (1 = very close, 0 = far)"""
         if not all([vol_lat, vol_lon, task_lat, task_lon]):
             return 0.5  # Default score if coordinates missing
         
-        distance_km = self._haversine_distance(vol_lat, vol_lon, task_lat, task_lon)
-        
-        # Convert distance to score (closer = higher score)
-        if distance_km <= 1:
-            return 1.0
-        elif distance_km <= 5:
-            return 0.8
-        elif distance_km <= 10:
-            return 0.6
-        elif distance_km <= 25:
-            return 0.4
-        else:
-            return 0.2
+        _, scores = distances_and_scores([vol_lat], [vol_lon], task_lat, task_lon, AI_PROXIMITY_BUCKETS)
+        return float(scores[0])
     
     def _haversine_distance(self, lat1, lon1, lat2, lon2):
         """Calculate distance between two points using Haversine formula"""
-        R = 6371  # Earth's radius in km
-        
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
+        return float(haversine_km([lat1], [lon1], lat2, lon2)[0])
     
     def rank_volunteers_for_task(self, task, volunteers, max_results=10):
         """
         Rank volunteers for a specific task using AI matching
         Returns a list of volunteer dictionaries sorted by match score
         """
-        # Prepare volunteer data
-        volunteer_data = []
-        for vol in volunteers:
-            volunteer_data.append({
+        if not volunteers:
+            return []
+        
+        similarity, proximity, match = self._score_pool(
+            self._task_text(task),
+            [vol.id for vol in volunteers],
+            [vol.skills or '' for vol in volunteers],
+            to_coordinate_array([vol.user_profile.latitude for vol in volunteers]),
+            to_coordinate_array([vol.user_profile.longitude for vol in volunteers]),
+            task.latitude, task.longitude
+        )
+        
+        # Apply additional filters (prioritize premium, higher ratings):
+        # premium subscribers get a 10% boost, plus a 0-0.5 rating boost
+        premium = np.array([1.1 if vol.premium_verified else 1.0 for vol in volunteers])
+        rating_boost = np.array([(vol.rating or 0) / 10 for vol in volunteers])
+        boosted = match * premium + rating_boost
+        
+        # Partial selection of the best max_results instead of sorting everyone
+        ranked = []
+        for i in top_k_indices(boosted, max_results):
+            vol = volunteers[i]
+            ranked.append({
                 'id': vol.id,
                 'user_id': vol.user_id,
                 'name': vol.user_profile.name,
@@ -180,107 +380,122 @@ class AIMatchingService:
                 'latitude': vol.user_profile.latitude,
                 'longitude': vol.user_profile.longitude,
                 'subscription_type': vol.subscription_type,
-                'premium_verified': vol.premium_verified
+                'premium_verified': vol.premium_verified,
+                'match_score': float(boosted[i]),
+                'similarity_score': float(similarity[i]),
+                'proximity_score': float(proximity[i])
             })
         
-        # Combine title and description for better matching
+        return ranked
+    
+    def _task_text(self, task):
+        """Combine title, description and category for better matching"""
         task_text = f"{task.title} {task.description}"
         if task.category:
             task_text += f" {task.category}"
+        return task_text
+    
+    def rank_pending_tasks(self, tasks, volunteers, top_k=5, max_radius_km=50,
+                           chunk_bytes=64 * 1024 * 1024):
+        """
+        Rank volunteers for many tasks at once.
         
-        # Perform matching
-        matched = self.match_volunteers_to_task(
-            task_text,
-            volunteer_data,
-            task.latitude,
-            task.longitude
-        )
+        Tasks and volunteers are vectorized once, task x volunteer similarity
+        comes from one sparse matrix product per chunk of tasks, proximity
+        from one broadcast haversine per chunk, and the top_k per task are
+        picked with argpartition. Chunks are sized so the dense score block
+        stays under chunk_bytes.
         
-        # Apply additional filters (prioritize premium, higher ratings)
-        for vol in matched:
-            # Boost score for premium subscribers
-            if vol.get('premium_verified'):
-                vol['match_score'] *= 1.1
-            
-            # Boost score based on rating
-            rating_boost = vol.get('rating', 0) / 10  # 0-0.5 boost
-            vol['match_score'] += rating_boost
+        Returns {task_id: [{'volunteer_id', 'match_score', 'similarity_score',
+        'proximity_score', 'distance_km'}, ...]} best first.
+        """
+        if not tasks or not volunteers or self.skill_index is None:
+            return {task.id: [] for task in tasks}
+        
+        volunteer_ids = [vol.id for vol in volunteers]
+        self.skill_index.sync((vol.id, vol.skills or '') for vol in volunteers)
+        task_matrix = self.skill_index.transform_many([self._task_text(task) for task in tasks])
+        if task_matrix is None:
+            return {task.id: [] for task in tasks}
+        volunteer_matrix_t = self.skill_index.rows_for(volunteer_ids).T.tocsc()
+        
+        vol_lats = to_coordinate_array([vol.user_profile.latitude for vol in volunteers])
+        vol_lons = to_coordinate_array([vol.user_profile.longitude for vol in volunteers])
+        task_lats = to_coordinate_array([task.latitude or None for task in tasks])
+        task_lons = to_coordinate_array([task.longitude or None for task in tasks])
+        
+        # Same boosts as rank_volunteers_for_task
+        premium = np.array([1.1 if vol.premium_verified else 1.0 for vol in volunteers])
+        rating_boost = np.array([(vol.rating or 0) / 10 for vol in volunteers])
+        
+        k = min(top_k, len(volunteers))
+        # ~6 dense float64 blocks (similarity, distance, proximity, scores, ...) per chunk
+        chunk_size = max(1, chunk_bytes // (len(volunteers) * 8 * 6))
+        results = {}
         
-        # Re-sort after applying boosts
-        matched = sorted(matched, key=lambda x: x.get('match_score', 0), reverse=True)
+        for start in range(0, len(tasks), chunk_size):
+            stop = min(start + chunk_size, len(tasks))
+            
+            similarity = (task_matrix[start:stop] @ volunteer_matrix_t).toarray()
+            distances = haversine_km(
+                vol_lats[np.newaxis, :], vol_lons[np.newaxis, :],
+                task_lats[start:stop, np.newaxis], task_lons[start:stop, np.newaxis]
+            )
+            proximity = proximity_scores(distances, AI_PROXIMITY_BUCKETS)
+            
+            scores = ((0.85 * similarity) + (0.15 * proximity)) * premium + rating_boost
+            
+            # Like the per-task path, only consider volunteers in range unless
+            # that leaves fewer than top_k (or the task has no location)
+            in_range = distances <= max_radius_km
+            restrict = in_range.sum(axis=1) >= k
+            scores[restrict] = np.where(in_range[restrict], scores[restrict], -np.inf)
+            
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1, kind='stable')
+            top = np.take_along_axis(top, order, axis=1)
+            
+            for row, task in enumerate(tasks[start:stop]):
+                results[task.id] = [
+                    {
+                        'volunteer_id': volunteer_ids[col],
+                        'match_score': float(scores[row, col]),
+                        'similarity_score': float(similarity[row, col]),
+                        'proximity_score': float(proximity[row, col]),
+                        'distance_km': float(distances[row, col])
+                    }
+                    for col in top[row] if np.isfinite(scores[row, col])
+                ]
         
-        return matched[:max_results]
+        return results
     
     def analyze_sentiment(self, text):
         """
         Analyze sentiment of feedback text
         Returns: {'compound': float, 'label': str, 'pos': float, 'neg': float, 'neu': float}
         """
-        if not text or len(text.strip()) == 0:
-            return {
-                'compound': 0.0,
-                'label': 'neutral',
-                'pos': 0.0,
-                'neg': 0.0,
-                'neu': 1.0
-            }
-        
-        # Try VADER first (better for social media/informal text)
-        if NLTK_AVAILABLE:
-            try:
-                sia = SentimentIntensityAnalyzer()
-                scores = sia.polarity_scores(text)
-                
-                # Determine label based on compound score
-                if scores['compound'] >= 0.05:
-                    label = 'positive'
-                elif scores['compound'] <= -0.05:
-                    label = 'negative'
-                else:
-                    label = 'neutral'
-                
-                return {
-                    'compound': scores['compound'],
-                    'label': label,
-                    'pos': scores['pos'],
-                    'neg': scores['neg'],
-                    'neu': scores['neu']
-                }
-            except Exception as e:
-                print(f"VADER error: {e}")
+        return _analyze_sentiment(text)
+    
+    def analyze_sentiment_batch(self, texts, processes=None, chunksize=256):
+        """
+        Analyze many feedback texts in one call, in input order.
         
-        # Fallback to TextBlob
-        if TEXTBLOB_AVAILABLE:
-            try:
-                blob = TextBlob(text)
-                polarity = blob.sentiment.polarity  # -1 to 1
-                
-                # Convert to VADER-like format
-                if polarity > 0.1:
-                    label = 'positive'
-                elif polarity < -0.1:
-                    label = 'negative'
-                else:
-                    label = 'neutral'
-                
-                return {
-                    'compound': polarity,
-                    'label': label,
-                    'pos': max(0, polarity),
-                    'neg': max(0, -polarity),
-                    'neu': 1 - abs(polarity)
-                }
-            except Exception as e:
-                print(f"TextBlob error: {e}")
+        The shared analyzer is reused for every text. With processes > 1 the
+        texts are split into chunks and scored in a process pool (each worker
+        loads the lexicon once), which pays off for backlog rescoring and
+        bulk imports rather than single submissions.
+        """
+        texts = list(texts)
+        if not processes or processes <= 1 or len(texts) <= chunksize:
+            return [_analyze_sentiment(text) for text in texts]
         
-        # Ultimate fallback - neutral sentiment
-        return {
-            'compound': 0.0,
-            'label': 'neutral',
-            'pos': 0.0,
-            'neg': 0.0,
-            'neu': 1.0
-        }
+        chunks = [texts[i:i + chunksize] for i in range(0, len(texts), chunksize)]
+        results = []
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            for chunk_result in executor.map(_analyze_sentiment_chunk, chunks):
+                results.extend(chunk_result)
+        return results
     
     def update_volunteer_rating(self, volunteer, sentiment_result, user_rating):
         """
@@ -310,40 +525,23 @@ class AIMatchingService:
         return new_rating
     
     def filter_volunteers_by_location(self, volunteers, task_lat, task_lon, 
-                                     radius_km=10, fallback_radius_km=50):
+                                     radius_km=10, fallback_radius_km=50, min_results=1):
         """
-        Filter volunteers by location with fallback radius expansion
+        Filter volunteers by location, widening the radius from radius_km
+        (doubling, up to fallback_radius_km) until at least min_results are
+        inside it. In sparse areas the min_results nearest are returned
+        rather than the whole pool.
         """
         if not task_lat or not task_lon:
             return volunteers  # Return all if no location specified
         
-        nearby_volunteers = []
-        
-        # First pass: try with primary radius
-        for vol in volunteers:
-            if vol.user_profile.latitude and vol.user_profile.longitude:
-                distance = self._haversine_distance(
-                    vol.user_profile.latitude,
-                    vol.user_profile.longitude,
-                    task_lat,
-                    task_lon
-                )
-                
-                if distance <= radius_km:
-                    nearby_volunteers.append(vol)
+        # Distances for the whole pool in one vectorized pass
+        lats = to_coordinate_array([vol.user_profile.latitude for vol in volunteers])
+        lons = to_coordinate_array([vol.user_profile.longitude for vol in volunteers])
+        distances = haversine_km(lats, lons, task_lat, task_lon)
         
-        # Fallback: expand radius if no volunteers found
-        if len(nearby_volunteers) == 0:
-            for vol in volunteers:
-                if vol.user_profile.latitude and vol.user_profile.longitude:
-                    distance = self._haversine_distance(
-                        vol.user_profile.latitude,
-                        vol.user_profile.longitude,
-                        task_lat,
-                        task_lon
-                    )
-                    
-                    if distance <= fallback_radius_km:
-                        nearby_volunteers.append(vol)
+        if np.isnan(distances).all():
+            return volunteers  # Nobody has a location to compare against
         
-        return nearby_volunteers if nearby_volunteers else volunteers
\ No newline at end of file
+        within = nearby_mask(distances, radius_km, fallback_radius_km, min_results)
+        return [vol for vol, keep in zip(volunteers, within) if keep]
@@ -0,0 +1,64 @@
+"""
+Committed-change feed for volunteers and their user profiles.
+
+SQLAlchemy session events collect the ids of Volunteer and User rows
+touched by each flush; once the transaction commits the ids are handed to
+every subscriber (rolled-back changes are dropped). Subscribers such as the
+in-memory volunteer snapshot use this to refresh only what changed.
+Kept free of NumPy/ML imports so it can be wired up in create_app().
+"""
+import threading
+from itertools import chain
+
+from sqlalchemy import event
+
+_PENDING_KEY = 'volunteer_change_feed'
+_subscribers = []
+_lock = threading.Lock()
+
+
+def subscribe(callback):
+    """callback(volunteer_ids: set, user_ids: set) is called after every commit that touched them"""
+    with _lock:
+        if callback not in _subscribers:
+            _subscribers.append(callback)
+
+
+def unsubscribe(callback):
+    with _lock:
+        if callback in _subscribers:
+            _subscribers.remove(callback)
+
+
+def _collect(session, flush_context):
+    from app.models import User, Volunteer
+
+    volunteer_ids, user_ids = session.info.setdefault(_PENDING_KEY, (set(), set()))
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Volunteer):
+            volunteer_ids.add(obj.id)
+        elif isinstance(obj, User):
+            user_ids.add(obj.id)
+
+
+def _publish(session):
+    volunteer_ids, user_ids = session.info.pop(_PENDING_KEY, (set(), set()))
+    if not volunteer_ids and not user_ids:
+        return
+    with _lock:
+        subscribers = list(_subscribers)
+    for callback in subscribers:
+        callback(volunteer_ids, user_ids)
+
+
+def _discard(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def register_change_feed(session):
+    """Attach the feed to a session (or scoped_session / sessionmaker); safe to call twice"""
+    if event.contains(session, 'after_flush', _collect):
+        return
+    event.listen(session, 'after_flush', _collect)
+    event.listen(session, 'after_commit', _publish)
+    event.listen(session, 'after_rollback', _discard)
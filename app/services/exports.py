@@ -0,0 +1,126 @@
+"""
+Streaming CSV exports for the admin.
+
+Each export is a column-tuple SELECT fetched in batches with yield_per (a
+server-side cursor on MySQL/PostgreSQL), written through csv.writer into a
+small buffer that is flushed every batch. Memory stays flat however many
+rows there are, and the first bytes leave before the last row is read.
+Optionally the chunks are gzip-compressed on the fly.
+"""
+import csv
+import io
+import zlib
+
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models import User, Volunteer, Task, Feedback
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+def _date(value):
+    return value.strftime('%Y-%m-%d') if value else ''
+
+
+def _datetime(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+
+def _users_export():
+    header = ['ID', 'Name', 'Email', 'Role', 'Created At']
+    query = select(User.id, User.name, User.email, User.role, User.created_at).order_by(User.id)
+
+    def row(r):
+        return [r.id, r.name, r.email, r.role, _date(r.created_at)]
+    return header, query, row
+
+
+def _tasks_export():
+    creator = aliased(User)
+    volunteer_user = aliased(User)
+    header = ['ID', 'Title', 'Category', 'Status', 'Urgency', 'Pincode', 'Posted By',
+              'Assigned Volunteer', 'Commercial', 'Payment Amount', 'Platform Fee',
+              'Created At', 'Completed At']
+    query = select(Task.id, Task.title, Task.category, Task.status, Task.urgency, Task.pincode,
+                   creator.email.label('creator_email'), volunteer_user.name.label('volunteer_name'),
+                   Task.is_commercial, Task.payment_amount, Task.platform_fee,
+                   Task.created_at, Task.completed_at)\
+        .join(creator, Task.user_id == creator.id)\
+        .outerjoin(Volunteer, Task.assigned_volunteer_id == Volunteer.id)\
+        .outerjoin(volunteer_user, Volunteer.user_id == volunteer_user.id)\
+        .order_by(Task.id)
+
+    def row(r):
+        return [r.id, r.title, r.category or '', r.status, r.urgency or '', r.pincode or '',
+                r.creator_email, r.volunteer_name or '', 'yes' if r.is_commercial else 'no',
+                r.payment_amount or 0, r.platform_fee or 0,
+                _datetime(r.created_at), _datetime(r.completed_at)]
+    return header, query, row
+
+
+def _volunteers_export():
+    header = ['ID', 'Name', 'Email', 'Skills', 'Verification Status', 'Rating', 'Completed Tasks',
+              'Subscription', 'Premium Verified', 'Created At']
+    query = select(Volunteer.id, User.name, User.email, Volunteer.skills,
+                   Volunteer.verification_status, Volunteer.rating, Volunteer.completed_tasks,
+                   Volunteer.subscription_type, Volunteer.premium_verified, Volunteer.created_at)\
+        .join(User, Volunteer.user_id == User.id)\
+        .order_by(Volunteer.id)
+
+    def row(r):
+        return [r.id, r.name, r.email, r.skills or '', r.verification_status,
+                round(r.rating or 0, 2), r.completed_tasks or 0, r.subscription_type or 'basic',
+                'yes' if r.premium_verified else 'no', _date(r.created_at)]
+    return header, query, row
+
+
+def _feedback_export():
+    header = ['ID', 'Task ID', 'User ID', 'Volunteer ID', 'Rating', 'Sentiment', 'Sentiment Score',
+              'Text', 'Created At']
+    query = select(Feedback.id, Feedback.task_id, Feedback.user_id, Feedback.volunteer_id,
+                   Feedback.rating, Feedback.sentiment_label, Feedback.sentiment_score,
+                   Feedback.text, Feedback.created_at).order_by(Feedback.id)
+
+    def row(r):
+        score = '' if r.sentiment_score is None else round(r.sentiment_score, 3)
+        return [r.id, r.task_id, r.user_id, r.volunteer_id, r.rating, r.sentiment_label or '',
+                score, r.text or '', _datetime(r.created_at)]
+    return header, query, row
+
+
+EXPORTS = {
+    'users': _users_export,
+    'tasks': _tasks_export,
+    'volunteers': _volunteers_export,
+    'feedback': _feedback_export,
+}
+
+
+def iter_csv(kind, batch_size=DEFAULT_BATCH_SIZE):
+    """Yield the CSV for one export as str chunks of about batch_size rows each"""
+    header, query, to_row = EXPORTS[kind]()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    result = db.session.execute(query.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        writer.writerows(to_row(r) for r in partition)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def gzip_chunks(chunks, level=6):
+    """Gzip-compress a stream of str chunks incrementally"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,106 @@
+"""
+Vectorized geo helpers shared by the matching services.
+
+Distances and proximity scores are computed for a whole candidate pool in
+one NumPy pass instead of one Python math call per volunteer.
+"""
+import numpy as np
+
+EARTH_RADIUS_KM = 6371
+
+# Proximity buckets: distance upper bounds (km) and the score for each bucket.
+# The last score applies to anything beyond the final bound.
+AI_PROXIMITY_BUCKETS = ((1, 5, 10, 25), (1.0, 0.8, 0.6, 0.4, 0.2))
+SIMPLE_PROXIMITY_BUCKETS = ((1, 2, 5, 10, 25, 50), (1.0, 0.9, 0.8, 0.6, 0.4, 0.2, 0.1))
+
+
+def to_coordinate_array(values):
+    """Convert a sequence of coordinates (None allowed) to a float array with NaN for missing"""
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def haversine_km(lats, lons, lat, lon):
+    """
+    Distances (km) from every (lats[i], lons[i]) to the point (lat, lon).
+    Missing coordinates (NaN) give NaN distances.
+    """
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lons = np.radians(np.asarray(lons, dtype=float))
+    lat, lon = np.radians(lat), np.radians(lon)
+
+    dlat = lat - lats
+    dlon = lon - lons
+
+    a = np.sin(dlat / 2) ** 2 + np.cos(lats) * np.cos(lat) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def proximity_scores(distances, buckets=AI_PROXIMITY_BUCKETS, missing_score=0.5):
+    """Map a distance vector to bucketed proximity scores (1 = very close)"""
+    bounds, scores = buckets
+    distances = np.asarray(distances, dtype=float)
+    result = np.asarray(scores, dtype=float)[np.searchsorted(bounds, distances, side='left')]
+    result[np.isnan(distances)] = missing_score
+    return result
+
+
+def linear_proximity_scores(distances, max_distance_km=50, missing_score=0.0):
+    """Linear proximity score: 1.0 at 0 km falling to 0.0 at max_distance_km"""
+    distances = np.asarray(distances, dtype=float)
+    result = np.clip(1 - distances / max_distance_km, 0.0, 1.0)
+    result[np.isnan(distances)] = missing_score
+    return result
+
+
+def distances_and_scores(lats, lons, lat, lon, buckets=AI_PROXIMITY_BUCKETS, missing_score=0.5):
+    """
+    Distance vector and bucketed proximity-score vector for a whole pool.
+    If the task has no location every distance is NaN and every score is missing_score.
+    """
+    lats = np.asarray(lats, dtype=float)
+    if lat is None or lon is None:
+        distances = np.full(lats.shape, np.nan)
+    else:
+        distances = haversine_km(lats, lons, lat, lon)
+    return distances, proximity_scores(distances, buckets, missing_score)
+
+
+def nearby_mask(distances, radius_km, max_radius_km, min_results=1):
+    """
+    Boolean mask of the pool members to keep: everyone inside a radius that
+    doubles from radius_km (capped at max_radius_km) until at least
+    min_results are inside it, or else the min_results nearest located ones.
+    NaN distances (no location) are never selected.
+    """
+    distances = np.asarray(distances, dtype=float)
+    located = ~np.isnan(distances)
+
+    radius = radius_km
+    while True:
+        within = distances <= radius
+        if within.sum() >= min_results or radius >= max_radius_km:
+            break
+        radius = min(radius * 2, max_radius_km)
+
+    if within.sum() < min_results:
+        # Sparse area: take the nearest volunteers that have a location
+        order = np.argsort(np.where(located, distances, np.inf), kind='stable')
+        within = np.zeros(len(distances), dtype=bool)
+        within[order[:min(max(min_results, 1), int(located.sum()))]] = True
+    return within
+
+
+def bounding_box(lat, lon, radius_km):
+    """
+    (min_lat, max_lat, min_lon, max_lon) of a box that contains every point
+    within radius_km of (lat, lon). Used as a cheap, index-friendly SQL
+    prefilter; the exact haversine check refines it afterwards.
+    """
+    dlat = float(np.degrees(radius_km / EARTH_RADIUS_KM))
+    cos_lat = float(np.cos(np.radians(lat)))
+    if cos_lat < 1e-6 or abs(lat) + dlat >= 90:
+        # Box touches a pole: every longitude qualifies
+        dlon = 180.0
+    else:
+        dlon = min(180.0, float(np.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))))
+    return (max(-90.0, lat - dlat), min(90.0, lat + dlat), lon - dlon, lon + dlon)
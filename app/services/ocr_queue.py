@@ -0,0 +1,221 @@
+"""
+Durable OCR job queue.
+
+volunteer.setup_profile enqueues an OcrJob when a document is uploaded and
+`flask ocr-worker` drains the queue in a separate process, so the admin
+verification page only reads stored results instead of running OpenCV and
+Tesseract inline.
+
+Claiming is a compare-and-swap UPDATE (status and claimed_at must still be
+what the worker read), so concurrent workers never process the same job,
+on SQLite as well as MySQL. A job left running longer than the stale timeout
+(a crashed worker) becomes claimable again; failures are retried until
+max_attempts, then the job is marked failed with the error.
+"""
+import json
+import os
+import socket
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import and_, or_, update
+
+from app import db
+from app.models import Volunteer, OcrJob
+from app.services.registry import get_ocr_service
+
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_STALE_SECONDS = 600
+ACTIVE_STATUSES = ('queued', 'running')
+
+
+def default_worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def document_absolute_path(document_path):
+    """Filesystem path of a stored document path (old app/static/... or new uploads/... format)"""
+    if document_path.startswith('app/static/'):
+        return os.path.join(os.getcwd(), document_path)
+    return os.path.join(current_app.static_folder, document_path)
+
+
+def format_verification_summary(registered_name, verification_result):
+    """The OCR summary shown to admins on the verification page"""
+    extracted_info = verification_result.get('extracted_info', {})
+    summary = f"📄 OCR Extraction Results:\n\n"
+    summary += f"Registered Name: {registered_name}\n"
+    summary += f"Extracted Name: {extracted_info.get('name', '❌ Could not extract name')}\n"
+    if 'id_type' in extracted_info:
+        summary += f"Document Type: {extracted_info['id_type'].upper()}\n"
+    if 'id_number' in extracted_info:
+        summary += f"ID Number: {extracted_info['id_number']}\n"
+    summary += f"\nMatch Score: {verification_result.get('match_score', 0):.0%}\n"
+    summary += f"Status: {'✅ VERIFIED' if verification_result.get('verified') else '⚠️ NEEDS REVIEW'}\n"
+    summary += f"Reason: {verification_result.get('reason', 'Unknown')}\n\n"
+
+    # Add tip if name not found
+    if not extracted_info.get('name'):
+        summary += "\n💡 Tip: Upload a clearer, well-lit photo of the ID for better results."
+    return summary
+
+
+def store_verification_result(volunteer, verification_result):
+    """
+    Save an OCR result on the volunteer and settle its queued jobs for the
+    same document (e.g. when the backlog was processed by `flask ocr-backlog`).
+    Runs in the caller's transaction: nothing is stored until it commits. The
+    jobs are settled with a bulk UPDATE that skips session
+    synchronization, so OcrJob objects already loaded keep their old status
+    until the commit expires them.
+    """
+    volunteer.extracted_text = format_verification_summary(volunteer.user_profile.name, verification_result)
+    now = datetime.utcnow()
+    OcrJob.query.filter(
+        OcrJob.volunteer_id == volunteer.id,
+        OcrJob.document_path == volunteer.document_path,
+        OcrJob.status == 'queued'
+    ).update({'status': 'done', 'finished_at': now, 'result': json.dumps(verification_result, default=str)},
+             synchronize_session=False)
+
+
+def enqueue_ocr_job(volunteer):
+    """
+    Queue OCR of the volunteer's current document in the caller's transaction
+    (the volunteer must have an id, i.e. be flushed). Returns the job, or the
+    already active job for the same document.
+    """
+    if not volunteer.document_path:
+        return None
+    active = OcrJob.query.filter(
+        OcrJob.volunteer_id == volunteer.id,
+        OcrJob.document_path == volunteer.document_path,
+        OcrJob.status.in_(ACTIVE_STATUSES)
+    ).first()
+    if active:
+        return active
+
+    job = OcrJob(
+        volunteer_id=volunteer.id,
+        document_path=volunteer.document_path,
+        priority=1 if volunteer.premium_verified else 0
+    )
+    db.session.add(job)
+    return job
+
+
+def backfill_ocr_jobs():
+    """Queue jobs for pending volunteers whose documents were never processed; returns how many"""
+    has_job = OcrJob.query.filter(OcrJob.volunteer_id == Volunteer.id).exists()
+    volunteers = Volunteer.query.filter(
+        Volunteer.verification_status == 'pending',
+        Volunteer.document_path.isnot(None),
+        Volunteer.extracted_text.is_(None),
+        ~has_job
+    ).all()
+    for volunteer in volunteers:
+        enqueue_ocr_job(volunteer)
+    db.session.commit()
+    return len(volunteers)
+
+
+def claim_next_job(worker_id, stale_seconds=DEFAULT_STALE_SECONDS, retries=5):
+    """
+    Atomically move the next claimable job to running and return it, or None
+    if the queue is empty. Premium jobs first, then oldest.
+    """
+    for _ in range(retries):
+        now = datetime.utcnow()
+        claimable = or_(
+            OcrJob.status == 'queued',
+            and_(OcrJob.status == 'running', OcrJob.claimed_at < now - timedelta(seconds=stale_seconds))
+        )
+        candidate = db.session.query(OcrJob.id, OcrJob.status, OcrJob.claimed_at)\
+            .filter(claimable).order_by(OcrJob.priority.desc(), OcrJob.id).first()
+        if candidate is None:
+            return None
+
+        # Only succeeds if no other worker changed the row since we read it
+        unchanged = OcrJob.claimed_at.is_(None) if candidate.claimed_at is None \
+            else OcrJob.claimed_at == candidate.claimed_at
+        result = db.session.execute(
+            update(OcrJob)
+            .where(OcrJob.id == candidate.id, OcrJob.status == candidate.status, unchanged)
+            .values(status='running', worker=worker_id, claimed_at=now, attempts=OcrJob.attempts + 1)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount == 1:
+            return db.session.get(OcrJob, candidate.id, populate_existing=True)
+    return None
+
+
+def _finish_failed(job, error, max_attempts):
+    job.error = error
+    job.worker = None
+    if job.attempts >= max_attempts:
+        job.status = 'failed'
+        job.finished_at = datetime.utcnow()
+    else:
+        job.status = 'queued'
+
+
+def process_job(job, ocr_service=None, max_attempts=DEFAULT_MAX_ATTEMPTS, timeout=None):
+    """
+    Run OCR for a claimed job and store the result on the job and the
+    volunteer. timeout is the per-document OCR budget in seconds; running out
+    counts as a failed attempt.
+    """
+    if job.attempts > max_attempts:
+        # Reclaimed after its worker died on the last allowed attempt
+        _finish_failed(job, job.error or f'Gave up after {max_attempts} attempts', max_attempts)
+        db.session.commit()
+        return job
+
+    volunteer = job.volunteer
+    if volunteer is None or volunteer.document_path != job.document_path:
+        # Profile deleted or document replaced since the job was queued
+        job.status = 'failed'
+        job.error = 'Document no longer current'
+        job.finished_at = datetime.utcnow()
+        db.session.commit()
+        return job
+
+    try:
+        service = ocr_service or get_ocr_service()
+        if service is None:
+            raise RuntimeError('OCR service unavailable (pytesseract/OpenCV not installed)')
+        verification_result = service.verify_volunteer_document(
+            document_absolute_path(job.document_path),
+            volunteer.user_profile.name,
+            timeout=timeout
+        )
+        if verification_result.get('timed_out'):
+            raise TimeoutError(verification_result['reason'])
+    except Exception as e:
+        print(f"OCR Error for volunteer {job.volunteer_id} (job {job.id}): {e}")
+        _finish_failed(job, str(e), max_attempts)
+        db.session.commit()
+        return job
+
+    store_verification_result(volunteer, verification_result)
+    job.result = json.dumps(verification_result, default=str)
+    job.status = 'done'
+    job.error = None
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    return job
+
+
+def latest_ocr_jobs(volunteer_ids):
+    """{volunteer_id: most recent OcrJob} for the given volunteers, in one query"""
+    if not volunteer_ids:
+        return {}
+    jobs = OcrJob.query.filter(OcrJob.volunteer_id.in_(volunteer_ids)).order_by(OcrJob.id).all()
+    return {job.volunteer_id: job for job in jobs}
+
+
+def ocr_queue_counts():
+    """{status: job count}"""
+    rows = db.session.query(OcrJob.status, db.func.count(OcrJob.id)).group_by(OcrJob.status)
+    return {status: count for status, count in rows}
@@ -0,0 +1,21 @@
+"""Partial selection helpers for the ranking pipeline"""
+import numpy as np
+
+
+def top_k_indices(scores, k):
+    """
+    Indices of the k highest scores, best first.
+
+    Uses argpartition (O(n)) and only sorts the k survivors, instead of
+    sorting the whole pool. Ties keep their original order.
+    """
+    scores = np.asarray(scores, dtype=float)
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-scores, kind='stable')
+
+    top = np.argpartition(-scores, k - 1)[:k]
+    # Sort survivors by score, breaking ties by original position
+    return top[np.lexsort((top, -scores[top]))]
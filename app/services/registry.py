@@ -0,0 +1,121 @@
+"""
+Lazy registry for the heavy ML/OCR services.
+
+Importing app.routes no longer pulls in scikit-learn, NLTK, TextBlob,
+OpenCV or pytesseract: each service is built on first use (or by an
+explicit warm_up()), once per process, and the import time of every
+optional dependency is recorded so slow starts can be diagnosed.
+Nothing here touches the network.
+"""
+import importlib
+import threading
+import time
+
+# Optional dependencies in the order the services need them
+AI_DEPENDENCIES = ['numpy', 'scipy', 'sklearn', 'nltk', 'textblob']
+OCR_DEPENDENCIES = ['numpy', 'cv2', 'PIL', 'pytesseract']
+
+_lock = threading.RLock()
+_services = {}
+_dependency_report = {}
+
+
+def _timed_import(module_name):
+    """Import a dependency once and record how long it took"""
+    if module_name in _dependency_report:
+        return _dependency_report[module_name]['available']
+
+    start = time.perf_counter()
+    try:
+        importlib.import_module(module_name)
+        available, error = True, None
+    except ImportError as e:
+        available, error = False, str(e)
+    _dependency_report[module_name] = {
+        'available': available,
+        'seconds': time.perf_counter() - start,
+        'error': error
+    }
+    return available
+
+
+def _build_ai_service():
+    for name in AI_DEPENDENCIES:
+        _timed_import(name)
+    try:
+        from app.services.ai_matching import AIMatchingService
+        service = AIMatchingService()
+        print("✅ Using AI matching service with TF-IDF and Cosine Similarity")
+        return service
+    except ImportError as e:
+        print(f"⚠️  ML service unavailable, falling back to simple matching: {e}")
+    try:
+        from app.services.simple_ai import SimpleAIMatchingService
+        service = SimpleAIMatchingService()
+        print("Using simple keyword-based matching service")
+        return service
+    except ImportError:
+        print("Warning: No AI service available")
+        return None
+
+
+def _build_ocr_service():
+    for name in OCR_DEPENDENCIES:
+        _timed_import(name)
+    try:
+        from app.ocr_service import OCRService
+        return OCRService()
+    except ImportError as e:
+        print(f"Warning: OCR service unavailable: {e}")
+        return None
+
+
+_BUILDERS = {
+    'ai': _build_ai_service,
+    'ocr': _build_ocr_service,
+}
+
+
+def _get(name):
+    if name not in _services:
+        with _lock:
+            if name not in _services:
+                _services[name] = _BUILDERS[name]()
+    return _services[name]
+
+
+def get_ai_service():
+    """Matching service (TF-IDF, or keyword fallback), built on first use"""
+    return _get('ai')
+
+
+def get_ocr_service():
+    """OCR service, built on first use"""
+    return _get('ocr')
+
+
+def get_volunteer_snapshot(max_age_seconds=300):
+    """Process-wide columnar snapshot of approved volunteers, created on first use"""
+    from app.services.volunteer_snapshot import get_volunteer_snapshot as _get_snapshot
+    return _get_snapshot(max_age_seconds)
+
+
+def loaded_ai_service():
+    """
+    The matching service if it has already been built, else None.
+    Used for index maintenance: an unbuilt service will load fresh indexes
+    from the database anyway, so there is nothing to update.
+    """
+    return _services.get('ai')
+
+
+def warm_up(services=('ai', 'ocr')):
+    """Build the given services now (e.g. at worker start) and return the dependency report"""
+    for name in services:
+        _get(name)
+    return dependency_report()
+
+
+def dependency_report():
+    """{module: {'available', 'seconds', 'error'}} for every dependency imported so far"""
+    return {name: dict(info) for name, info in _dependency_report.items()}
@@ -0,0 +1,317 @@
+"""
+Time-bucketed rollups for report trends.
+
+task_rollups, user_task_rollups and signup_rollups hold counts per day and
+per month, so report pages read trends with a range query on the bucket
+instead of grouping the source tables by extract('month') on every load
+(which also merged the same month of different years).
+
+refresh_rollups() is the incremental job: it re-aggregates every bucket from
+(watermark - lookback) onwards with range queries on created_at, replaces
+those buckets, and moves the watermark. Buckets are keyed by creation time,
+so a later change to an older row (a task completed weeks after it was
+posted) would not be picked up by that window: a flush hook records the
+month of every such row in rollup_dirty_months, in the same transaction as
+the change, and the next refresh re-aggregates those months as well.
+Writes that bypass the ORM need `flask refresh-rollups --full`.
+
+Rollups are built by the CLI (or once at startup on a fresh database),
+never during a page request.
+"""
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from itertools import chain
+
+from sqlalchemy import event, inspect
+
+from app import db
+from app.models import Task, User, TaskRollup, UserTaskRollup, SignupRollup, RollupState, RollupDirtyMonth
+
+JOB_NAME = 'report_rollups'
+DEFAULT_LOOKBACK_DAYS = 7
+PINCODE_PREFIX_LENGTH = 3  # Postal region + sorting district
+
+# Columns that decide which rollup buckets a row counts in
+ROLLUP_COLUMNS = {
+    Task: ('created_at', 'status', 'category', 'pincode', 'is_commercial', 'platform_fee', 'user_id'),
+    User: ('created_at', 'role'),
+}
+
+
+def _as_date(value):
+    """DATE() comes back as a string on SQLite and a date elsewhere"""
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(day):
+    return months_back(day, -1)
+
+
+def months_back(day, months):
+    """First day of the month `months` months before day's month"""
+    index = day.year * 12 + day.month - 1 - months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def rollup_watermark():
+    state = db.session.get(RollupState, JOB_NAME)
+    return state.watermark if state else None
+
+
+def _aggregate_tasks(since, until=None):
+    """Day x status x category x pincode prefix aggregates for tasks created in [since, until)"""
+    day = db.func.date(Task.created_at)
+    prefix = db.func.coalesce(db.func.substr(Task.pincode, 1, PINCODE_PREFIX_LENGTH), '')
+    query = db.session.query(
+        day, Task.status, db.func.coalesce(Task.category, ''), prefix,
+        db.func.count(Task.id),
+        db.func.coalesce(db.func.sum(db.case((Task.is_commercial == True, 1), else_=0)), 0),
+        db.func.coalesce(db.func.sum(db.case((Task.is_commercial == True, Task.platform_fee), else_=0.0)), 0.0)
+    ).filter(Task.created_at.isnot(None))
+    if since is not None:
+        query = query.filter(Task.created_at >= since)
+    if until is not None:
+        query = query.filter(Task.created_at < until)
+    return query.group_by(day, Task.status, db.func.coalesce(Task.category, ''), prefix).all()
+
+
+def _aggregate_user_tasks(since, until=None):
+    day = db.func.date(Task.created_at)
+    query = db.session.query(Task.user_id, day, Task.status, db.func.count(Task.id))\
+        .filter(Task.created_at.isnot(None))
+    if since is not None:
+        query = query.filter(Task.created_at >= since)
+    if until is not None:
+        query = query.filter(Task.created_at < until)
+    return query.group_by(Task.user_id, day, Task.status).all()
+
+
+def _aggregate_signups(since, until=None):
+    day = db.func.date(User.created_at)
+    query = db.session.query(day, User.role, db.func.count(User.id))\
+        .filter(User.created_at.isnot(None))
+    if since is not None:
+        query = query.filter(User.created_at >= since)
+    if until is not None:
+        query = query.filter(User.created_at < until)
+    return query.group_by(day, User.role).all()
+
+
+def refresh_rollups(now=None, lookback_days=DEFAULT_LOOKBACK_DAYS, full=False):
+    """
+    Rebuild every day bucket from (watermark - lookback_days), every month
+    bucket from the start of that month, and every older month recorded in
+    rollup_dirty_months, in one transaction. The first run (or full=True)
+    rebuilds all history. Returns a summary dict.
+    """
+    now = now or datetime.utcnow()
+    marked_before = datetime.utcnow()
+    watermark = None if full else rollup_watermark()
+
+    if watermark is None:
+        day_start = month_from = None
+        since = None
+        dirty_months = []
+    else:
+        day_start = (min(watermark, now) - timedelta(days=lookback_days)).date()
+        month_from = month_start(day_start)
+        # Month buckets are rebuilt whole, so aggregate from the month start
+        since = datetime.combine(month_from, datetime.min.time())
+        dirty_months = [month for (month,) in db.session.query(RollupDirtyMonth.month)
+                        .filter(RollupDirtyMonth.month < month_from).order_by(RollupDirtyMonth.month)]
+
+    # (since, until) ranges to aggregate: the window, then each stale older month
+    ranges = [(since, None)] + [
+        (datetime.combine(month, datetime.min.time()), datetime.combine(next_month(month), datetime.min.time()))
+        for month in dirty_months
+    ]
+
+    task_days = defaultdict(lambda: [0, 0, 0.0])
+    task_months = defaultdict(lambda: [0, 0, 0.0])
+    user_months = defaultdict(int)
+    signup_days, signup_months = defaultdict(int), defaultdict(int)
+    for range_start, range_end in ranges:
+        for day, status, category, prefix, count, commercial, fees in _aggregate_tasks(range_start, range_end):
+            day = _as_date(day)
+            for buckets, bucket in ((task_days, day), (task_months, month_start(day))):
+                totals = buckets[(bucket, status, category, prefix)]
+                totals[0] += count
+                totals[1] += int(commercial or 0)
+                totals[2] += float(fees or 0)
+
+        for user_id, day, status, count in _aggregate_user_tasks(range_start, range_end):
+            user_months[(user_id, month_start(_as_date(day)), status)] += count
+
+        for day, role, count in _aggregate_signups(range_start, range_end):
+            day = _as_date(day)
+            signup_days[(day, role)] += count
+            signup_months[(month_start(day), role)] += count
+
+    # Replace the refreshed window and the stale months
+    def window(query, model, start):
+        return query if start is None else query.filter(model.bucket >= start)
+
+    window(TaskRollup.query.filter_by(granularity='day'), TaskRollup, day_start).delete(synchronize_session=False)
+    window(TaskRollup.query.filter_by(granularity='month'), TaskRollup, month_from).delete(synchronize_session=False)
+    window(UserTaskRollup.query, UserTaskRollup, month_from).delete(synchronize_session=False)
+    window(SignupRollup.query.filter_by(granularity='day'), SignupRollup, day_start).delete(synchronize_session=False)
+    window(SignupRollup.query.filter_by(granularity='month'), SignupRollup, month_from).delete(synchronize_session=False)
+    for month in dirty_months:
+        for model in (TaskRollup, SignupRollup):
+            model.query.filter(model.granularity == 'day', model.bucket >= month,
+                               model.bucket < next_month(month)).delete(synchronize_session=False)
+            model.query.filter(model.granularity == 'month', model.bucket == month)\
+                .delete(synchronize_session=False)
+        UserTaskRollup.query.filter(UserTaskRollup.bucket == month).delete(synchronize_session=False)
+
+    dirty = set(dirty_months)
+
+    def replaced(bucket, start):
+        return start is None or bucket >= start or month_start(bucket) in dirty
+
+    task_rows = [
+        {'granularity': granularity, 'bucket': bucket, 'status': status, 'category': category,
+         'pincode_prefix': prefix, 'task_count': count, 'commercial_count': commercial,
+         'platform_fees': fees}
+        for granularity, buckets, start in (('day', task_days, day_start), ('month', task_months, month_from))
+        for (bucket, status, category, prefix), (count, commercial, fees) in buckets.items()
+        if replaced(bucket, start)
+    ]
+    user_rows = [
+        {'user_id': user_id, 'bucket': bucket, 'status': status, 'task_count': count}
+        for (user_id, bucket, status), count in user_months.items()
+    ]
+    signup_rows = [
+        {'granularity': granularity, 'bucket': bucket, 'role': role, 'user_count': count}
+        for granularity, buckets, start in (('day', signup_days, day_start), ('month', signup_months, month_from))
+        for (bucket, role), count in buckets.items()
+        if replaced(bucket, start)
+    ]
+    for model, rows in ((TaskRollup, task_rows), (UserTaskRollup, user_rows), (SignupRollup, signup_rows)):
+        if rows:
+            db.session.execute(model.__table__.insert(), rows)
+
+    # Every recorded month is now covered (by the window, the dirty months or
+    # a full rebuild); months marked again while this ran stay for next time
+    RollupDirtyMonth.query.filter(RollupDirtyMonth.marked_at <= marked_before).delete(synchronize_session=False)
+
+    state = db.session.get(RollupState, JOB_NAME)
+    if state is None:
+        state = RollupState(name=JOB_NAME, watermark=now)
+        db.session.add(state)
+    state.watermark = now
+    db.session.commit()
+
+    return {
+        'from': day_start,
+        'dirty_months': len(dirty_months),
+        'task_rows': len(task_rows),
+        'user_task_rows': len(user_rows),
+        'signup_rows': len(signup_rows),
+    }
+
+
+def ensure_rollups(lookback_days=DEFAULT_LOOKBACK_DAYS):
+    """Build the rollups once if the job has never run (fresh install); for startup, not requests"""
+    if rollup_watermark() is None:
+        refresh_rollups(lookback_days=lookback_days)
+
+
+# Late changes to older rows
+
+def _touched_months(session):
+    """Months (by created_at, before and after the change) of tasks/users this flush touched"""
+    months = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        fields = ROLLUP_COLUMNS.get(type(obj))
+        if not fields:
+            continue
+        state = inspect(obj)
+        if obj in session.dirty and not any(state.attrs[field].history.has_changes() for field in fields):
+            continue
+        for created_at in chain(state.attrs['created_at'].history.deleted, [obj.created_at]):
+            if created_at:
+                months.add(month_start(created_at.date()))
+    return months
+
+
+def _mark_dirty(connection, months):
+    """Record months as stale in one upsert (marked_at moves forward if already recorded)"""
+    table = RollupDirtyMonth.__table__
+    now = datetime.utcnow()
+    rows = [{'month': month, 'marked_at': now} for month in sorted(months)]
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(rows).on_conflict_do_update(index_elements=['month'], set_={'marked_at': now})
+    elif dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows).on_duplicate_key_update(marked_at=now)
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(rows).on_conflict_do_update(index_elements=['month'], set_={'marked_at': now})
+    else:
+        for row in rows:
+            updated = connection.execute(
+                table.update().where(table.c.month == row['month']).values(marked_at=now)
+            )
+            if not updated.rowcount:
+                connection.execute(table.insert().values(**row))
+        return
+    connection.execute(stmt)
+
+
+def _record_dirty_months(session, flush_context):
+    # The refresh window always reaches back to the current month (its start
+    # is at most the watermark, which predates any change not yet refreshed),
+    # so only older months need recording; new rows cost no extra write
+    current_month = month_start(datetime.utcnow().date())
+    months = {month for month in _touched_months(session) if month < current_month}
+    if months:
+        _mark_dirty(session.connection(), months)
+
+
+def register_rollup_hooks(session):
+    """Record stale rollup months on every flush of the given session; safe to call twice"""
+    if not event.contains(session, 'after_flush', _record_dirty_months):
+        event.listen(session, 'after_flush', _record_dirty_months)
+
+
+def monthly_task_trend(start_month, end_month=None):
+    """[(month, task_count, completed_count)] for months in [start_month, end_month], oldest first"""
+    completed = db.func.sum(db.case((TaskRollup.status == 'completed', TaskRollup.task_count), else_=0))
+    query = db.session.query(TaskRollup.bucket, db.func.sum(TaskRollup.task_count), completed)\
+        .filter(TaskRollup.granularity == 'month', TaskRollup.bucket >= start_month)
+    if end_month is not None:
+        query = query.filter(TaskRollup.bucket <= end_month)
+    return [(_as_date(bucket), int(total or 0), int(done or 0))
+            for bucket, total, done in query.group_by(TaskRollup.bucket).order_by(TaskRollup.bucket)]
+
+
+def monthly_signup_trend(start_month, end_month=None):
+    """[(month, user_count)] for months in [start_month, end_month], oldest first"""
+    query = db.session.query(SignupRollup.bucket, db.func.sum(SignupRollup.user_count))\
+        .filter(SignupRollup.granularity == 'month', SignupRollup.bucket >= start_month)
+    if end_month is not None:
+        query = query.filter(SignupRollup.bucket <= end_month)
+    return [(_as_date(bucket), int(total or 0))
+            for bucket, total in query.group_by(SignupRollup.bucket).order_by(SignupRollup.bucket)]
+
+
+def user_monthly_tasks(user_id, start_month):
+    """{'YYYY-MM': {'total': n, 'completed': n}} for one user's tasks since start_month"""
+    rows = db.session.query(UserTaskRollup.bucket, UserTaskRollup.status, UserTaskRollup.task_count)\
+        .filter(UserTaskRollup.user_id == user_id, UserTaskRollup.bucket >= start_month)
+    monthly = {}
+    for bucket, status, count in rows:
+        month = monthly.setdefault(_as_date(bucket).strftime('%Y-%m'), {'total': 0, 'completed': 0})
+        month['total'] += count
+        if status == 'completed':
+            month['completed'] += count
+    return monthly
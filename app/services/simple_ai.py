@@ -1,13 +1,33 @@
-import math
+import heapq
 import re
+import numpy as np
 from typing import List, Dict, Any
 
+from app.services.geo import (
+    SIMPLE_PROXIMITY_BUCKETS, distances_and_scores, haversine_km, nearby_mask, to_coordinate_array
+)
+
 class SimpleAIMatchingService:
     """Simplified AI matching service without external ML dependencies"""
     
     def __init__(self):
         self.stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should'}
     
+    def filter_volunteers_by_location(self, volunteers, task_lat, task_lon,
+                                     radius_km=10, fallback_radius_km=50, min_results=1):
+        """Keep volunteers inside an adaptively widened radius around the task"""
+        if not task_lat or not task_lon:
+            return volunteers
+        
+        lats = to_coordinate_array([vol.user_profile.latitude for vol in volunteers])
+        lons = to_coordinate_array([vol.user_profile.longitude for vol in volunteers])
+        distances = haversine_km(lats, lons, task_lat, task_lon)
+        if np.isnan(distances).all():
+            return volunteers
+        
+        within = nearby_mask(distances, radius_km, fallback_radius_km, min_results)
+        return [vol for vol, keep in zip(volunteers, within) if keep]
+    
     def rank_volunteers_for_task(self, task, volunteers, max_results=10):
         """Rank volunteers for a specific task"""
         if not volunteers:
@@ -15,21 +35,23 @@ class SimpleAIMatchingService:
         
         ranked_volunteers = []
         
-        for volunteer in volunteers:
+        # Distances and proximity scores for the whole pool in one pass
+        lats = to_coordinate_array([vol.user_profile.latitude for vol in volunteers])
+        lons = to_coordinate_array([vol.user_profile.longitude for vol in volunteers])
+        task_lat = task.latitude if task.latitude and task.longitude else None
+        distances, proximity = distances_and_scores(
+            lats, lons, task_lat, task.longitude, SIMPLE_PROXIMITY_BUCKETS
+        )
+        distances = np.where(np.isnan(distances), np.inf, distances)
+        
+        for i, volunteer in enumerate(volunteers):
             # Calculate similarity score
             similarity_score = self._calculate_similarity(
                 task.description, 
                 volunteer.skills or ""
             )
             
-            # Calculate proximity score
-            task_location = (task.latitude, task.longitude) if task.latitude and task.longitude else None
-            volunteer_location = (
-                volunteer.user_profile.latitude, 
-                volunteer.user_profile.longitude
-            ) if volunteer.user_profile.latitude and volunteer.user_profile.longitude else None
-            
-            proximity_score = self._calculate_proximity_score(task_location, volunteer_location)
+            proximity_score = float(proximity[i])
             
             # Calculate hybrid score
             hybrid_score = self._calculate_hybrid_score(
@@ -39,8 +61,7 @@ class SimpleAIMatchingService:
                 completed_tasks=volunteer.completed_tasks or 0
             )
             
-            # Calculate distance
-            distance_km = self._calculate_distance(task_location, volunteer_location)
+            distance_km = float(distances[i])
             
             # Add to results if above threshold
             if hybrid_score > 0.1:  # Minimum threshold
@@ -52,10 +73,8 @@ class SimpleAIMatchingService:
                     'distance_km': distance_km
                 })
         
-        # Sort by hybrid score (descending)
-        ranked_volunteers.sort(key=lambda x: x['hybrid_score'], reverse=True)
-        
-        return ranked_volunteers[:max_results]
+        # Bounded heap keeps only the best max_results (descending)
+        return heapq.nlargest(max_results, ranked_volunteers, key=lambda x: x['hybrid_score'])
     
     def _calculate_similarity(self, task_description, volunteer_skills):
         """Calculate similarity using simple keyword matching"""
@@ -102,23 +121,11 @@ class SimpleAIMatchingService:
             return 0.5  # Default score if no location data
         
         try:
-            distance_km = self._calculate_distance(task_location, volunteer_location)
-            
-            # Convert distance to score (closer = higher score)
-            if distance_km <= 1:
-                return 1.0
-            elif distance_km <= 2:
-                return 0.9
-            elif distance_km <= 5:
-                return 0.8
-            elif distance_km <= 10:
-                return 0.6
-            elif distance_km <= 25:
-                return 0.4
-            elif distance_km <= 50:
-                return 0.2
-            else:
-                return 0.1
+            _, scores = distances_and_scores(
+                [volunteer_location[0]], [volunteer_location[1]],
+                task_location[0], task_location[1], SIMPLE_PROXIMITY_BUCKETS
+            )
+            return float(scores[0])
         
         except Exception:
             return 0.5
@@ -131,18 +138,7 @@ class SimpleAIMatchingService:
         try:
             lat1, lon1 = location1
             lat2, lon2 = location2
-            
-            # Haversine formula
-            R = 6371  # Earth's radius in km
-            
-            lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-            dlat = lat2 - lat1
-            dlon = lon2 - lon1
-            
-            a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-            c = 2 * math.asin(math.sqrt(a))
-            
-            return R * c
+            return float(haversine_km([lat1], [lon1], lat2, lon2)[0])
         
         except Exception:
             return float('inf')
@@ -0,0 +1,211 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+
+class VolunteerSkillIndex:
+    """
+    TF-IDF index of volunteer skills that lives across requests.
+
+    The vocabulary, IDF weights and the volunteer row matrix are fitted once.
+    Afterwards volunteers are added, replaced or removed one row at a time
+    (only their own skills text is tokenized), so a match request only has to
+    transform the task text and take one sparse dot product.
+    """
+
+    def __init__(self, vectorizer_factory: Callable, refit_ratio: float = 0.25,
+                 min_refit_updates: int = 50):
+        self._vectorizer_factory = vectorizer_factory
+        self._vectorizer = None
+        self._lock = threading.RLock()
+
+        # Volunteer id -> skills text / sparse row
+        self._texts: Dict[int, str] = {}
+        self._vectors: Dict[int, sp.csr_matrix] = {}
+
+        # Stacked matrix, rebuilt lazily after row changes
+        self._matrix = None
+        self._row_of: Dict[int, int] = {}
+        # Bumped whenever matrix rows are (or are about to be) renumbered, so
+        # callers caching row positions (e.g. the volunteer snapshot) refresh them
+        self.version = 0
+
+        # Incremental rows reuse the fitted vocabulary; refit once enough have
+        # changed so new skill terms eventually enter the vocabulary
+        self._updates_since_fit = 0
+        self.refit_ratio = refit_ratio
+        self.min_refit_updates = min_refit_updates
+
+    @property
+    def is_fitted(self) -> bool:
+        return self._vectorizer is not None
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, volunteer_id):
+        return volunteer_id in self._texts
+
+    def fit(self, items: Iterable[Tuple[int, str]]):
+        """Build vocabulary, IDF weights and rows from (volunteer_id, skills) pairs"""
+        with self._lock:
+            texts = {vol_id: skills or '' for vol_id, skills in items}
+            self._fit_texts(texts)
+
+    def _fit_texts(self, texts: Dict[int, str]):
+        ids = list(texts.keys())
+        self._texts = texts
+        self._vectors = {}
+        self._matrix = None
+        self._row_of = {}
+        self._updates_since_fit = 0
+        self.version += 1
+
+        if not any(texts.values()):
+            # Nothing to learn a vocabulary from yet
+            self._vectorizer = None
+            return
+
+        vectorizer = self._vectorizer_factory()
+        try:
+            matrix = vectorizer.fit_transform([texts[vol_id] for vol_id in ids]).tocsr()
+        except ValueError:
+            # Empty vocabulary (e.g. only stop words / very short tokens)
+            self._vectorizer = None
+            return
+        self._vectorizer = vectorizer
+        self._vectors = {vol_id: matrix[i] for i, vol_id in enumerate(ids)}
+        self._matrix = matrix
+        self._row_of = {vol_id: i for i, vol_id in enumerate(ids)}
+
+    def upsert(self, volunteer_id: int, skills: str):
+        """Add a volunteer or replace their skills row"""
+        skills = skills or ''
+        with self._lock:
+            if self._texts.get(volunteer_id) == skills and volunteer_id in self._vectors:
+                return
+            self._texts[volunteer_id] = skills
+            if not self.is_fitted:
+                self._fit_texts(self._texts)
+                return
+            self._vectors[volunteer_id] = self._vectorizer.transform([skills]).tocsr()
+            self._invalidate_matrix()
+            self._note_update()
+
+    def remove(self, volunteer_id: int):
+        """Drop a volunteer (e.g. rejected) from the index"""
+        with self._lock:
+            if volunteer_id not in self._texts:
+                return
+            del self._texts[volunteer_id]
+            self._vectors.pop(volunteer_id, None)
+            self._invalidate_matrix()
+            self._note_update()
+
+    def sync(self, items: Iterable[Tuple[int, str]]):
+        """Upsert any of the given volunteers that are missing or have stale skills"""
+        with self._lock:
+            items = list(items)
+            if not self.is_fitted:
+                merged = dict(self._texts)
+                merged.update({vol_id: skills or '' for vol_id, skills in items})
+                self._fit_texts(merged)
+                return
+            for vol_id, skills in items:
+                if self._texts.get(vol_id) != (skills or ''):
+                    self.upsert(vol_id, skills)
+
+    def _note_update(self):
+        self._updates_since_fit += 1
+        threshold = max(self.min_refit_updates, int(len(self._texts) * self.refit_ratio))
+        if self._updates_since_fit >= threshold:
+            self._fit_texts(dict(self._texts))
+
+    def _invalidate_matrix(self):
+        # Row numbers change on the next rebuild; bump now so rows cached
+        # under the current version are not used against that matrix
+        self._matrix = None
+        self.version += 1
+
+    def _ensure_matrix(self):
+        if self._matrix is None:
+            ids = list(self._vectors.keys())
+            self._row_of = {vol_id: i for i, vol_id in enumerate(ids)}
+            self.version += 1
+            if ids:
+                self._matrix = sp.vstack([self._vectors[vol_id] for vol_id in ids], format='csr')
+            else:
+                self._matrix = sp.csr_matrix((0, len(self._vectorizer.vocabulary_)))
+        return self._matrix
+
+    def transform(self, text: str):
+        """Vectorize a task text against the fitted vocabulary"""
+        with self._lock:
+            if not self.is_fitted:
+                return None
+            return self._vectorizer.transform([text or ''])
+
+    def transform_many(self, texts: List[str]):
+        """Vectorize many task texts at once against the fitted vocabulary"""
+        with self._lock:
+            if not self.is_fitted:
+                return None
+            return self._vectorizer.transform([text or '' for text in texts]).tocsr()
+
+    def rows_for(self, volunteer_ids: List[int]):
+        """Sparse matrix of the given volunteers' rows, in order (zero rows for unknown ids)"""
+        with self._lock:
+            matrix = self._ensure_matrix()
+            rows = np.array([self._row_of.get(vol_id, -1) for vol_id in volunteer_ids], dtype=np.int64)
+            known = rows >= 0
+            selector = sp.csr_matrix(
+                (np.ones(known.sum()), (np.flatnonzero(known), rows[known])),
+                shape=(len(volunteer_ids), matrix.shape[0])
+            )
+            return (selector @ matrix).tocsr()
+
+    def row_indices(self, volunteer_ids) -> np.ndarray:
+        """Matrix row of each volunteer (-1 if not indexed), valid for the current version"""
+        with self._lock:
+            if self.is_fitted:
+                self._ensure_matrix()
+            row_of = self._row_of
+            return np.fromiter((row_of.get(vol_id, -1) for vol_id in volunteer_ids),
+                               dtype=np.int64, count=len(volunteer_ids))
+
+    def score_rows(self, text: str, resolve_rows: Callable) -> np.ndarray:
+        """
+        Cosine similarity between a task text and the matrix rows returned by
+        resolve_rows(index). The callback runs under the index lock, so the
+        rows it looks up cannot be renumbered before they are scored.
+        Rows of -1 (not indexed) score 0.
+        """
+        with self._lock:
+            # Renumber rows (if pending) before the callback looks them up
+            matrix = self._ensure_matrix() if self.is_fitted else None
+            rows = np.asarray(resolve_rows(self), dtype=np.int64)
+            scores = np.zeros(len(rows))
+            if not self.is_fitted or not len(rows):
+                return scores
+
+            task_vector = self._vectorizer.transform([text or ''])
+            known = rows >= 0
+            if known.sum() * 4 < matrix.shape[0]:
+                # Few candidates: slice their rows rather than scoring everyone
+                scores[known] = np.asarray((matrix[rows[known]] @ task_vector.T).todense()).ravel()
+            else:
+                all_scores = np.asarray((matrix @ task_vector.T).todense()).ravel()
+                scores[known] = all_scores[rows[known]]
+            return scores
+
+    def similarities(self, text: str, volunteer_ids: List[int]) -> np.ndarray:
+        """
+        Cosine similarity between a task text and the given volunteers.
+        TF-IDF rows are L2-normalised, so this is a single sparse dot product.
+        Volunteers that are not indexed score 0.
+        """
+        if not volunteer_ids:
+            return np.zeros(0)
+        return self.score_rows(text, lambda index: index.row_indices(volunteer_ids))
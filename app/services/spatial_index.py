@@ -0,0 +1,163 @@
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from app.services.geo import EARTH_RADIUS_KM, haversine_km
+
+try:
+    from sklearn.neighbors import BallTree
+    BALLTREE_AVAILABLE = True
+except ImportError:
+    BALLTREE_AVAILABLE = False
+
+
+class VolunteerSpatialIndex:
+    """
+    In-memory haversine BallTree over approved volunteers' coordinates.
+
+    The tree itself is static, so updates are applied incrementally: new or
+    moved volunteers go into a small buffer that is scanned with the
+    vectorized haversine, their old tree entries are tombstoned, and the tree
+    is rebuilt only once the buffer grows past rebuild_ratio of the pool.
+    Without scikit-learn every query is a vectorized linear scan.
+    """
+
+    def __init__(self, rebuild_ratio: float = 0.05, min_rebuild_size: int = 64):
+        self._lock = threading.RLock()
+        self._coords: Dict[int, Tuple[float, float]] = {}
+
+        self._tree = None
+        self._tree_ids = np.empty(0, dtype=np.int64)
+        self._tombstones = set()
+        self._buffer: Dict[int, Tuple[float, float]] = {}
+
+        self.rebuild_ratio = rebuild_ratio
+        self.min_rebuild_size = min_rebuild_size
+        self._built = False
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    def __len__(self):
+        return len(self._coords)
+
+    def fit(self, items: Iterable[Tuple[int, float, float]]):
+        """Build the index from (volunteer_id, latitude, longitude) rows"""
+        with self._lock:
+            self._coords = {
+                vol_id: (lat, lon) for vol_id, lat, lon in items
+                if lat is not None and lon is not None
+            }
+            self._rebuild()
+            self._built = True
+
+    def _rebuild(self):
+        ids = list(self._coords.keys())
+        self._tree_ids = np.array(ids, dtype=np.int64)
+        self._tombstones = set()
+        self._buffer = {}
+        if BALLTREE_AVAILABLE and ids:
+            points = np.radians(np.array([self._coords[vol_id] for vol_id in ids], dtype=float))
+            self._tree = BallTree(points, metric='haversine')
+        else:
+            self._tree = None
+            # Linear-scan mode keeps everything in the buffer
+            self._buffer = dict(self._coords)
+            self._tree_ids = np.empty(0, dtype=np.int64)
+
+    def upsert(self, volunteer_id: int, lat, lon):
+        """Add a volunteer or move them to new coordinates"""
+        if lat is None or lon is None:
+            self.remove(volunteer_id)
+            return
+        with self._lock:
+            if self._coords.get(volunteer_id) == (lat, lon):
+                return
+            if self._tree is not None and volunteer_id in self._coords:
+                self._tombstones.add(volunteer_id)
+            self._coords[volunteer_id] = (lat, lon)
+            self._buffer[volunteer_id] = (lat, lon)
+            self._maybe_rebuild()
+
+    def remove(self, volunteer_id: int):
+        """Drop a volunteer from the index"""
+        with self._lock:
+            if volunteer_id not in self._coords:
+                return
+            del self._coords[volunteer_id]
+            self._buffer.pop(volunteer_id, None)
+            if self._tree is not None:
+                self._tombstones.add(volunteer_id)
+            self._maybe_rebuild()
+
+    def _maybe_rebuild(self):
+        if self._tree is None:
+            return
+        pending = len(self._buffer) + len(self._tombstones)
+        if pending >= max(self.min_rebuild_size, int(len(self._coords) * self.rebuild_ratio)):
+            self._rebuild()
+
+    def _within(self, lat, lon, radius_km) -> Dict[int, float]:
+        """Volunteer id -> distance (km) for everyone within radius_km"""
+        found = {}
+        if self._tree is not None:
+            point = np.radians([[lat, lon]])
+            rows, dists = self._tree.query_radius(
+                point, r=radius_km / EARTH_RADIUS_KM, return_distance=True
+            )
+            for row, dist in zip(rows[0], dists[0]):
+                vol_id = int(self._tree_ids[row])
+                if vol_id not in self._tombstones:
+                    found[vol_id] = dist * EARTH_RADIUS_KM
+        found.update(
+            (vol_id, dist) for vol_id, dist in self._scan_buffer(lat, lon).items()
+            if dist <= radius_km
+        )
+        return found
+
+    def _nearest(self, lat, lon, k) -> Dict[int, float]:
+        """Volunteer id -> distance (km) for the k nearest regardless of radius"""
+        found = {}
+        if self._tree is not None:
+            # Over-fetch so tombstoned entries can be skipped
+            n = min(len(self._tree_ids), k + len(self._tombstones))
+            if n:
+                dists, rows = self._tree.query(np.radians([[lat, lon]]), k=n)
+                for row, dist in zip(rows[0], dists[0]):
+                    vol_id = int(self._tree_ids[row])
+                    if vol_id not in self._tombstones:
+                        found[vol_id] = dist * EARTH_RADIUS_KM
+        found.update(self._scan_buffer(lat, lon))
+        return dict(sorted(found.items(), key=lambda item: item[1])[:k])
+
+    def _scan_buffer(self, lat, lon) -> Dict[int, float]:
+        if not self._buffer:
+            return {}
+        ids = list(self._buffer.keys())
+        coords = np.array([self._buffer[vol_id] for vol_id in ids], dtype=float)
+        dists = haversine_km(coords[:, 0], coords[:, 1], lat, lon)
+        return dict(zip(ids, dists.tolist()))
+
+    def query(self, lat, lon, k: int, radius_km: float = 10,
+              max_radius_km: float = 50) -> List[Tuple[int, float]]:
+        """
+        Volunteers near (lat, lon) as (volunteer_id, distance_km), nearest first.
+
+        Starts at radius_km and doubles the radius (capped at max_radius_km)
+        until at least k volunteers are inside it. If even max_radius_km holds
+        fewer than k, the k nearest volunteers are returned instead.
+        """
+        with self._lock:
+            radius = radius_km
+            while True:
+                found = self._within(lat, lon, radius)
+                if len(found) >= k or radius >= max_radius_km:
+                    break
+                radius = min(radius * 2, max_radius_km)
+
+            if len(found) < k:
+                found = self._nearest(lat, lon, k)
+
+            return sorted(found.items(), key=lambda item: item[1])
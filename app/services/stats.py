@@ -0,0 +1,432 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict
+
+from sqlalchemy import event, inspect
+
+from app import db
+from app.models import User, Volunteer, Task, Feedback, PlatformStat
+
+TASK_STATUSES = ('pending', 'assigned', 'completed', 'cancelled')
+VERIFICATION_STATUSES = ('pending', 'approved', 'rejected')
+
+# platform_stats rows: all-time counters live in the 'total' bucket, per-day
+# activity in YYYY-MM-DD buckets. The marker row records the last rebuild.
+TOTAL_BUCKET = 'total'
+REBUILT_METRIC = 'meta.rebuilt_at'
+# Counter rows per upsert statement (4 bind parameters each; SQLite allows 999 in older builds)
+UPSERT_BATCH_SIZE = 200
+
+
+def _count_if(condition, value=1):
+    """SUM(CASE WHEN condition THEN value ELSE 0 END)"""
+    return db.func.coalesce(db.func.sum(db.case((condition, value), else_=0)), 0)
+
+
+class PlatformStats:
+    """
+    Platform-wide counters for the admin dashboard and reports.
+
+    load_platform_stats() reads them from the materialized platform_stats
+    table; compute_platform_stats() aggregates them from the source tables
+    in four grouped queries (used to check the materialized counters).
+    """
+
+    def __init__(self):
+        self.users_by_role: Dict[str, int] = {}
+        self.tasks_by_status: Dict[str, int] = {status: 0 for status in TASK_STATUSES}
+        self.tasks_by_category: Dict[str, int] = {}
+        self.commercial_tasks = 0
+        self.completed_commercial_tasks = 0
+        self.platform_fees = 0.0
+        self.volunteers_by_status: Dict[str, int] = {status: 0 for status in VERIFICATION_STATUSES}
+        self.pro_subscriptions = 0
+        self.premium_verifications = 0
+        self.avg_volunteer_rating = 0.0
+        self.total_feedback = 0
+        self.avg_feedback_rating = 0.0
+
+    @property
+    def total_users(self):
+        return sum(self.users_by_role.values())
+
+    @property
+    def total_tasks(self):
+        return sum(self.tasks_by_status.values())
+
+    @property
+    def pending_tasks(self):
+        return self.tasks_by_status['pending']
+
+    @property
+    def assigned_tasks(self):
+        return self.tasks_by_status['assigned']
+
+    @property
+    def completed_tasks(self):
+        return self.tasks_by_status['completed']
+
+    @property
+    def completion_rate(self):
+        return (self.completed_tasks / self.total_tasks * 100) if self.total_tasks > 0 else 0
+
+    def task_share(self, status):
+        """Percentage of all tasks in the given status"""
+        return (self.tasks_by_status.get(status, 0) / self.total_tasks * 100) if self.total_tasks > 0 else 0
+
+    @property
+    def total_volunteers(self):
+        return sum(self.volunteers_by_status.values())
+
+    @property
+    def approved_volunteers(self):
+        return self.volunteers_by_status['approved']
+
+    @property
+    def pending_verifications(self):
+        return self.volunteers_by_status['pending']
+
+    @classmethod
+    def from_metrics(cls, metrics: Dict[str, float]) -> 'PlatformStats':
+        """Build from the 'total' bucket of platform_stats ({metric: value})"""
+        stats = cls()
+        groups = {
+            'users.role.': stats.users_by_role,
+            'tasks.status.': stats.tasks_by_status,
+            'tasks.category.': stats.tasks_by_category,
+            'volunteers.status.': stats.volunteers_by_status,
+        }
+        for metric, value in metrics.items():
+            if not value:
+                continue
+            for prefix, counts in groups.items():
+                if metric.startswith(prefix):
+                    key = metric[len(prefix):]
+                    counts[key] = counts.get(key, 0) + int(round(value))
+        stats.commercial_tasks = int(round(metrics.get('tasks.commercial', 0)))
+        stats.completed_commercial_tasks = int(round(metrics.get('tasks.commercial_completed', 0)))
+        stats.platform_fees = metrics.get('tasks.platform_fees', 0.0)
+        stats.pro_subscriptions = int(round(metrics.get('volunteers.pro', 0)))
+        stats.premium_verifications = int(round(metrics.get('volunteers.premium', 0)))
+        rated = metrics.get('volunteers.rating_count', 0)
+        stats.avg_volunteer_rating = metrics.get('volunteers.rating_sum', 0.0) / rated if rated else 0.0
+        stats.total_feedback = int(round(metrics.get('feedback.count', 0)))
+        stats.avg_feedback_rating = (metrics.get('feedback.rating_sum', 0.0) / stats.total_feedback
+                                     if stats.total_feedback else 0.0)
+        return stats
+
+    def commercial_stats(self, pro_fee, premium_fee):
+        """Revenue summary (simulated from fees - in production this would come from payment records)"""
+        pro_revenue = self.pro_subscriptions * pro_fee
+        premium_revenue = self.premium_verifications * premium_fee
+        return {
+            'monthly_revenue': int(pro_revenue + premium_revenue + self.platform_fees),
+            'pro_subscriptions': self.pro_subscriptions,
+            'platform_fees': int(self.platform_fees),
+            'premium_verifications': self.premium_verifications,
+            'revenue_growth': 15,  # Mock data - would require historical data
+            'total_paid_tasks': self.commercial_tasks
+        }
+
+
+def compute_platform_stats() -> PlatformStats:
+    """Aggregate every admin counter in a few grouped queries"""
+    stats = PlatformStats()
+
+    for role, count in db.session.query(User.role, db.func.count(User.id)).group_by(User.role):
+        stats.users_by_role[role] = count
+
+    task_rows = db.session.query(
+        Task.status,
+        Task.category,
+        db.func.count(Task.id),
+        _count_if(Task.is_commercial == True),
+        _count_if(Task.is_commercial == True, db.func.coalesce(Task.platform_fee, 0.0))
+    ).group_by(Task.status, Task.category)
+    for status, category, count, commercial, fees in task_rows:
+        stats.tasks_by_status[status] = stats.tasks_by_status.get(status, 0) + count
+        category = category or 'uncategorized'
+        stats.tasks_by_category[category] = stats.tasks_by_category.get(category, 0) + count
+        stats.commercial_tasks += commercial
+        if status == 'completed':
+            stats.completed_commercial_tasks += commercial
+            stats.platform_fees += float(fees or 0)
+
+    volunteer_rows = db.session.query(
+        Volunteer.verification_status,
+        db.func.count(Volunteer.id),
+        _count_if(Volunteer.subscription_type == 'pro'),
+        _count_if(Volunteer.premium_verified == True),
+        db.func.sum(Volunteer.rating),
+        db.func.count(Volunteer.rating)
+    ).group_by(Volunteer.verification_status)
+    rating_sum, rating_count = 0.0, 0
+    for status, count, pro, premium, ratings, rated in volunteer_rows:
+        stats.volunteers_by_status[status] = stats.volunteers_by_status.get(status, 0) + count
+        stats.pro_subscriptions += pro
+        stats.premium_verifications += premium
+        rating_sum += float(ratings or 0)
+        rating_count += rated
+    stats.avg_volunteer_rating = rating_sum / rating_count if rating_count else 0.0
+
+    total_feedback, avg_feedback = db.session.query(
+        db.func.count(Feedback.id), db.func.avg(Feedback.rating)
+    ).one()
+    stats.total_feedback = total_feedback
+    stats.avg_feedback_rating = float(avg_feedback or 0.0)
+    return stats
+
+
+def compute_user_task_stats(user_id):
+    """
+    One user's task counters from two grouped queries (tasks by status, and
+    feedback joined to their tasks), so memory and time do not grow with the
+    number of tasks the user has posted.
+    """
+    by_status = {status: 0 for status in TASK_STATUSES}
+    rows = db.session.query(Task.status, db.func.count(Task.id))\
+        .filter(Task.user_id == user_id).group_by(Task.status)
+    for status, count in rows:
+        by_status[status] = count
+    total = sum(by_status.values())
+
+    feedback_count, avg_feedback = db.session.query(db.func.count(Feedback.id), db.func.avg(Feedback.rating))\
+        .join(Task, Feedback.task_id == Task.id)\
+        .filter(Task.user_id == user_id).one()
+
+    return {
+        'total_tasks': total,
+        'completed_tasks': by_status['completed'],
+        'pending_tasks': by_status['pending'],
+        'assigned_tasks': by_status['assigned'],
+        'completion_rate': (by_status['completed'] / total * 100) if total > 0 else 0,
+        'feedback_count': feedback_count,
+        'avg_feedback': float(avg_feedback or 0.0),
+    }
+
+
+# Materialized counters
+#
+# Every tracked row contributes a fixed set of (bucket, metric) amounts that
+# depend only on its own column values. On each flush the hook subtracts the
+# contribution of a row's previous values and adds that of its new ones, and
+# applies the difference to platform_stats in the same transaction, so the
+# counters commit or roll back together with the change that caused them.
+# Writes that bypass the ORM (bulk UPDATE/DELETE, raw SQL) are not seen:
+# `flask rebuild-stats` recomputes everything from the source tables.
+
+def _day(value):
+    return value.date().isoformat() if value else None
+
+
+def _task_metrics(row):
+    metrics = Counter()
+    status = row['status'] or 'pending'
+    metrics[(TOTAL_BUCKET, f'tasks.status.{status}')] += 1
+    metrics[(TOTAL_BUCKET, f"tasks.category.{row['category'] or 'uncategorized'}")] += 1
+    fee = row['platform_fee'] or 0.0
+    if row['is_commercial']:
+        metrics[(TOTAL_BUCKET, 'tasks.commercial')] += 1
+        if status == 'completed':
+            metrics[(TOTAL_BUCKET, 'tasks.commercial_completed')] += 1
+            metrics[(TOTAL_BUCKET, 'tasks.platform_fees')] += fee
+
+    posted_day = _day(row['created_at'])
+    if posted_day:
+        metrics[(posted_day, 'tasks.posted')] += 1
+    completed_day = _day(row['completed_at'])
+    if status == 'completed' and completed_day:
+        metrics[(completed_day, 'tasks.completed')] += 1
+        if row['is_commercial']:
+            metrics[(completed_day, 'tasks.platform_fees')] += fee
+    return metrics
+
+
+def _volunteer_metrics(row):
+    metrics = Counter()
+    metrics[(TOTAL_BUCKET, f"volunteers.status.{row['verification_status'] or 'pending'}")] += 1
+    if row['subscription_type'] == 'pro':
+        metrics[(TOTAL_BUCKET, 'volunteers.pro')] += 1
+    if row['premium_verified']:
+        metrics[(TOTAL_BUCKET, 'volunteers.premium')] += 1
+    if row['rating'] is not None:
+        metrics[(TOTAL_BUCKET, 'volunteers.rating_sum')] += row['rating']
+        metrics[(TOTAL_BUCKET, 'volunteers.rating_count')] += 1
+    joined_day = _day(row['created_at'])
+    if joined_day:
+        metrics[(joined_day, 'volunteers.registered')] += 1
+    return metrics
+
+
+def _user_metrics(row):
+    metrics = Counter()
+    metrics[(TOTAL_BUCKET, f"users.role.{row['role']}")] += 1
+    joined_day = _day(row['created_at'])
+    if joined_day:
+        metrics[(joined_day, 'users.registered')] += 1
+    return metrics
+
+
+def _feedback_metrics(row):
+    metrics = Counter()
+    metrics[(TOTAL_BUCKET, 'feedback.count')] += 1
+    metrics[(TOTAL_BUCKET, 'feedback.rating_sum')] += row['rating'] or 0
+    given_day = _day(row['created_at'])
+    if given_day:
+        metrics[(given_day, 'feedback.count')] += 1
+    return metrics
+
+
+# Model -> (columns the metrics read, metrics function)
+TRACKED_MODELS = {
+    Task: (('status', 'category', 'is_commercial', 'platform_fee', 'created_at', 'completed_at'),
+           _task_metrics),
+    Volunteer: (('verification_status', 'subscription_type', 'premium_verified', 'rating', 'created_at'),
+                _volunteer_metrics),
+    User: (('role', 'created_at'), _user_metrics),
+    Feedback: (('rating', 'created_at'), _feedback_metrics),
+}
+
+
+def _row_values(obj, fields, previous=False):
+    """Column values of an object, or (previous=True) the values it had before this flush"""
+    state = inspect(obj)
+    values = {}
+    for field in fields:
+        value = getattr(obj, field)
+        if previous:
+            history = state.attrs[field].history
+            if history.deleted:
+                value = history.deleted[0]
+        values[field] = value
+    return values
+
+
+def _flush_deltas(session):
+    deltas = Counter()
+    for obj in session.new:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked:
+            deltas.update(tracked[1](_row_values(obj, tracked[0])))
+    for obj in session.dirty:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked and session.is_modified(obj, include_collections=False):
+            deltas.update(tracked[1](_row_values(obj, tracked[0])))
+            deltas.subtract(tracked[1](_row_values(obj, tracked[0], previous=True)))
+    for obj in session.deleted:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked:
+            deltas.subtract(tracked[1](_row_values(obj, tracked[0], previous=True)))
+    return {key: delta for key, delta in deltas.items() if delta}
+
+
+def _upsert(connection, table, rows, now):
+    """One multi-row INSERT ... ON CONFLICT/DUPLICATE KEY that adds rows' values to existing counters"""
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['bucket', 'metric'],
+            set_={'value': table.c.value + stmt.excluded.value, 'updated_at': now}
+        )
+    elif dialect in ('mysql', 'mariadb'):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_duplicate_key_update(value=table.c.value + stmt.inserted.value, updated_at=now)
+    else:
+        from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            constraint='uq_platform_stats_bucket_metric',
+            set_={'value': table.c.value + stmt.excluded.value, 'updated_at': now}
+        )
+    connection.execute(stmt)
+
+
+def _increment(connection, deltas):
+    """
+    Atomically add each delta to its (bucket, metric) row, creating missing
+    rows, in one upsert statement (per UPSERT_BATCH_SIZE rows) per flush
+    """
+    table = PlatformStat.__table__
+    now = datetime.utcnow()
+    rows = [
+        {'bucket': bucket, 'metric': metric, 'value': delta, 'updated_at': now}
+        for (bucket, metric), delta in sorted(deltas.items())
+    ]
+    if connection.dialect.name in ('sqlite', 'mysql', 'mariadb', 'postgresql'):
+        for i in range(0, len(rows), UPSERT_BATCH_SIZE):
+            _upsert(connection, table, rows[i:i + UPSERT_BATCH_SIZE], now)
+        return
+
+    # No upsert syntax: update, then insert the counters that did not exist yet
+    for row in rows:
+        updated = connection.execute(
+            table.update()
+            .where(table.c.bucket == row['bucket'], table.c.metric == row['metric'])
+            .values(value=table.c.value + row['value'], updated_at=now)
+        )
+        if not updated.rowcount:
+            connection.execute(table.insert().values(**row))
+
+
+def _apply_flush_deltas(session, flush_context):
+    deltas = _flush_deltas(session)
+    if deltas:
+        _increment(session.connection(), deltas)
+
+
+def register_stats_hooks(session):
+    """Keep platform_stats in step with every flush of the given session; safe to call twice"""
+    if not event.contains(session, 'after_flush', _apply_flush_deltas):
+        event.listen(session, 'after_flush', _apply_flush_deltas)
+
+
+def rebuild_platform_stats():
+    """
+    Recompute platform_stats from the source tables, using the same per-row
+    metrics as the flush hook. Returns the number of counter rows written.
+    """
+    totals = Counter()
+    for model, (fields, metrics_fn) in TRACKED_MODELS.items():
+        columns = [getattr(model, field) for field in fields]
+        for row in db.session.query(*columns).execution_options(yield_per=1000):
+            totals.update(metrics_fn(row._mapping))
+
+    now = datetime.utcnow()
+    table = PlatformStat.__table__
+    rows = [
+        {'bucket': bucket, 'metric': metric, 'value': value, 'updated_at': now}
+        for (bucket, metric), value in sorted(totals.items()) if value
+    ]
+    rows.append({'bucket': TOTAL_BUCKET, 'metric': REBUILT_METRIC,
+                 'value': now.timestamp(), 'updated_at': now})
+
+    db.session.execute(table.delete())
+    db.session.execute(table.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+
+def platform_stats_built():
+    """Whether platform_stats has been filled by rebuild_platform_stats (`flask rebuild-stats`)"""
+    return db.session.query(PlatformStat.id)\
+        .filter(PlatformStat.bucket == TOTAL_BUCKET, PlatformStat.metric == REBUILT_METRIC)\
+        .first() is not None
+
+
+def load_platform_stats() -> PlatformStats:
+    """
+    All-time counters from platform_stats: one indexed read of the 'total'
+    bucket, whatever the size of the history. Until the table has been
+    built with `flask rebuild-stats`, the counters are aggregated from the
+    source tables instead; reading never writes.
+    """
+    metrics = dict(
+        db.session.query(PlatformStat.metric, PlatformStat.value)
+        .filter(PlatformStat.bucket == TOTAL_BUCKET).all()
+    )
+    if REBUILT_METRIC not in metrics:
+        return compute_platform_stats()
+    return PlatformStats.from_metrics(metrics)
@@ -0,0 +1,283 @@
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from app.services import change_feed
+
+SUBSCRIPTION_CODES = {'basic': 0, 'pro': 1}
+SUBSCRIPTION_NAMES = {code: name for name, code in SUBSCRIPTION_CODES.items()}
+
+# Column name -> (dtype, fill value)
+COLUMNS = {
+    'ids': (np.int64, 0),
+    'user_ids': (np.int64, 0),
+    'latitudes': (np.float64, np.nan),
+    'longitudes': (np.float64, np.nan),
+    'ratings': (np.float64, 0.0),
+    'completed_tasks': (np.int64, 0),
+    'premium': (np.bool_, False),
+    'subscription_codes': (np.int8, 0),
+    'has_skills': (np.bool_, False),
+}
+
+# Largest IN (...) list sent per refresh query (SQLite allows 999 parameters)
+REFRESH_BATCH_SIZE = 500
+
+
+class VolunteerSnapshot:
+    """
+    Columnar, process-level copy of the matching fields of every approved
+    volunteer.
+
+    Each volunteer occupies one slot; NumPy columns hold id, user id,
+    latitude/longitude (NaN when unknown), rating, completed tasks, the
+    premium flag and the subscription type code, so a match request can
+    score candidates straight from the arrays. Name and skills text are kept
+    per slot for building the handful of results that are displayed.
+
+    The snapshot is refreshed incrementally: committed changes to volunteers
+    and users arrive through the change feed as stale ids, and the next
+    refresh() re-reads only those rows. Commits made by other processes are
+    not seen by the feed, so the whole snapshot is re-read once it is older
+    than max_age_seconds.
+    """
+
+    def __init__(self, max_age_seconds: float = 300, initial_capacity: int = 1024):
+        self._lock = threading.RLock()
+        self.max_age_seconds = max_age_seconds
+        self._size = 0
+        self._capacity = 0
+        self._allocate(initial_capacity)
+
+        self._rows: List[tuple] = []          # slot -> source row (name, skills, change detection)
+        self._slot_of: Dict[int, int] = {}    # volunteer id -> slot
+        self._volunteer_of_user: Dict[int, int] = {}
+
+        self._stale_volunteers = set()
+        self._stale_users = set()
+        self._loaded_at = None
+
+        # Bumped whenever slots move, invalidating cached skill rows
+        self.version = 0
+        self._skill_rows = None
+        self._skill_rows_key = None
+
+    @property
+    def lock(self):
+        """Hold while reading columns so slots cannot move underneath the reader"""
+        return self._lock
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, volunteer_id):
+        return volunteer_id in self._slot_of
+
+    def column(self, name: str) -> np.ndarray:
+        """View of one column over the filled slots"""
+        return self._columns[name][:self._size]
+
+    # Columns (views over the filled slots)
+    ids = property(lambda self: self.column('ids'))
+    user_ids = property(lambda self: self.column('user_ids'))
+    latitudes = property(lambda self: self.column('latitudes'))
+    longitudes = property(lambda self: self.column('longitudes'))
+    ratings = property(lambda self: self.column('ratings'))
+    completed_tasks = property(lambda self: self.column('completed_tasks'))
+    premium = property(lambda self: self.column('premium'))
+    subscription_codes = property(lambda self: self.column('subscription_codes'))
+    has_skills = property(lambda self: self.column('has_skills'))
+
+    def _allocate(self, capacity):
+        previous = getattr(self, '_columns', {})
+        self._capacity = capacity
+        self._columns = {}
+        for name, (dtype, fill) in COLUMNS.items():
+            column = np.full(capacity, fill, dtype=dtype)
+            if name in previous:
+                column[:self._size] = previous[name][:self._size]
+            self._columns[name] = column
+
+    # Change tracking
+    def mark_stale(self, volunteer_ids: Iterable[int] = (), user_ids: Iterable[int] = ()):
+        """Record committed changes; they are re-read on the next refresh()"""
+        with self._lock:
+            if not self.is_loaded:
+                return  # The first refresh() loads everything anyway
+            self._stale_volunteers.update(vol_id for vol_id in volunteer_ids if vol_id is not None)
+            self._stale_users.update(user_id for user_id in user_ids if user_id is not None)
+
+    def refresh(self, load_rows: Callable) -> Tuple[List[int], List[int]]:
+        """
+        Bring the snapshot up to date.
+
+        load_rows() must return every approved volunteer and
+        load_rows(volunteer_ids=..., user_ids=...) the volunteers with those
+        ids or user ids whatever their status (see
+        app.models.volunteer_snapshot_rows). Returns (changed_ids,
+        removed_ids) so dependent indexes can be updated the same way.
+        """
+        with self._lock:
+            expired = (self.is_loaded and self.max_age_seconds is not None
+                       and time.monotonic() - self._loaded_at > self.max_age_seconds)
+            if not self.is_loaded or expired:
+                checked = list(self._slot_of)
+                self._stale_volunteers.clear()
+                self._stale_users.clear()
+                changed, removed = self._apply(load_rows(), checked)
+                self._loaded_at = time.monotonic()
+                return changed, removed
+
+            if not self._stale_volunteers and not self._stale_users:
+                return [], []
+
+            volunteer_ids = list(self._stale_volunteers)
+            user_ids = list(self._stale_users)
+            self._stale_volunteers.clear()
+            self._stale_users.clear()
+
+            checked = set(volunteer_ids)
+            checked.update(self._volunteer_of_user[user_id] for user_id in user_ids
+                           if user_id in self._volunteer_of_user)
+            rows = []
+            for start in range(0, len(volunteer_ids), REFRESH_BATCH_SIZE):
+                rows.extend(load_rows(volunteer_ids=volunteer_ids[start:start + REFRESH_BATCH_SIZE]))
+            for start in range(0, len(user_ids), REFRESH_BATCH_SIZE):
+                rows.extend(load_rows(user_ids=user_ids[start:start + REFRESH_BATCH_SIZE]))
+            return self._apply(rows, checked)
+
+    def _apply(self, rows, checked_ids):
+        """Store approved rows; drop checked volunteers that are gone or no longer approved"""
+        changed, seen = [], set()
+        for row in rows:
+            if row.verification_status != 'approved' or row.id in seen:
+                continue
+            seen.add(row.id)
+            if self._store(row):
+                changed.append(row.id)
+        removed = [vol_id for vol_id in checked_ids if vol_id not in seen and vol_id in self._slot_of]
+        for vol_id in removed:
+            self._remove(vol_id)
+        return changed, removed
+
+    def _store(self, row) -> bool:
+        record = tuple(row)
+        slot = self._slot_of.get(row.id)
+        if slot is None:
+            if self._size == self._capacity:
+                self._allocate(self._capacity * 2)
+            slot = self._size
+            self._size += 1
+            self._slot_of[row.id] = slot
+            self._rows.append(record)
+            self.version += 1
+        elif self._rows[slot] == record:
+            return False
+        else:
+            old_user = self._rows[slot][1]
+            if self._volunteer_of_user.get(old_user) == row.id:
+                del self._volunteer_of_user[old_user]
+            self._rows[slot] = record
+
+        self._volunteer_of_user[row.user_id] = row.id
+        columns = self._columns
+        columns['ids'][slot] = row.id
+        columns['user_ids'][slot] = row.user_id
+        columns['latitudes'][slot] = np.nan if row.latitude is None else row.latitude
+        columns['longitudes'][slot] = np.nan if row.longitude is None else row.longitude
+        columns['ratings'][slot] = row.rating or 0.0
+        columns['completed_tasks'][slot] = row.completed_tasks or 0
+        columns['premium'][slot] = bool(row.premium_verified)
+        columns['subscription_codes'][slot] = SUBSCRIPTION_CODES.get(row.subscription_type, 0)
+        columns['has_skills'][slot] = bool(row.skills)
+        return True
+
+    def _remove(self, volunteer_id):
+        """Swap-remove: the last slot moves into the freed one"""
+        slot = self._slot_of.pop(volunteer_id)
+        user_id = self._rows[slot][1]
+        if self._volunteer_of_user.get(user_id) == volunteer_id:
+            del self._volunteer_of_user[user_id]
+
+        last = self._size - 1
+        if slot != last:
+            for column in self._columns.values():
+                column[slot] = column[last]
+            self._rows[slot] = self._rows[last]
+            self._slot_of[self._rows[slot][0]] = slot
+        self._rows.pop()
+        self._size = last
+        self.version += 1
+
+    # Lookups
+    def slots_for(self, volunteer_ids: Iterable[int]) -> np.ndarray:
+        """Slots of the given volunteers, in order, skipping unknown ids"""
+        slot_of = self._slot_of
+        return np.array([slot_of[vol_id] for vol_id in volunteer_ids if vol_id in slot_of],
+                        dtype=np.int64)
+
+    def all_slots(self) -> np.ndarray:
+        return np.arange(self._size, dtype=np.int64)
+
+    def skill_rows(self, skill_index) -> np.ndarray:
+        """Skill-matrix row of every slot (-1 if not indexed), cached until either side renumbers"""
+        with self._lock:
+            key = (id(skill_index), skill_index.version, self.version)
+            if self._skill_rows_key != key:
+                rows = skill_index.row_indices(self.ids.tolist())
+                # row_indices may rebuild the matrix and bump the version
+                self._skill_rows_key = (id(skill_index), skill_index.version, self.version)
+                self._skill_rows = rows
+            return self._skill_rows
+
+    def skills(self, slot: int) -> str:
+        return self._rows[slot][3] or ''
+
+    def skill_items(self) -> List[Tuple[int, str]]:
+        """(volunteer_id, skills) pairs for building a skill index"""
+        with self._lock:
+            return [(row[0], row[3] or '') for row in self._rows]
+
+    def location_items(self) -> List[Tuple[int, float, float]]:
+        """(volunteer_id, latitude, longitude) rows of located volunteers for a spatial index"""
+        with self._lock:
+            return [(row[0], row[4], row[5]) for row in self._rows
+                    if row[4] is not None and row[5] is not None]
+
+    def record(self, slot: int) -> Dict:
+        """Display fields of one slot, shaped like the ranking result dicts"""
+        row = self._rows[slot]
+        return {
+            'id': row[0],
+            'user_id': row[1],
+            'name': row[2],
+            'skills': row[3] or '',
+            'rating': float(self._columns['ratings'][slot]),
+            'completed_tasks': int(self._columns['completed_tasks'][slot]),
+            'latitude': row[4],
+            'longitude': row[5],
+            'subscription_type': SUBSCRIPTION_NAMES[int(self._columns['subscription_codes'][slot])],
+            'premium_verified': bool(self._columns['premium'][slot]),
+        }
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_volunteer_snapshot(max_age_seconds: float = 300) -> VolunteerSnapshot:
+    """The process-wide snapshot, subscribed to committed volunteer/user changes"""
+    global _snapshot
+    if _snapshot is None:
+        with _snapshot_lock:
+            if _snapshot is None:
+                snapshot = VolunteerSnapshot(max_age_seconds=max_age_seconds)
+                change_feed.subscribe(snapshot.mark_stale)
+                _snapshot = snapshot
+    return _snapshot
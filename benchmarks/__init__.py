@@ -0,0 +1 @@
+"""Performance benchmarks for HelpHand matching and data paths"""
@@ -0,0 +1,76 @@
+"""
+Benchmark: per-volunteer math haversine vs vectorized NumPy geo module
+
+Run from the project root:
+    python -m benchmarks.bench_geo
+"""
+import math
+import random
+import time
+
+from app.services.geo import AI_PROXIMITY_BUCKETS, distances_and_scores
+
+TASK_LAT, TASK_LON = 12.9716, 77.5946  # Bangalore
+POOL_SIZES = [10_000, 100_000]
+
+
+def scalar_haversine(lat1, lon1, lat2, lon2):
+    """The original one-pair-at-a-time implementation"""
+    R = 6371
+    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
+    return R * 2 * math.asin(math.sqrt(a))
+
+
+def scalar_proximity(distance_km):
+    if distance_km <= 1:
+        return 1.0
+    elif distance_km <= 5:
+        return 0.8
+    elif distance_km <= 10:
+        return 0.6
+    elif distance_km <= 25:
+        return 0.4
+    return 0.2
+
+
+def best_of(fn, repeats=5):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    random.seed(42)
+    print("=" * 60)
+    print("Geo benchmark: distance + proximity score for a volunteer pool")
+    print("=" * 60)
+
+    for size in POOL_SIZES:
+        lats = [TASK_LAT + random.uniform(-0.5, 0.5) for _ in range(size)]
+        lons = [TASK_LON + random.uniform(-0.5, 0.5) for _ in range(size)]
+
+        def scalar():
+            return [scalar_proximity(scalar_haversine(la, lo, TASK_LAT, TASK_LON))
+                    for la, lo in zip(lats, lons)]
+
+        def vectorized():
+            return distances_and_scores(lats, lons, TASK_LAT, TASK_LON, AI_PROXIMITY_BUCKETS)
+
+        scalar_time = best_of(scalar)
+        vector_time = best_of(vectorized)
+        print(f"\n{size:>7,} volunteers")
+        print(f"   scalar (math):      {scalar_time * 1000:8.2f} ms")
+        print(f"   vectorized (NumPy): {vector_time * 1000:8.2f} ms")
+        print(f"   speedup:            {scalar_time / vector_time:8.1f}x")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Benchmark: per-document image I/O between preprocessing and Tesseract.
+
+The old pipeline wrote the binarized image next to the upload as a PNG,
+re-opened it with PIL, let pytesseract re-encode it (as PNG, the file's
+format) into its own temp file for each of the two Tesseract runs, then
+deleted it. The current pipeline hands the NumPy array to pytesseract as an
+in-memory image tagged PPM, so the only write left is pytesseract's
+uncompressed temp file. Tesseract itself is not run: both paths go through
+pytesseract's own save() and stop before the subprocess, so the numbers are
+the I/O alone. Needs Pillow, OpenCV and pytesseract, not the tesseract binary.
+
+Run from the project root:
+    python -m benchmarks.bench_ocr_io
+"""
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+from pytesseract.pytesseract import save as pytesseract_save
+
+from app.ocr_service import TESSERACT_INPUT_FORMAT
+
+# (label, width, height) of the preprocessed image; preprocessing scales to 2000-3000 px high
+SIZES = [('ID card', 3170, 2000), ('A4 scan', 2121, 3000)]
+TESSERACT_RUNS = 2  # psm 6 and psm 3
+RUNS = 7
+
+
+def synthetic_document(width, height, seed=0):
+    """A binarized document: lines of text on white with speckle noise, like the preprocessing output"""
+    rng = np.random.default_rng(seed)
+    image = np.full((height, width), 255, np.uint8)
+    line_height = height // 14
+    for line in range(1, 13):
+        text = ''.join(rng.choice(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ 0123456789'), size=24))
+        cv2.putText(image, text, (width // 20, line * line_height), cv2.FONT_HERSHEY_SIMPLEX,
+                    line_height / 40, 0, max(2, line_height // 25))
+    image[rng.random(image.shape) < 0.002] = 0
+    return image
+
+
+def temp_file_bytes(image):
+    with pytesseract_save(image) as (_, input_file_name):
+        return os.path.getsize(input_file_name)
+
+
+def legacy_io(array, upload_path):
+    """Write *_preprocessed.png, re-open it, pytesseract temp file per run, delete"""
+    temp_path = upload_path.replace('.', '_preprocessed.')
+    cv2.imwrite(temp_path, array)
+    image = Image.open(temp_path)
+    written = os.path.getsize(temp_path)
+    for _ in range(TESSERACT_RUNS):
+        with pytesseract_save(image) as (_, input_file_name):
+            written += os.path.getsize(input_file_name)
+    os.remove(temp_path)
+    return written
+
+
+def in_memory_io(array, upload_path):
+    """Array to PIL once, pytesseract temp file per run"""
+    image = Image.fromarray(array)
+    image.format = TESSERACT_INPUT_FORMAT
+    written = 0
+    for _ in range(TESSERACT_RUNS):
+        with pytesseract_save(image) as (_, input_file_name):
+            written += os.path.getsize(input_file_name)
+    return written
+
+
+def measure(fn, array, upload_path):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        written = fn(array, upload_path)
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return times[len(times) // 2] * 1000, written
+
+
+def main():
+    print("=" * 60)
+    print("OCR preprocessing -> Tesseract: per-document image I/O")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as upload_dir:
+        upload_path = os.path.join(upload_dir, 'upload.jpg')
+        for label, width, height in SIZES:
+            array = synthetic_document(width, height)
+            legacy_ms, legacy_bytes = measure(legacy_io, array, upload_path)
+            memory_ms, memory_bytes = measure(in_memory_io, array, upload_path)
+            print(f"\n{label} ({width}x{height})")
+            print(f"   temp PNG + re-open:  {legacy_ms:8.2f} ms   {legacy_bytes / 1e6:6.2f} MB written")
+            print(f"   in-memory ({TESSERACT_INPUT_FORMAT}):    {memory_ms:8.2f} ms   {memory_bytes / 1e6:6.2f} MB written")
+            print(f"   saved per document:  {legacy_ms - memory_ms:8.2f} ms   ({legacy_ms / memory_ms:.1f}x)")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
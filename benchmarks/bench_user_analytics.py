@@ -0,0 +1,133 @@
+"""
+Benchmark: user_analytics aggregation for heavy users.
+
+Compares the old approach (load every task of the user, count statuses and
+bucket months in Python, feedback via an IN list of all task ids) with the
+grouped SQL aggregates, per-user monthly rollups and a LIMIT 10 recent-task
+query the route now uses. Reports time and peak Python memory per request.
+
+Run from the project root:
+    python -m benchmarks.bench_user_analytics
+"""
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from app import create_app, db
+from app.models import User, Task, Feedback
+from app.services.rollups import months_back, refresh_rollups, user_monthly_tasks
+from app.services.stats import compute_user_task_stats
+from benchmarks.synthetic import generate_tasks
+from config import Config
+
+SIZES = [1_000, 10_000, 50_000]
+RUNS = 5
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQL_INSTRUMENTATION = False
+
+
+def seed(user_id, count):
+    """count tasks for one user (completed ones get feedback), via bulk inserts"""
+    tasks = generate_tasks(count, seed=count)
+    now = datetime.utcnow()
+    task_rows, feedback_rows = [], []
+    for i, task in enumerate(tasks):
+        task_id = user_id * 1_000_000 + i + 1
+        # Spread over the last two years so the month buckets are realistic
+        created_at = now - timedelta(minutes=(i * 7919) % (730 * 24 * 60))
+        task_rows.append({
+            'id': task_id, 'user_id': user_id, 'title': task.title, 'description': task.description,
+            'category': task.category, 'pincode': task.pincode, 'status': task.status,
+            'urgency': task.urgency, 'created_at': created_at,
+        })
+        if task.status == 'completed':
+            feedback_rows.append({
+                'task_id': task_id, 'user_id': user_id, 'volunteer_id': 1,
+                'rating': 1 + i % 5, 'created_at': created_at,
+            })
+    db.session.execute(Task.__table__.insert(), task_rows)
+    if feedback_rows:
+        db.session.execute(Feedback.__table__.insert(), feedback_rows)
+    db.session.commit()
+
+
+def legacy_analytics(user_id):
+    """The previous route body: everything loaded and counted in Python"""
+    user_tasks = Task.query.filter_by(user_id=user_id).all()
+    total_tasks = len(user_tasks)
+    completed_tasks = len([t for t in user_tasks if t.status == 'completed'])
+    pending_tasks = len([t for t in user_tasks if t.status == 'pending'])
+    assigned_tasks = len([t for t in user_tasks if t.status == 'assigned'])
+    completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
+
+    task_ids = [t.id for t in user_tasks]
+    feedback_count = Feedback.query.filter(Feedback.task_id.in_(task_ids)).count() if task_ids else 0
+    avg_feedback = db.session.query(db.func.avg(Feedback.rating))\
+        .filter(Feedback.task_id.in_(task_ids)).scalar() if task_ids else 0.0
+
+    six_months_ago = datetime.utcnow() - timedelta(days=180)
+    monthly_data = {}
+    for task in [t for t in user_tasks if t.created_at >= six_months_ago]:
+        month = monthly_data.setdefault(task.created_at.strftime('%Y-%m'), {'total': 0, 'completed': 0})
+        month['total'] += 1
+        if task.status == 'completed':
+            month['completed'] += 1
+    return (completion_rate, pending_tasks, assigned_tasks, feedback_count, avg_feedback,
+            monthly_data, user_tasks[-10:])
+
+
+def aggregate_analytics(user_id):
+    """The current route body"""
+    stats = compute_user_task_stats(user_id)
+    monthly_data = user_monthly_tasks(user_id, months_back(datetime.utcnow().date(), 5))
+    recent_tasks = Task.query.filter_by(user_id=user_id)\
+        .order_by(Task.created_at.desc(), Task.id.desc()).limit(10).all()
+    return stats, monthly_data, recent_tasks
+
+
+def measure(fn, user_id):
+    times, peaks = [], []
+    for _ in range(RUNS):
+        db.session.expunge_all()
+        tracemalloc.start()
+        start = time.perf_counter()
+        fn(user_id)
+        times.append(time.perf_counter() - start)
+        peaks.append(tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    times.sort()
+    return times[len(times) // 2] * 1000, max(peaks) / 1024 / 1024
+
+
+def main():
+    print("=" * 60)
+    print("user_analytics: Python-side counting vs SQL aggregates")
+    print("=" * 60)
+
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        for user_id, size in enumerate(SIZES, start=1):
+            user = User(id=user_id, name=f'NGO {user_id}', email=f'ngo{user_id}@bench.local', role='user')
+            user.set_password('bench')
+            db.session.add(user)
+            db.session.commit()
+            seed(user_id, size)
+        refresh_rollups(full=True)
+
+        for user_id, size in enumerate(SIZES, start=1):
+            legacy_ms, legacy_mb = measure(legacy_analytics, user_id)
+            aggregate_ms, aggregate_mb = measure(aggregate_analytics, user_id)
+            print(f"\n{size:,} tasks")
+            print(f"   load + Python passes:  {legacy_ms:9.2f} ms   peak {legacy_mb:7.2f} MB")
+            print(f"   SQL aggregates:        {aggregate_ms:9.2f} ms   peak {aggregate_mb:7.2f} MB")
+            print(f"   speedup:               {legacy_ms / aggregate_ms:9.1f}x")
+
+    print("\n" + "=" * 60)
+
+
+if __name__ == '__main__':
+    main()
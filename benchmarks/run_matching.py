@@ -0,0 +1,203 @@
+"""
+Matching benchmark suite.
+
+Times AIMatchingService.rank_volunteers_for_task, its columnar-snapshot
+path (rank_from_snapshot),
+SimpleAIMatchingService.rank_volunteers_for_task and
+filter_volunteers_by_location end to end and per stage on synthetic
+populations, and writes the results as JSON so runs can be compared.
+
+Run from the project root:
+    python -m benchmarks.run_matching
+    python -m benchmarks.run_matching --sizes 1000,10000,100000,1000000 --tasks 10
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from collections import namedtuple
+from datetime import datetime
+
+from app.services.ai_matching import AIMatchingService
+from app.services.geo import to_coordinate_array
+from app.services.ranking import top_k_indices
+from app.services.simple_ai import SimpleAIMatchingService
+from app.services.volunteer_snapshot import VolunteerSnapshot
+from benchmarks.synthetic import generate_tasks, generate_volunteers
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+# Same shape as app.models.volunteer_snapshot_rows
+SnapshotRow = namedtuple('SnapshotRow', [
+    'id', 'user_id', 'name', 'skills', 'latitude', 'longitude', 'rating', 'completed_tasks',
+    'premium_verified', 'subscription_type', 'verification_status'
+])
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def _summary(samples):
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        'runs': len(ms),
+        'mean_ms': round(statistics.fmean(ms), 3),
+        'p50_ms': round(ms[len(ms) // 2], 3),
+        'p95_ms': round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        'min_ms': round(ms[0], 3),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def snapshot_rows(volunteers):
+    return [
+        SnapshotRow(vol.id, vol.user_id, vol.user_profile.name, vol.skills,
+                    vol.user_profile.latitude, vol.user_profile.longitude, vol.rating,
+                    vol.completed_tasks, vol.premium_verified, vol.subscription_type,
+                    vol.verification_status)
+        for vol in volunteers
+    ]
+
+
+def bench_ai_service(volunteers, tasks, max_results):
+    """Per-stage and end-to-end timings for the TF-IDF matching service"""
+    service = AIMatchingService()
+    stages = {'filter': [], 'score': [], 'select': [], 'rank_end_to_end': [], 'rank_snapshot': []}
+
+    # Cold start: fitting the persistent skill index on the whole pool
+    _, index_build = _timed(lambda: service.ensure_skill_index(
+        lambda: [(vol.id, vol.skills) for vol in volunteers]
+    ))
+
+    for task in tasks:
+        candidates, elapsed = _timed(lambda: service.filter_volunteers_by_location(
+            volunteers, task.latitude, task.longitude, radius_km=10, fallback_radius_km=50
+        ))
+        stages['filter'].append(elapsed)
+
+        (_, _, match), elapsed = _timed(lambda: service._score_pool(
+            service._task_text(task),
+            [vol.id for vol in candidates],
+            [vol.skills or '' for vol in candidates],
+            to_coordinate_array([vol.user_profile.latitude for vol in candidates]),
+            to_coordinate_array([vol.user_profile.longitude for vol in candidates]),
+            task.latitude, task.longitude
+        ))
+        stages['score'].append(elapsed)
+
+        _, elapsed = _timed(lambda: top_k_indices(match, max_results))
+        stages['select'].append(elapsed)
+
+        _, elapsed = _timed(lambda: service.rank_volunteers_for_task(task, candidates, max_results))
+        stages['rank_end_to_end'].append(elapsed)
+
+    # Columnar snapshot path used by view_task: spatial index candidates,
+    # scored straight from the snapshot arrays
+    rows = snapshot_rows(volunteers)
+    snapshot = VolunteerSnapshot(max_age_seconds=None)
+    _, snapshot_build = _timed(lambda: service.refresh_from_snapshot(snapshot, lambda **_: rows))
+    for task in tasks:
+        def rank():
+            ids = service.nearest_volunteer_ids(task.latitude, task.longitude, 25, 10, 50)
+            return service.rank_from_snapshot(task, snapshot, ids, max_results)
+        _, elapsed = _timed(rank)
+        stages['rank_snapshot'].append(elapsed)
+
+    results = {stage: _summary(samples) for stage, samples in stages.items()}
+    results['skill_index_build'] = {'runs': 1, 'mean_ms': round(index_build * 1000, 3)}
+    results['snapshot_build'] = {'runs': 1, 'mean_ms': round(snapshot_build * 1000, 3)}
+    return results
+
+
+def bench_simple_service(volunteers, tasks, max_results):
+    """End-to-end timings for the keyword matching service"""
+    service = SimpleAIMatchingService()
+    filter_samples, rank_samples = [], []
+    for task in tasks:
+        candidates, elapsed = _timed(lambda: service.filter_volunteers_by_location(
+            volunteers, task.latitude, task.longitude, radius_km=10, fallback_radius_km=50
+        ))
+        filter_samples.append(elapsed)
+        _, elapsed = _timed(lambda: service.rank_volunteers_for_task(task, candidates, max_results))
+        rank_samples.append(elapsed)
+    return {'filter': _summary(filter_samples), 'rank_end_to_end': _summary(rank_samples)}
+
+
+def run(sizes, task_count, max_results, seed):
+    tasks = generate_tasks(task_count, seed=seed + 1, status='pending')
+    report = {
+        'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'git_commit': _git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {'sizes': sizes, 'tasks': task_count, 'max_results': max_results, 'seed': seed},
+        'results': [],
+    }
+
+    for size in sizes:
+        print(f"\n{size:,} volunteers")
+        volunteers, generate_time = _timed(lambda: generate_volunteers(size, seed=seed))
+        print(f"   generated in {generate_time:.1f}s")
+
+        ai_results = bench_ai_service(volunteers, tasks, max_results)
+        print(f"   AIMatchingService        rank p50 {ai_results['rank_end_to_end']['p50_ms']:9.2f} ms"
+              f"   filter p50 {ai_results['filter']['p50_ms']:8.2f} ms")
+        print(f"   AIMatchingService        snapshot rank p50 {ai_results['rank_snapshot']['p50_ms']:9.2f} ms")
+
+        simple_results = bench_simple_service(volunteers, tasks, max_results)
+        print(f"   SimpleAIMatchingService  rank p50 {simple_results['rank_end_to_end']['p50_ms']:9.2f} ms"
+              f"   filter p50 {simple_results['filter']['p50_ms']:8.2f} ms")
+
+        report['results'].append({
+            'volunteers': size,
+            'ai_matching': ai_results,
+            'simple_ai': simple_results,
+        })
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES),
+                        help='Comma-separated volunteer pool sizes (e.g. 1000,10000,100000,1000000)')
+    parser.add_argument('--tasks', type=int, default=20, help='Tasks ranked per pool size')
+    parser.add_argument('--max-results', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help='JSON file (default: benchmarks/results/<timestamp>.json)')
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("HelpHand matching benchmark")
+    print("=" * 60)
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    report = run(sizes, args.tasks, args.max_results, args.seed)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"matching_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + "=" * 60)
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
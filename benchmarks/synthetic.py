@@ -0,0 +1,135 @@
+"""
+Synthetic, reproducible User/Volunteer/Task populations for benchmarks.
+
+Objects are transient ORM instances (never added to a session), so the
+matching services can be timed exactly as the routes call them without a
+database. The same seed always produces the same population.
+"""
+import random
+from datetime import datetime, timedelta
+
+from app.models import User, Volunteer, Task
+
+# (city, latitude, longitude, relative population weight)
+INDIAN_CITIES = [
+    ('Delhi', 28.6139, 77.2090, 16),
+    ('Mumbai', 19.0760, 72.8777, 15),
+    ('Bangalore', 12.9716, 77.5946, 10),
+    ('Hyderabad', 17.3850, 78.4867, 8),
+    ('Chennai', 13.0827, 80.2707, 8),
+    ('Kolkata', 22.5726, 88.3639, 11),
+    ('Pune', 18.5204, 73.8567, 6),
+    ('Ahmedabad', 23.0225, 72.5714, 6),
+    ('Jaipur', 26.9124, 75.7873, 3),
+    ('Lucknow', 26.8467, 80.9462, 3),
+    ('Kochi', 9.9312, 76.2673, 2),
+    ('Bhopal', 23.2599, 77.4126, 2),
+]
+
+# Category -> skill phrases volunteers list and words tasks use
+SKILL_VOCABULARY = {
+    'repairs': ['plumbing', 'home repairs', 'electrical work', 'carpentry', 'painting',
+                'appliance repair', 'furniture assembly'],
+    'education': ['tutoring', 'math', 'science', 'english', 'homework help',
+                  'computer skills', 'exam preparation'],
+    'elderly_care': ['elderly care', 'companionship', 'medicine reminders',
+                     'hospital visits', 'grocery shopping'],
+    'delivery': ['grocery shopping', 'delivery', 'driving', 'errands', 'pharmacy pickup'],
+    'outdoor': ['gardening', 'lawn care', 'tree planting', 'cleaning', 'moving help'],
+    'pets': ['pet care', 'dog walking', 'pet sitting', 'pet grooming'],
+    'tech': ['computer repair', 'smartphone help', 'wifi setup', 'data entry'],
+}
+
+TASK_TEMPLATES = {
+    'repairs': ['Need help fixing {0} at home', 'Looking for someone for {0} this weekend'],
+    'education': ['Need {0} for my child in 10th grade', 'Looking for {0} sessions'],
+    'elderly_care': ['Need {0} for my grandmother', 'Looking for help with {0} for elderly parent'],
+    'delivery': ['Need help with {0} this afternoon', 'Looking for someone for {0}'],
+    'outdoor': ['Need {0} in our society garden', 'Looking for help with {0}'],
+    'pets': ['Need {0} while I travel', 'Looking for {0} for my dog'],
+    'tech': ['Need {0} for my laptop', 'Looking for help with {0}'],
+}
+
+CATEGORY_WEIGHTS = {
+    'repairs': 25, 'education': 20, 'elderly_care': 15, 'delivery': 15,
+    'outdoor': 10, 'pets': 8, 'tech': 7,
+}
+URGENCY_WEIGHTS = {'low': 30, 'medium': 50, 'high': 20}
+STATUS_WEIGHTS = {'pending': 35, 'assigned': 20, 'completed': 40, 'cancelled': 5}
+
+# Spread around a city centre (degrees, ~1 sd = 11 km)
+CITY_SPREAD_DEG = 0.1
+
+
+def _weighted(rng, weights):
+    return rng.choices(list(weights.keys()), weights=list(weights.values()))[0]
+
+
+def _location(rng):
+    city, lat, lon, _ = rng.choices(INDIAN_CITIES, weights=[c[3] for c in INDIAN_CITIES])[0]
+    return city, lat + rng.gauss(0, CITY_SPREAD_DEG), lon + rng.gauss(0, CITY_SPREAD_DEG)
+
+
+def generate_volunteers(count, seed=42, missing_location_rate=0.02):
+    """Approved volunteers with linked User profiles, skills drawn from one or two categories"""
+    rng = random.Random(seed)
+    volunteers = []
+    for i in range(count):
+        _, lat, lon = _location(rng)
+        if rng.random() < missing_location_rate:
+            lat = lon = None
+
+        categories = rng.sample(list(CATEGORY_WEIGHTS), k=rng.choice([1, 1, 2]))
+        skills = []
+        for category in categories:
+            skills.extend(rng.sample(SKILL_VOCABULARY[category], k=rng.randint(2, 4)))
+
+        user = User(
+            id=i + 1,
+            name=f'Volunteer {i + 1}',
+            email=f'volunteer{i + 1}@bench.local',
+            role='volunteer',
+            pincode=str(rng.randint(110001, 855999)),
+            latitude=lat,
+            longitude=lon,
+            verified=True,
+        )
+        volunteer = Volunteer(
+            id=i + 1,
+            user_id=user.id,
+            skills=', '.join(dict.fromkeys(skills)),
+            verification_status='approved',
+            rating=round(min(5.0, max(0.0, rng.gauss(3.8, 0.9))), 2),
+            completed_tasks=int(rng.expovariate(1 / 8)),
+            subscription_type='pro' if rng.random() < 0.1 else 'basic',
+            premium_verified=rng.random() < 0.2,
+        )
+        volunteer.user_profile = user
+        volunteers.append(volunteer)
+    return volunteers
+
+
+def generate_tasks(count, seed=7, status=None):
+    """Tasks with category/urgency/status drawn from realistic distributions"""
+    rng = random.Random(seed)
+    now = datetime(2024, 1, 1)
+    tasks = []
+    for i in range(count):
+        category = _weighted(rng, CATEGORY_WEIGHTS)
+        skill = rng.choice(SKILL_VOCABULARY[category])
+        title = rng.choice(TASK_TEMPLATES[category]).format(skill)
+        _, lat, lon = _location(rng)
+        tasks.append(Task(
+            id=i + 1,
+            user_id=1,
+            title=title,
+            description=f'{title}. {rng.choice(SKILL_VOCABULARY[category])} experience preferred.',
+            category=category,
+            pincode=str(rng.randint(110001, 855999)),
+            latitude=lat,
+            longitude=lon,
+            status=status or _weighted(rng, STATUS_WEIGHTS),
+            urgency=_weighted(rng, URGENCY_WEIGHTS),
+            created_at=now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+        ))
+    return tasks
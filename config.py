@@ -13,15 +13,45 @@ class Config:
     # OCR Configuration
     TESSERACT_CMD = r'C:\Program Files\Tesseract-OCR\tesseract.exe'  # Adjust path as needed
     
+    # SQL instrumentation (Server-Timing header, N+1 warnings)
+    SQL_INSTRUMENTATION = True
+    SQL_REPEATED_STATEMENT_THRESHOLD = 5  # Same statement this often in one request looks like N+1
+    SQL_QUERY_BUDGET = None  # Max queries per request; exceeding it fails requests under TESTING
+    SQL_QUERY_BUDGETS = {}  # Per-endpoint overrides, e.g. {'admin.view_reports': 25}
+    
     # Location settings
     DEFAULT_RADIUS_KM = 10
     FALLBACK_RADIUS_KM = 50
+    MATCH_CANDIDATES_K = 25  # Widen the search radius until this many candidates are found
+    # Seconds before the in-memory volunteer snapshot is fully re-read
+    # (catches commits made by other worker processes)
+    VOLUNTEER_SNAPSHOT_MAX_AGE = 300
+    
+    # Listing pagination (keyset on created_at, id); ?per_page= is capped at MAX_PAGE_SIZE
+    PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+    
+    # Rows fetched per round trip by the streaming CSV exports
+    EXPORT_BATCH_SIZE = 1000
+    
+    # Background OCR queue (flask ocr-worker)
+    OCR_WORKER_POLL_SECONDS = 5
+    OCR_JOB_MAX_ATTEMPTS = 3
+    OCR_JOB_STALE_SECONDS = 600  # A running job older than this is reclaimed (crashed worker)
+    OCR_DOCUMENT_TIMEOUT = 60  # Seconds of Tesseract time per document before it is killed
+    OCR_POOL_WORKERS = None  # Processes for flask ocr-backlog (None = one per core)
     
     # AI/ML settings
+    # Build the ML/OCR services at app start instead of on first use
+    PRELOAD_ML_SERVICES = os.environ.get('PRELOAD_ML_SERVICES') == '1'
     MIN_SIMILARITY_THRESHOLD = 0.1
     PROXIMITY_WEIGHT = 0.4
     SIMILARITY_WEIGHT = 0.6
     
+    # Report rollups: each refresh re-aggregates buckets this many days
+    # before its watermark, picking up late status changes
+    ROLLUP_LOOKBACK_DAYS = 7
+    
     # Commercial features
     PLATFORM_FEE_PERCENTAGE = 8
     PREMIUM_VERIFICATION_FEE = 99
@@ -0,0 +1,84 @@
+"""
+pytest fixtures: an app on a throwaway SQLite database with a few users,
+volunteers and tasks.
+
+Run from the project root:
+    python -m pytest -q
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+from app import create_app, db
+from app.models import User, Volunteer, Task
+from config import Config
+
+# Script-style checks that run (and need Tesseract, NLTK, a Windows path...)
+# at import time; run them directly with `python test_ocr.py` etc.
+collect_ignore = ['test_both_paths.py', 'test_ocr.py', 'test_ocr_real.py', 'test_path_fix.py',
+                  'test_sentiment.py', 'test_tfidf.py']
+
+# Hashed once: every seeded account uses it
+PASSWORD_HASH = generate_password_hash('secret')
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(Config):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'test.db'}"
+        UPLOAD_FOLDER = str(tmp_path / 'uploads')
+        PRELOAD_ML_SERVICES = False
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def seeded(app):
+    """An admin, a user with 30 tasks over the last 90 days and 4 approved volunteers"""
+    admin = User(name='Admin', email='admin@example.com', role='admin', password_hash=PASSWORD_HASH)
+    user = User(name='Asha Rao', email='user@example.com', role='user', pincode='560001',
+                latitude=12.97, longitude=77.59, password_hash=PASSWORD_HASH)
+    db.session.add_all([admin, user])
+    db.session.flush()
+
+    volunteers = []
+    for i in range(4):
+        profile = User(name=f'Volunteer {i}', email=f'volunteer{i}@example.com', role='volunteer',
+                       latitude=12.97 + i / 100, longitude=77.59, password_hash=PASSWORD_HASH)
+        db.session.add(profile)
+        db.session.flush()
+        volunteers.append(Volunteer(user_id=profile.id, skills='plumbing repairs',
+                                    verification_status='approved'))
+    db.session.add_all(volunteers)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    for i in range(30):
+        db.session.add(Task(
+            user_id=user.id, title=f'Task {i}', description='fix a leaking pipe',
+            category=('repair', 'education')[i % 2], pincode='560001',
+            is_commercial=i % 3 == 0, payment_amount=100, platform_fee=8,
+            # Pairs of tasks share a timestamp so pagination has ties to break
+            created_at=now - timedelta(days=3 * (i // 2))
+        ))
+    db.session.commit()
+    return {'admin': admin, 'user': user, 'volunteers': volunteers}
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def login(client):
+    """login(email) signs the test client in (seeded passwords are 'secret')"""
+    def login(email, password='secret'):
+        return client.post('/login', data={'email': email, 'password': password})
+    return login
@@ -0,0 +1,137 @@
+"""
+Show how the database executes each route's queries.
+
+Requests the hot pages with the test client as the first user of each role,
+captures the SELECT statements they run, and prints EXPLAIN QUERY PLAN
+(SQLite) or EXPLAIN (MySQL) for each, flagging full table scans and sorts
+that do not come from an index.
+
+Run against the configured database (DATABASE_URL), after `flask db upgrade`:
+    python explain_queries.py
+    python explain_queries.py --route /dashboard --sql
+"""
+import argparse
+
+from sqlalchemy import event
+
+from app import create_app, db
+from app.models import User, Task
+from config import Config
+
+# (role, path) pairs; '{task_id}' is filled with one of the user's tasks
+ROUTES = [
+    ('user', '/dashboard'),
+    ('user', '/api/tasks'),
+    ('user', '/analytics'),
+    ('user', '/task/{task_id}'),
+    ('volunteer', '/volunteer/dashboard'),
+    ('volunteer', '/volunteer/api/assigned_tasks'),
+    ('admin', '/admin/dashboard'),
+    ('admin', '/admin/api/pending_volunteers'),
+    ('admin', '/admin/reports'),
+]
+
+
+class ExplainConfig(Config):
+    SQL_INSTRUMENTATION = False
+    WTF_CSRF_ENABLED = False
+
+
+def capture_selects(app, client, path):
+    """Distinct (statement, parameters) of the SELECTs a GET request runs"""
+    captured = {}
+
+    def before(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            captured.setdefault(statement, parameters)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', before)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(engine, 'before_cursor_execute', before)
+    return response.status_code, list(captured.items())
+
+
+def explain(statement, parameters):
+    """(plan lines, warnings) for one statement on the current dialect"""
+    dialect = db.engine.dialect.name
+    with db.engine.connect() as conn:
+        if dialect == 'sqlite':
+            rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+            lines = [row[-1] for row in rows]
+            warnings = [line for line in lines
+                        if (line.startswith('SCAN') and 'INDEX' not in line)
+                        or 'TEMP B-TREE' in line]
+        else:
+            result = conn.exec_driver_sql('EXPLAIN ' + statement, parameters)
+            columns = list(result.keys())
+            rows = [dict(zip(columns, row)) for row in result.fetchall()]
+            lines = [f"{row.get('table')}: type={row.get('type')} key={row.get('key')} "
+                     f"rows={row.get('rows')} {row.get('Extra') or ''}".rstrip() for row in rows]
+            warnings = [line for line, row in zip(lines, rows)
+                        if row.get('type') == 'ALL' or 'filesort' in (row.get('Extra') or '')]
+    return lines, warnings
+
+
+def login_as(client, user):
+    with client.session_transaction() as sess:
+        sess['_user_id'] = str(user.id)
+        sess['_fresh'] = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--route', help='Only explain paths containing this string')
+    parser.add_argument('--sql', action='store_true', help='Print each full statement')
+    args = parser.parse_args()
+
+    app = create_app(ExplainConfig)
+    client = app.test_client()
+
+    with app.app_context():
+        accounts = {role: User.query.filter_by(role=role).order_by(User.id).first()
+                    for role in ('user', 'volunteer', 'admin')}
+        user = accounts['user']
+        task = Task.query.filter_by(user_id=user.id).first() if user else None
+        print(f"Database: {db.engine.dialect.name} ({db.engine.url.render_as_string(hide_password=True)})")
+
+    total_warnings = 0
+    for role, path in ROUTES:
+        if args.route and args.route not in path:
+            continue
+        account = accounts.get(role)
+        if account is None or ('{task_id}' in path and task is None):
+            print(f"\n⏭  {path}: no {role} data to request it with")
+            continue
+        path = path.format(task_id=task.id if task else '')
+
+        with app.app_context():
+            login_as(client, account)
+            status, statements = capture_selects(app, client, path)
+            print("\n" + "=" * 70)
+            print(f"{path}  [{role} {account.email}]  HTTP {status}, {len(statements)} distinct SELECTs")
+            print("=" * 70)
+
+            for statement, parameters in statements:
+                sql = ' '.join(statement.split())
+                print(f"\n  {sql if args.sql else sql[:110] + ('...' if len(sql) > 110 else '')}")
+                try:
+                    lines, warnings = explain(statement, parameters)
+                except Exception as e:
+                    print(f"    (could not explain: {e})")
+                    continue
+                for line in lines:
+                    marker = '⚠️ ' if line in warnings else '   '
+                    print(f"   {marker}{line}")
+                total_warnings += len(warnings)
+
+    print("\n" + "=" * 70)
+    print(f"{total_warnings} plan step(s) with a full scan or a non-index sort")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
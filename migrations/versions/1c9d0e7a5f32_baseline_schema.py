@@ -0,0 +1,106 @@
+"""Baseline schema: users, volunteers, tasks and feedback
+
+The tables as they were before migrations were introduced. Databases
+created by db.create_all() (run.py / init_db.py) already have them, so each
+table is only created when missing; an empty database can then be brought
+up to date with `flask db upgrade` alone.
+
+Revision ID: 1c9d0e7a5f32
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1c9d0e7a5f32'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('password_hash', sa.String(length=255), nullable=False),
+            sa.Column('role', sa.Enum('admin', 'user', 'volunteer', name='user_roles'), nullable=False),
+            sa.Column('pincode', sa.String(length=10), nullable=True),
+            sa.Column('latitude', sa.Float(), nullable=True),
+            sa.Column('longitude', sa.Float(), nullable=True),
+            sa.Column('verified', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email')
+        )
+    if 'volunteers' not in existing:
+        op.create_table(
+            'volunteers',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('skills', sa.Text(), nullable=True),
+            sa.Column('document_path', sa.String(length=255), nullable=True),
+            sa.Column('extracted_text', sa.Text(), nullable=True),
+            sa.Column('verification_status', sa.Enum('pending', 'approved', 'rejected', name='verification_statuses'), nullable=True),
+            sa.Column('rating', sa.Float(), nullable=True),
+            sa.Column('completed_tasks', sa.Integer(), nullable=True),
+            sa.Column('subscription_type', sa.Enum('basic', 'pro', name='subscription_types'), nullable=True),
+            sa.Column('subscription_expires', sa.DateTime(), nullable=True),
+            sa.Column('premium_verified', sa.Boolean(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'tasks' not in existing:
+        op.create_table(
+            'tasks',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('description', sa.Text(), nullable=False),
+            sa.Column('category', sa.String(length=50), nullable=True),
+            sa.Column('pincode', sa.String(length=10), nullable=True),
+            sa.Column('latitude', sa.Float(), nullable=True),
+            sa.Column('longitude', sa.Float(), nullable=True),
+            sa.Column('status', sa.Enum('pending', 'assigned', 'completed', 'cancelled', name='task_statuses'), nullable=True),
+            sa.Column('assigned_volunteer_id', sa.Integer(), nullable=True),
+            sa.Column('is_commercial', sa.Boolean(), nullable=True),
+            sa.Column('payment_amount', sa.Float(), nullable=True),
+            sa.Column('platform_fee', sa.Float(), nullable=True),
+            sa.Column('urgency', sa.Enum('low', 'medium', 'high', name='urgency_levels'), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.Column('completed_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['assigned_volunteer_id'], ['volunteers.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'feedback' not in existing:
+        op.create_table(
+            'feedback',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('task_id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('volunteer_id', sa.Integer(), nullable=False),
+            sa.Column('rating', sa.Integer(), nullable=False),
+            sa.Column('text', sa.Text(), nullable=True),
+            sa.Column('sentiment_score', sa.Float(), nullable=True),
+            sa.Column('sentiment_label', sa.String(length=20), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=True),
+            sa.ForeignKeyConstraint(['task_id'], ['tasks.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.ForeignKeyConstraint(['volunteer_id'], ['volunteers.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('feedback')
+    op.drop_table('tasks')
+    op.drop_table('volunteers')
+    op.drop_table('users')
@@ -0,0 +1,54 @@
+"""Add composite indexes for the hot access paths
+
+Checks the inspector first: databases created by db.create_all() after
+the indexes were declared on the models already have them.
+
+Revision ID: 3f2a9c1d4b7e
+Revises: 1c9d0e7a5f32
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d4b7e'
+down_revision = '1c9d0e7a5f32'
+branch_labels = None
+depends_on = None
+
+
+# (table, index name, columns) - keep in sync with __table_args__ in app/models.py
+INDEXES = [
+    ('users', 'ix_users_lat_lon', ['latitude', 'longitude']),
+    ('volunteers', 'ix_volunteers_status_premium_created', ['verification_status', 'premium_verified', 'created_at']),
+    ('volunteers', 'ix_volunteers_user_id', ['user_id']),
+    ('tasks', 'ix_tasks_status_created', ['status', 'created_at']),
+    ('tasks', 'ix_tasks_user_created', ['user_id', 'created_at']),
+    ('tasks', 'ix_tasks_volunteer_status_created', ['assigned_volunteer_id', 'status', 'created_at']),
+    ('tasks', 'ix_tasks_created_at', ['created_at']),
+    ('feedback', 'ix_feedback_task_id', ['task_id']),
+    ('feedback', 'ix_feedback_volunteer_id', ['volunteer_id']),
+]
+
+
+def _existing_indexes():
+    inspector = sa.inspect(op.get_bind())
+    tables = set(inspector.get_table_names())
+    return {table: {index['name'] for index in inspector.get_indexes(table)}
+            for table in tables}
+
+
+def upgrade():
+    existing = _existing_indexes()
+    for table, name, columns in INDEXES:
+        if table in existing and name not in existing[table]:
+            op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for table, name, columns in reversed(INDEXES):
+        if name in existing.get(table, ()):
+            op.drop_index(name, table_name=table)
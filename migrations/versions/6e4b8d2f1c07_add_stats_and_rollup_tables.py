@@ -0,0 +1,114 @@
+"""Add the platform counter and report rollup tables
+
+platform_stats (app.services.stats), the task/user-task/signup rollups,
+their rollup_state watermark and the rollup_dirty_months queue
+(app.services.rollups). Tables that db.create_all() already made are
+skipped; a platform_stats created while metric was String(64) is widened
+to 80 so 'tasks.category.' + a 50-char category fits.
+
+Revision ID: 6e4b8d2f1c07
+Revises: 3f2a9c1d4b7e
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6e4b8d2f1c07'
+down_revision = '3f2a9c1d4b7e'
+branch_labels = None
+depends_on = None
+
+TABLES = ['platform_stats', 'task_rollups', 'user_task_rollups', 'signup_rollups',
+          'rollup_state', 'rollup_dirty_months']
+METRIC_LENGTH = 80
+
+
+def _widen_metric(inspector):
+    metric = next(column for column in inspector.get_columns('platform_stats')
+                  if column['name'] == 'metric')
+    if (getattr(metric['type'], 'length', None) or METRIC_LENGTH) < METRIC_LENGTH:
+        with op.batch_alter_table('platform_stats') as batch_op:
+            batch_op.alter_column('metric', existing_type=metric['type'],
+                                  type_=sa.String(length=METRIC_LENGTH), existing_nullable=False)
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    existing = set(inspector.get_table_names())
+    if 'platform_stats' in existing:
+        _widen_metric(inspector)
+    else:
+        op.create_table(
+            'platform_stats',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('bucket', sa.String(length=10), nullable=False),
+            sa.Column('metric', sa.String(length=METRIC_LENGTH), nullable=False),
+            sa.Column('value', sa.Float(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('bucket', 'metric', name='uq_platform_stats_bucket_metric')
+        )
+    if 'task_rollups' not in existing:
+        op.create_table(
+            'task_rollups',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('granularity', sa.String(length=5), nullable=False),
+            sa.Column('bucket', sa.Date(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('category', sa.String(length=50), nullable=False),
+            sa.Column('pincode_prefix', sa.String(length=10), nullable=False),
+            sa.Column('task_count', sa.Integer(), nullable=False),
+            sa.Column('commercial_count', sa.Integer(), nullable=False),
+            sa.Column('platform_fees', sa.Float(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('granularity', 'bucket', 'status', 'category', 'pincode_prefix',
+                                name='uq_task_rollups_key')
+        )
+    if 'user_task_rollups' not in existing:
+        op.create_table(
+            'user_task_rollups',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('bucket', sa.Date(), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('task_count', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'bucket', 'status', name='uq_user_task_rollups_key')
+        )
+    if 'signup_rollups' not in existing:
+        op.create_table(
+            'signup_rollups',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('granularity', sa.String(length=5), nullable=False),
+            sa.Column('bucket', sa.Date(), nullable=False),
+            sa.Column('role', sa.String(length=20), nullable=False),
+            sa.Column('user_count', sa.Integer(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('granularity', 'bucket', 'role', name='uq_signup_rollups_key')
+        )
+    if 'rollup_state' not in existing:
+        op.create_table(
+            'rollup_state',
+            sa.Column('name', sa.String(length=50), nullable=False),
+            sa.Column('watermark', sa.DateTime(), nullable=False),
+            sa.Column('updated_at', sa.DateTime(), nullable=True),
+            sa.PrimaryKeyConstraint('name')
+        )
+    if 'rollup_dirty_months' not in existing:
+        op.create_table(
+            'rollup_dirty_months',
+            sa.Column('month', sa.Date(), nullable=False),
+            sa.Column('marked_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('month')
+        )
+
+
+def downgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table in reversed(TABLES):
+        if table in existing:
+            op.drop_table(table)
@@ -0,0 +1,50 @@
+"""Add the ocr_jobs queue table
+
+Skipped when the table already exists (created by db.create_all()).
+
+Revision ID: 8c1e5b7a2d90
+Revises: 6e4b8d2f1c07
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c1e5b7a2d90'
+down_revision = '6e4b8d2f1c07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if 'ocr_jobs' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'ocr_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('volunteer_id', sa.Integer(), nullable=False),
+        sa.Column('document_path', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=10), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('worker', sa.String(length=100), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['volunteer_id'], ['volunteers.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_ocr_jobs_status_priority', 'ocr_jobs', ['status', 'priority', 'id'], unique=False)
+    op.create_index('ix_ocr_jobs_volunteer_id', 'ocr_jobs', ['volunteer_id'], unique=False)
+
+
+def downgrade():
+    if 'ocr_jobs' not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.drop_index('ix_ocr_jobs_volunteer_id', table_name='ocr_jobs')
+    op.drop_index('ix_ocr_jobs_status_priority', table_name='ocr_jobs')
+    op.drop_table('ocr_jobs')
@@ -0,0 +1,43 @@
+"""Make the keyset pagination sort columns NOT NULL
+
+tasks.created_at, volunteers.created_at and volunteers.premium_verified
+order the cursor-paginated listings; a NULL in any of them compares
+neither < nor > and drops the row from every page after the first.
+Existing NULLs are back-filled first (now / false, matching the model
+defaults).
+
+Revision ID: b4d61f0e9a35
+Revises: 8c1e5b7a2d90
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d61f0e9a35'
+down_revision = '8c1e5b7a2d90'
+branch_labels = None
+depends_on = None
+
+# (table, column, type, back-fill value)
+COLUMNS = [
+    ('tasks', 'created_at', sa.DateTime(), sa.func.current_timestamp()),
+    ('volunteers', 'created_at', sa.DateTime(), sa.func.current_timestamp()),
+    ('volunteers', 'premium_verified', sa.Boolean(), sa.false()),
+]
+
+
+def upgrade():
+    for table, column, type_, fill in COLUMNS:
+        target = sa.table(table, sa.column(column, type_))
+        op.execute(target.update().where(target.c[column].is_(None)).values({column: fill}))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=type_, nullable=False)
+
+
+def downgrade():
+    for table, column, type_, _ in reversed(COLUMNS):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=type_, nullable=True)
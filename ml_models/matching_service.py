@@ -5,19 +5,11 @@ import re
 
 try:
     from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity
     HAS_SKLEARN = True
 except ImportError:
     HAS_SKLEARN = False
     print("Warning: scikit-learn not available. Some AI features will be limited.")
 
-try:
-    from geopy.distance import geodesic
-    HAS_GEOPY = True
-except ImportError:
-    HAS_GEOPY = False
-    print("Warning: geopy not available. Distance calculations will be limited.")
-
 try:
     import nltk
     from nltk.sentiment import SentimentIntensityAnalyzer
@@ -33,6 +25,45 @@ except ImportError:
     HAS_TEXTBLOB = False
     print("Warning: TextBlob not available. Sentiment analysis will be limited.")
 
+EARTH_RADIUS_KM = 6371
+
+
+# Vectorized helpers. These mirror app/services/geo.py and app/services/ranking.py
+# and are copied here so ml_models does not depend on the Flask app package.
+def to_coordinate_array(values):
+    """Convert a sequence of coordinates (None allowed) to a float array with NaN for missing"""
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def haversine_km(lats, lons, lat, lon):
+    """Distances (km) from every (lats[i], lons[i]) to (lat, lon); NaN where coordinates are missing"""
+    lats = np.radians(np.asarray(lats, dtype=float))
+    lons = np.radians(np.asarray(lons, dtype=float))
+    lat, lon = np.radians(lat), np.radians(lon)
+    a = np.sin((lat - lats) / 2) ** 2 + np.cos(lats) * np.cos(lat) * np.sin((lon - lons) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def linear_proximity_scores(distances, max_distance_km=50, missing_score=0.0):
+    """Linear proximity score: 1.0 at 0 km falling to 0.0 at max_distance_km"""
+    distances = np.asarray(distances, dtype=float)
+    result = np.clip(1 - distances / max_distance_km, 0.0, 1.0)
+    result[np.isnan(distances)] = missing_score
+    return result
+
+
+def top_k_indices(scores, k):
+    """Indices of the k highest scores, best first (argpartition, then sort the survivors)"""
+    scores = np.asarray(scores, dtype=float)
+    n = len(scores)
+    if k <= 0 or n == 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= n:
+        return np.argsort(-scores, kind='stable')
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.lexsort((top, -scores[top]))]
+
+
 class AIMatchingService:
     def __init__(self):
         if HAS_SKLEARN:
@@ -60,32 +91,40 @@ class AIMatchingService:
     
     def calculate_task_volunteer_similarity(self, task_description, volunteer_skills):
         """Calculate similarity between task description and volunteer skills"""
+        return float(self.calculate_similarities(task_description, [volunteer_skills])[0])
+    
+    def calculate_similarities(self, task_description, volunteer_skills_list):
+        """
+        Similarity between a task and every volunteer in a candidate pool.
+        The vectorizer is fitted once on the task plus the whole pool, so IDF
+        weights reflect the pool rather than a two-document corpus.
+        """
+        skills_list = [skills or "" for skills in volunteer_skills_list]
+        
         if not HAS_SKLEARN or not self.vectorizer:
             # Fallback to simple text matching
-            return self._simple_text_similarity(task_description, volunteer_skills)
+            return self._simple_text_similarities(task_description, skills_list)
         
         try:
-            # Combine texts for vectorization
-            texts = [task_description, volunteer_skills]
-            
-            # Handle empty or None values
-            texts = [text if text else "" for text in texts]
-            
-            if not any(texts):
-                return 0.0
-            
-            # Vectorize texts
-            tfidf_matrix = self.vectorizer.fit_transform(texts)
+            if not task_description or not any(skills_list):
+                return np.zeros(len(skills_list))
             
-            # Calculate cosine similarity
-            similarity_matrix = cosine_similarity(tfidf_matrix)
+            # One fit for the task and the whole pool
+            tfidf_matrix = self.vectorizer.fit_transform([task_description] + skills_list)
             
-            # Return similarity between task and volunteer
-            return similarity_matrix[0, 1]
+            # Rows are L2-normalised, so one sparse product gives cosine similarities
+            return np.asarray((tfidf_matrix[1:] @ tfidf_matrix[0].T).todense()).ravel()
         
         except Exception as e:
             print(f"Error calculating similarity: {e}")
-            return self._simple_text_similarity(task_description, volunteer_skills)
+            return self._simple_text_similarities(task_description, skills_list)
+    
+    def _simple_text_similarities(self, task_description, volunteer_skills_list):
+        """Simple text similarity for a whole pool without sklearn"""
+        return np.array([
+            self._simple_text_similarity(task_description, skills)
+            for skills in volunteer_skills_list
+        ], dtype=float)
     
     def _simple_text_similarity(self, text1, text2):
         """Simple text similarity calculation without sklearn"""
@@ -106,55 +145,17 @@ class AIMatchingService:
         return intersection / union if union > 0 else 0.0
     
     def calculate_distance_score(self, task_location, volunteer_location, max_distance_km=50):
-        """Calculate proximity score based on distance"""
-        if not HAS_GEOPY:
-            return self._simple_distance_score(task_location, volunteer_location, max_distance_km)
-        
-        try:
-            if not all([task_location, volunteer_location]):
-                return 0.0
-            
-            # Calculate distance using Haversine formula
-            distance = geodesic(task_location, volunteer_location).kilometers
-            
-            # Convert distance to score (closer = higher score)
-            if distance > max_distance_km:
-                return 0.0
-            
-            # Normalize score (1.0 for 0km, decreases as distance increases)
-            score = max(0, 1 - (distance / max_distance_km))
-            return score
-        
-        except Exception as e:
-            print(f"Error calculating distance: {e}")
-            return self._simple_distance_score(task_location, volunteer_location, max_distance_km)
-    
-    def _simple_distance_score(self, task_location, volunteer_location, max_distance_km=50):
-        """Simple distance calculation without geopy"""
+        """Proximity score for one (lat, lon) pair, on the same haversine scale as ranking"""
         if not all([task_location, volunteer_location]):
             return 0.0
-        
-        try:
-            # Simple Euclidean distance (approximation for small distances)
-            lat_diff = task_location[0] - volunteer_location[0]
-            lon_diff = task_location[1] - volunteer_location[1]
-            
-            # Rough conversion: 1 degree ≈ 111 km
-            distance_km = ((lat_diff ** 2 + lon_diff ** 2) ** 0.5) * 111
-            
-            if distance_km > max_distance_km:
-                return 0.0
-            
-            return max(0, 1 - (distance_km / max_distance_km))
-        
-        except Exception as e:
-            print(f"Error in simple distance calculation: {e}")
-            return 0.5  # Return neutral score if calculation fails
+        # A missing coordinate makes the distance NaN, which scores 0.0
+        distance = haversine_km([volunteer_location[0]], [volunteer_location[1]], *task_location)
+        return float(linear_proximity_scores(distance, max_distance_km)[0])
     
     def calculate_hybrid_score(self, similarity_score, proximity_score, 
                              volunteer_rating=0, completed_tasks=0,
                              similarity_weight=0.6, proximity_weight=0.4):
-        """Calculate weighted hybrid matching score"""
+        """Calculate weighted hybrid matching score (scalars or NumPy arrays)"""
         
         # Base score from similarity and proximity
         base_score = (similarity_weight * similarity_score) + (proximity_weight * proximity_score)
@@ -163,75 +164,55 @@ class AIMatchingService:
         rating_boost = (volunteer_rating / 5.0) * 0.1  # Max 10% boost
         
         # Experience boost based on completed tasks
-        experience_boost = min(completed_tasks / 100.0, 0.1) * 0.05  # Max 5% boost
+        experience_boost = np.minimum(completed_tasks / 100.0, 0.1) * 0.05  # Max 5% boost
         
         # Final score
         final_score = base_score + rating_boost + experience_boost
         
-        return min(final_score, 1.0)  # Cap at 1.0
+        return np.minimum(final_score, 1.0)  # Cap at 1.0
     
     def rank_volunteers_for_task(self, task, volunteers, max_results=10):
         """Rank volunteers for a specific task"""
         if not volunteers:
             return []
         
-        ranked_volunteers = []
+        # Distances for the whole pool in one vectorized pass, reused for score and display
+        lats = to_coordinate_array([vol.user_profile.latitude for vol in volunteers])
+        lons = to_coordinate_array([vol.user_profile.longitude for vol in volunteers])
+        if task.latitude and task.longitude:
+            distances = haversine_km(lats, lons, task.latitude, task.longitude)
+        else:
+            distances = np.full(len(volunteers), np.nan)
+        proximity = linear_proximity_scores(distances, max_distance_km=50)
         
-        for volunteer in volunteers:
-            # Calculate similarity score
-            similarity_score = self.calculate_task_volunteer_similarity(
-                task.description, 
-                volunteer.skills or ""
-            )
-            
-            # Calculate proximity score
-            task_location = (task.latitude, task.longitude) if task.latitude and task.longitude else None
-            volunteer_location = (
-                volunteer.user_profile.latitude, 
-                volunteer.user_profile.longitude
-            ) if volunteer.user_profile.latitude and volunteer.user_profile.longitude else None
-            
-            proximity_score = self.calculate_distance_score(task_location, volunteer_location)
-            
-            # Calculate hybrid score
-            hybrid_score = self.calculate_hybrid_score(
-                similarity_score=similarity_score,
-                proximity_score=proximity_score,
-                volunteer_rating=volunteer.rating,
-                completed_tasks=volunteer.completed_tasks
-            )
-            
-            # Calculate actual distance for display
-            actual_distance = float('inf')
-            if task_location and volunteer_location:
-                if HAS_GEOPY:
-                    try:
-                        actual_distance = geodesic(task_location, volunteer_location).kilometers
-                    except:
-                        # Fallback to simple calculation
-                        lat_diff = task_location[0] - volunteer_location[0]
-                        lon_diff = task_location[1] - volunteer_location[1]
-                        actual_distance = ((lat_diff ** 2 + lon_diff ** 2) ** 0.5) * 111
-                else:
-                    # Simple distance calculation
-                    lat_diff = task_location[0] - volunteer_location[0]
-                    lon_diff = task_location[1] - volunteer_location[1]
-                    actual_distance = ((lat_diff ** 2 + lon_diff ** 2) ** 0.5) * 111
-            
-            # Add to results if above threshold
-            if hybrid_score > 0.1:  # Minimum threshold
-                ranked_volunteers.append({
-                    'volunteer': volunteer,
-                    'similarity_score': similarity_score,
-                    'proximity_score': proximity_score,
-                    'hybrid_score': hybrid_score,
-                    'distance_km': actual_distance
-                })
+        # One TF-IDF fit and one similarity computation for the whole pool
+        similarity = self.calculate_similarities(
+            task.description, [vol.skills or "" for vol in volunteers]
+        )
+        
+        hybrid = self.calculate_hybrid_score(
+            similarity_score=similarity,
+            proximity_score=proximity,
+            volunteer_rating=np.array([vol.rating or 0 for vol in volunteers], dtype=float),
+            completed_tasks=np.array([vol.completed_tasks or 0 for vol in volunteers], dtype=float)
+        )
         
-        # Sort by hybrid score (descending)
-        ranked_volunteers.sort(key=lambda x: x['hybrid_score'], reverse=True)
+        # Minimum threshold, then partial selection of the best max_results
+        hybrid = np.where(hybrid > 0.1, hybrid, -np.inf)
+        
+        ranked_volunteers = []
+        for i in top_k_indices(hybrid, max_results):
+            if not np.isfinite(hybrid[i]):
+                break
+            ranked_volunteers.append({
+                'volunteer': volunteers[i],
+                'similarity_score': float(similarity[i]),
+                'proximity_score': float(proximity[i]),
+                'hybrid_score': float(hybrid[i]),
+                'distance_km': float(distances[i]) if np.isfinite(distances[i]) else float('inf')
+            })
         
-        return ranked_volunteers[:max_results]
+        return ranked_volunteers
     
     def analyze_sentiment(self, text):
         """Analyze sentiment of feedback text"""
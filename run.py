@@ -74,6 +74,18 @@ if __name__ == '__main__':
             db.session.add(volunteer)
         
         db.session.commit()
+        
+        # Fill the materialized admin counters on first boot; afterwards the
+        # flush hooks keep them current (`flask rebuild-stats` recomputes them)
+        from app.services.stats import platform_stats_built, rebuild_platform_stats
+        if not platform_stats_built():
+            rebuild_platform_stats()
+            print("✅ Built platform_stats counters")
+        
+        # Same for the report trend rollups (`flask refresh-rollups` keeps them current)
+        from app.services.rollups import ensure_rollups
+        ensure_rollups(app.config.get('ROLLUP_LOOKBACK_DAYS', 7))
+        
         print("Database initialized with demo data!")
     
     app.run(debug=True, host='0.0.0.0', port=5000, use_reloader=False)
@@ -0,0 +1,52 @@
+"""Volunteer matches on the task page (snapshot ranking path)"""
+import re
+
+import pytest
+
+from app import db
+from app.models import Task
+from app.services import registry, volunteer_snapshot
+
+
+@pytest.fixture(autouse=True)
+def fresh_matching_state(monkeypatch):
+    """The matching service and volunteer snapshot are per process; start each test on its own database"""
+    monkeypatch.setattr(registry, '_services', {})
+    monkeypatch.setattr(volunteer_snapshot, '_snapshot', None)
+
+
+@pytest.fixture
+def located_task(seeded):
+    task = Task.query.filter_by(status='pending').order_by(Task.id).first()
+    task.description = 'plumbing repairs for a leaking pipe'
+    task.latitude, task.longitude = 12.97, 77.59
+    db.session.commit()
+    return task
+
+
+def matched_ids(client, task):
+    html = client.get(f'/task/{task.id}').get_data(as_text=True)
+    return {int(vol_id) for vol_id in re.findall(rf'/assign_task/{task.id}/(\d+)', html)}
+
+
+def test_located_volunteers_are_matched(seeded, located_task, client, login):
+    login('user@example.com')
+    assert matched_ids(client, located_task) == {volunteer.id for volunteer in seeded['volunteers']}
+
+
+def test_volunteers_without_location_are_still_matched(seeded, located_task, client, login):
+    for volunteer in seeded['volunteers']:
+        volunteer.user_profile.latitude = volunteer.user_profile.longitude = None
+    db.session.commit()
+
+    login('user@example.com')
+    assert matched_ids(client, located_task) == {volunteer.id for volunteer in seeded['volunteers']}
+
+
+def test_fewer_located_volunteers_than_candidates_ranks_everyone(seeded, located_task, client, login):
+    for volunteer in seeded['volunteers'][1:]:
+        volunteer.user_profile.latitude = volunteer.user_profile.longitude = None
+    db.session.commit()
+
+    login('user@example.com')
+    assert matched_ids(client, located_task) == {volunteer.id for volunteer in seeded['volunteers']}
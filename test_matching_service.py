@@ -0,0 +1,38 @@
+"""ml_models.matching_service: one haversine distance per volunteer, for scoring and display"""
+from types import SimpleNamespace
+
+import pytest
+
+from ml_models.matching_service import AIMatchingService, haversine_km, linear_proximity_scores
+
+
+def volunteer(vol_id, lat, lon, skills='plumbing repairs'):
+    return SimpleNamespace(id=vol_id, skills=skills, rating=4.0, completed_tasks=3,
+                           user_profile=SimpleNamespace(latitude=lat, longitude=lon))
+
+
+TASK = SimpleNamespace(description='fix plumbing leak', latitude=12.97, longitude=77.59)
+
+
+def test_displayed_distance_is_the_scored_distance():
+    volunteers = [volunteer(1, 12.99, 77.60), volunteer(2, 13.10, 77.70), volunteer(3, None, None)]
+    ranked = {result['volunteer'].id: result for result in
+              AIMatchingService().rank_volunteers_for_task(TASK, volunteers)}
+
+    for vol in volunteers[:2]:
+        distance = haversine_km([vol.user_profile.latitude], [vol.user_profile.longitude],
+                                TASK.latitude, TASK.longitude)
+        assert ranked[vol.id]['distance_km'] == pytest.approx(float(distance[0]))
+        assert ranked[vol.id]['proximity_score'] == pytest.approx(float(linear_proximity_scores(distance)[0]))
+    assert ranked[3]['distance_km'] == float('inf')
+    assert ranked[3]['proximity_score'] == 0.0
+
+
+def test_distance_score_matches_ranking_scale():
+    service = AIMatchingService()
+    score = service.calculate_distance_score((12.97, 77.59), (13.10, 77.70))
+    distance = haversine_km([13.10], [77.70], 12.97, 77.59)
+    assert score == pytest.approx(float(linear_proximity_scores(distance)[0]))
+    assert service.calculate_distance_score((12.97, 77.59), (None, None)) == 0.0
+    assert service.calculate_distance_score(None, (13.10, 77.70)) == 0.0
+    assert service.calculate_distance_score((0, 0), (10, 10)) == 0.0
@@ -0,0 +1,49 @@
+"""OCRService.plan_preprocessing: which steps run for a measured image quality"""
+import pytest
+
+from app.ocr_service import (OCRService, BLURRY_SHARPNESS, CLEAN_NOISE_SIGMA, HEAVY_NOISE_SIGMA, LOW_CONTRAST,
+                             MAX_OCR_HEIGHT, MAX_UPSCALE, MIN_OCR_HEIGHT, TARGET_OCR_HEIGHT)
+
+CLEAN = {'height': 1800, 'noise_sigma': 1.0, 'sharpness': 0.5, 'contrast': 200}
+
+
+def plan(**quality):
+    return OCRService().plan_preprocessing({**CLEAN, **quality})
+
+
+def test_clean_image_runs_nothing():
+    assert plan() == {'pipeline': 'clean', 'scale': 1.0, 'denoise': 'none', 'sharpen': False, 'clahe': False}
+
+
+@pytest.mark.parametrize('noise, denoise, pipeline', [
+    (CLEAN_NOISE_SIGMA - 0.01, 'none', 'clean'),
+    (CLEAN_NOISE_SIGMA, 'median', 'light'),
+    (HEAVY_NOISE_SIGMA - 0.01, 'median', 'light'),
+    (HEAVY_NOISE_SIGMA, 'nlmeans', 'heavy'),
+])
+def test_denoiser_follows_noise_thresholds(noise, denoise, pipeline):
+    result = plan(noise_sigma=noise)
+    assert (result['denoise'], result['pipeline']) == (denoise, pipeline)
+
+
+@pytest.mark.parametrize('height, scale', [
+    (MIN_OCR_HEIGHT, 1.0),
+    (MAX_OCR_HEIGHT, 1.0),
+    (MIN_OCR_HEIGHT - 100, round(TARGET_OCR_HEIGHT / (MIN_OCR_HEIGHT - 100), 3)),
+    (400, MAX_UPSCALE),  # Upscaling is capped
+    (MAX_OCR_HEIGHT * 2, 0.5),
+])
+def test_scale_follows_height_thresholds(height, scale):
+    assert plan(height=height)['scale'] == scale
+
+
+def test_sharpen_only_blurry_images_that_are_not_denoised():
+    assert plan(sharpness=BLURRY_SHARPNESS - 0.01)['sharpen']
+    assert not plan(sharpness=BLURRY_SHARPNESS)['sharpen']
+    # Denoising smooths anyway; sharpening would bring the noise back
+    assert not plan(sharpness=BLURRY_SHARPNESS - 0.01, noise_sigma=CLEAN_NOISE_SIGMA)['sharpen']
+
+
+def test_clahe_below_contrast_threshold():
+    assert plan(contrast=LOW_CONTRAST - 1)['clahe']
+    assert not plan(contrast=LOW_CONTRAST)['clahe']
@@ -0,0 +1,72 @@
+"""OcrJob claiming: two workers (separate sessions) never get the same job"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import OcrJob
+from app.services.ocr_queue import claim_next_job, enqueue_ocr_job
+
+
+@pytest.fixture
+def jobs(seeded):
+    """One queued job per seeded volunteer, the last one premium"""
+    volunteers = seeded['volunteers']
+    volunteers[-1].premium_verified = True
+    queued = []
+    for volunteer in volunteers:
+        volunteer.document_path = f'uploads/{volunteer.id}.png'
+        queued.append(enqueue_ocr_job(volunteer))
+    db.session.commit()
+    return queued
+
+
+def claim_in_new_session(app, worker_id):
+    """claim_next_job as another worker would: its own app context, so its own session"""
+    with app.app_context():
+        job = claim_next_job(worker_id)
+        return job and job.id
+
+
+def test_enqueue_returns_the_active_job(jobs):
+    assert enqueue_ocr_job(jobs[0].volunteer).id == jobs[0].id
+    assert OcrJob.query.count() == len(jobs)
+
+
+def test_workers_claim_distinct_jobs_premium_first(app, jobs):
+    claimed = [claim_in_new_session(app, f'worker-{i % 2}') for i in range(len(jobs) + 1)]
+    assert claimed == [jobs[-1].id] + [job.id for job in jobs[:-1]] + [None]
+    assert {job.status for job in OcrJob.query} == {'running'}
+    assert {job.attempts for job in OcrJob.query} == {1}
+
+
+def test_losing_a_claim_race_moves_on_to_the_next_job(app, jobs):
+    """Worker b claims the job worker a has just read, before a's UPDATE runs"""
+    raced = []
+
+    @event.listens_for(db.engine, 'before_cursor_execute')
+    def claim_first(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('UPDATE ocr_jobs') and not raced:
+            raced.append(None)  # b's own UPDATE passes through here too
+            raced[0] = claim_in_new_session(app, 'b')
+
+    try:
+        winner_a = claim_next_job('a')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', claim_first)
+
+    assert raced == [jobs[-1].id]
+    assert winner_a.id == jobs[0].id
+    contested = db.session.get(OcrJob, raced[0], populate_existing=True)
+    assert (contested.worker, contested.attempts) == ('b', 1)
+
+
+def test_stale_running_job_is_reclaimed(app, jobs):
+    job_id = claim_in_new_session(app, 'crashed')
+    job = db.session.get(OcrJob, job_id, populate_existing=True)
+    job.claimed_at = datetime.utcnow() - timedelta(hours=1)
+    db.session.commit()
+
+    reclaimed = claim_next_job('rescuer')
+    assert (reclaimed.id, reclaimed.worker, reclaimed.attempts) == (job_id, 'rescuer', 2)
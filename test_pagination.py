@@ -0,0 +1,62 @@
+"""Keyset pagination through the JSON listing APIs"""
+import pytest
+
+from app import db
+from app.models import Task, Volunteer, NEWEST_TASKS_FIRST
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_paginate
+
+
+def walk(client, url, per_page):
+    """Every item of every page, following next_cursor; also the page sizes"""
+    items, sizes, cursor = [], [], None
+    while True:
+        response = client.get(url, query_string={'per_page': per_page, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200
+        data = response.get_json()
+        items += data['items']
+        sizes.append(len(data['items']))
+        cursor = data['next_cursor']
+        if cursor is None:
+            return items, sizes
+
+
+@pytest.mark.parametrize('per_page', [1, 7, 15, 30, 100])
+def test_cursor_walk_visits_every_task_once_in_order(seeded, client, login, per_page):
+    login('user@example.com')
+    items, sizes = walk(client, '/api/tasks', per_page)
+
+    expected = [task.id for task in Task.query.filter_by(user_id=seeded['user'].id)
+                .order_by(Task.created_at.desc(), Task.id.desc())]
+    assert [item['id'] for item in items] == expected
+    assert all(size == per_page for size in sizes[:-1])
+
+
+def test_pending_volunteers_walk(seeded, client, login):
+    for volunteer in seeded['volunteers'][:3]:
+        volunteer.verification_status = 'pending'
+    seeded['volunteers'][2].premium_verified = True
+    db.session.commit()
+
+    login('admin@example.com')
+    items, _ = walk(client, '/admin/api/pending_volunteers', 2)
+    volunteers = seeded['volunteers']
+    assert [item['id'] for item in items] == [volunteers[2].id, volunteers[0].id, volunteers[1].id]
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor(['2026-01-01T00:00:00']), '!!!'])
+def test_bad_cursor_is_a_400(seeded, client, login, cursor):
+    login('user@example.com')
+    assert client.get('/api/tasks', query_string={'cursor': cursor}).status_code == 400
+
+
+def test_cursor_round_trip_restores_types(seeded):
+    task = Task.query.first()
+    values = decode_cursor(encode_cursor([task.created_at, task.id]), NEWEST_TASKS_FIRST)
+    assert values == [task.created_at, task.id]
+    with pytest.raises(InvalidCursor):
+        decode_cursor(encode_cursor([task.id]), NEWEST_TASKS_FIRST)
+
+
+def test_nullable_sort_column_is_rejected(seeded):
+    with pytest.raises(ValueError, match='NOT NULL'):
+        keyset_paginate(Volunteer.query, [(Volunteer.subscription_expires, False), (Volunteer.id, False)])
@@ -0,0 +1,83 @@
+"""Incremental rollup refreshes must agree with a full rebuild"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import db
+from app.models import Task, TaskRollup, UserTaskRollup, SignupRollup, RollupDirtyMonth
+from app.services.rollups import ensure_rollups, month_start, monthly_task_trend, refresh_rollups
+
+
+def rollup_rows():
+    rows = {}
+    for model in (TaskRollup, UserTaskRollup, SignupRollup):
+        columns = [column for column in model.__table__.c.keys() if column != 'id']
+        rows[model.__tablename__] = sorted(tuple(getattr(row, column) for column in columns)
+                                           for row in model.query.all())
+    return rows
+
+
+def full_rebuild_rows():
+    refresh_rollups(full=True)
+    return rollup_rows()
+
+
+@pytest.fixture
+def old_task(seeded):
+    """A pending task posted four months ago, with the rollups built over it"""
+    task = Task.query.filter_by(status='pending').order_by(Task.id).first()
+    task.created_at = datetime.utcnow() - timedelta(days=120)
+    db.session.commit()
+    refresh_rollups(full=True)
+    return task
+
+
+def month_counts(month):
+    return {bucket: (total, completed) for bucket, total, completed in monthly_task_trend(month, month)}[month]
+
+
+def test_late_status_change_marks_and_refreshes_its_month(old_task):
+    month = month_start(old_task.created_at.date())
+    assert month_counts(month) == (1, 0)
+
+    old_task.status = 'completed'
+    old_task.completed_at = datetime.utcnow()
+    db.session.commit()
+    assert [row.month for row in RollupDirtyMonth.query] == [month]
+
+    summary = refresh_rollups()
+    assert summary['dirty_months'] == 1
+    assert month_counts(month) == (1, 1)
+    assert RollupDirtyMonth.query.count() == 0
+    assert rollup_rows() == full_rebuild_rows()
+
+
+def test_late_delete_is_refreshed(old_task):
+    month = month_start(old_task.created_at.date())
+    db.session.delete(old_task)
+    db.session.commit()
+
+    refresh_rollups()
+    assert month not in dict((bucket, total) for bucket, total, _ in monthly_task_trend(month, month))
+    assert rollup_rows() == full_rebuild_rows()
+
+
+def test_changes_in_the_current_month_mark_nothing(seeded):
+    refresh_rollups(full=True)
+    db.session.add(Task(user_id=seeded['user'].id, title='New', description='d'))
+    db.session.commit()
+    assert RollupDirtyMonth.query.count() == 0
+
+    refresh_rollups()
+    assert rollup_rows() == full_rebuild_rows()
+
+
+def test_ensure_rollups_only_builds_once(seeded):
+    ensure_rollups()
+    built = rollup_rows()
+    assert built['task_rollups']
+
+    TaskRollup.query.delete()
+    db.session.commit()
+    ensure_rollups()
+    assert TaskRollup.query.count() == 0
@@ -0,0 +1,62 @@
+"""Skill index rows cached by the volunteer snapshot must follow index changes"""
+from collections import namedtuple
+
+import numpy as np
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from app.services.skill_index import VolunteerSkillIndex
+from app.services.volunteer_snapshot import VolunteerSnapshot
+
+Row = namedtuple('Row', 'id user_id name skills latitude longitude rating completed_tasks '
+                        'premium_verified subscription_type verification_status')
+
+SKILLS = {1: 'plumbing repairs', 2: 'math tutoring', 3: 'gardening and lawn care', 4: 'plumbing and wiring'}
+
+
+@pytest.fixture
+def snapshot():
+    rows = [Row(vol_id, 100 + vol_id, f'Volunteer {vol_id}', skills, None, None, 4.0, 0, False, 'basic',
+                'approved') for vol_id, skills in SKILLS.items()]
+    snapshot = VolunteerSnapshot(max_age_seconds=None)
+    snapshot.refresh(lambda **ids: rows)
+    return snapshot
+
+
+@pytest.fixture
+def index(snapshot):
+    index = VolunteerSkillIndex(TfidfVectorizer, min_refit_updates=100)
+    index.fit(snapshot.skill_items())
+    return index
+
+
+def scores_by_id(index, snapshot, text):
+    with snapshot.lock:
+        scores = index.score_rows(text, snapshot.skill_rows)
+        return dict(zip(snapshot.ids.tolist(), scores))
+
+
+def test_snapshot_rows_score_like_direct_lookup(index, snapshot):
+    cached = scores_by_id(index, snapshot, 'plumbing')
+    direct = index.similarities('plumbing', list(SKILLS))
+    assert np.allclose([cached[vol_id] for vol_id in SKILLS], direct)
+
+
+def test_remove_before_the_snapshot_catches_up(index, snapshot):
+    scores_by_id(index, snapshot, 'plumbing')  # Caches the skill rows
+
+    # The change feed has not updated the snapshot yet: volunteer 2 is still in it
+    index.remove(2)
+    scores = scores_by_id(index, snapshot, 'plumbing')
+    assert scores[2] == 0
+    assert scores[4] > 0 and scores[1] > 0
+    assert scores[3] == 0
+
+
+def test_upsert_is_scored_through_cached_rows(index, snapshot):
+    scores_by_id(index, snapshot, 'gardening')
+    index.remove(1)
+    index.upsert(3, 'plumbing repairs')
+    scores = scores_by_id(index, snapshot, 'gardening')
+    assert scores[3] == 0 and scores[1] == 0
+    assert scores_by_id(index, snapshot, 'plumbing')[3] > 0
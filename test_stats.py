@@ -0,0 +1,59 @@
+"""The materialized platform_stats counters must match a fresh aggregation"""
+import math
+
+from app import db
+from app.models import Task, PlatformStat, Feedback
+from app.services.stats import (compute_platform_stats, load_platform_stats, platform_stats_built,
+                                rebuild_platform_stats)
+
+
+def assert_no_drift():
+    stored, live = vars(load_platform_stats()), vars(compute_platform_stats())
+    drift = {name: (stored[name], value) for name, value in live.items()
+             if not (stored[name] == value
+                     or isinstance(value, float) and math.isclose(stored[name], value, abs_tol=1e-6))}
+    assert drift == {}
+
+
+def test_rebuild_matches_aggregation(seeded):
+    assert not platform_stats_built()
+    rebuild_platform_stats()
+    assert platform_stats_built()
+    assert_no_drift()
+
+
+def test_load_before_rebuild_reads_source_tables_without_writing(seeded):
+    assert load_platform_stats().total_tasks == 30
+    assert not platform_stats_built()
+
+
+def test_no_drift_after_assign_complete_and_delete(seeded, client, login):
+    rebuild_platform_stats()
+    volunteer = seeded['volunteers'][0]
+    task, other = Task.query.filter_by(status='pending').order_by(Task.id).limit(2).all()
+    login('user@example.com')
+
+    assert client.get(f'/assign_task/{task.id}/{volunteer.id}').status_code == 302
+    assert_no_drift()
+
+    assert client.post(f'/complete_task/{task.id}').status_code == 302
+    assert_no_drift()
+
+    db.session.add(Feedback(task_id=task.id, user_id=seeded['user'].id, volunteer_id=volunteer.id,
+                            rating=5, text='great', sentiment_score=0.8, sentiment_label='positive'))
+    db.session.commit()
+    assert_no_drift()
+
+    db.session.delete(db.session.get(Task, other.id))
+    db.session.commit()
+    assert_no_drift()
+    assert load_platform_stats().total_tasks == 29
+
+
+def test_long_category_metric_fits(seeded):
+    rebuild_platform_stats()
+    task = Task.query.first()
+    task.category = 'c' * 50
+    db.session.commit()
+    assert PlatformStat.query.filter_by(metric='tasks.category.' + 'c' * 50).one().value == 1
+    assert_no_drift()